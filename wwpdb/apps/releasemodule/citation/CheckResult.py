@@ -63,7 +63,7 @@ class CheckResult(object):
                 print(dir['structure_id'] + ': ' + dir['c_title'])
                 plist = []
                 for pdir in dir['pubmed']:
-                    sim = calStringSimilarity(dir['c_title'], pdir['title'])
+                    sim = calStringSimilarity(dir['c_title'], pdir['title'], minSimilarity=0.5)
                     if sim < 0.5:
                         continue
                     #
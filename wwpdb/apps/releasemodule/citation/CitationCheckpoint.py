@@ -0,0 +1,127 @@
+##
+# File:  CitationCheckpoint.py
+# Date:  18-Oct-2026
+# Updates:
+##
+"""
+Durable per-stage checkpoint of a citation finder run, used to resume the run after a failure.
+
+This software was developed as part of the World Wide Protein Data Bank
+Common Deposition and Annotation System Project
+
+Copyright (c) 2026 wwPDB
+
+This software is provided under a Creative Commons Attribution 3.0 Unported
+License described at http://creativecommons.org/licenses/by/3.0/.
+
+"""
+__docformat__ = "restructuredtext en"
+__author__ = "Zukang Feng"
+__email__ = "zfeng@rcsb.rutgers.edu"
+__license__ = "Creative Commons Attribution 3.0 Unported"
+__version__ = "V0.07"
+
+import json
+import os
+import sqlite3
+import sys
+import time
+
+try:
+    import cPickle as pickle
+except ImportError:
+    import pickle as pickle
+
+
+class CitationCheckpoint(object):
+    """ Keep the candidate list, the raw term -> pubmed ID search results and the fetched pubmed records of
+        a citation finder run in a SQLite file. Results are committed as soon as each batch completes.
+    """
+
+    def __init__(self, dbPath, resume=False, log=sys.stderr, verbose=False):
+        """ Start a new checkpoint, or continue the existing one if resume is set
+        """
+        self.__dbPath = dbPath
+        self.__lfh = log  # pylint: disable=unused-private-member
+        self.__verbose = verbose  # pylint: disable=unused-private-member
+        if (not resume) and os.access(self.__dbPath, os.F_OK):
+            os.remove(self.__dbPath)
+        #
+        self.__conn = sqlite3.connect(self.__dbPath, timeout=60)
+        self.__conn.execute('CREATE TABLE IF NOT EXISTS stage (name TEXT NOT NULL PRIMARY KEY, data BLOB, done_time REAL NOT NULL)')
+        self.__conn.execute('CREATE TABLE IF NOT EXISTS search_result (term TEXT NOT NULL PRIMARY KEY, id_list TEXT NOT NULL, '
+                            + 'searched INTEGER NOT NULL)')
+        self.__conn.execute('CREATE TABLE IF NOT EXISTS pubmed_article (pmid TEXT NOT NULL PRIMARY KEY, info TEXT NOT NULL)')
+        self.__conn.commit()
+
+    def isStageDone(self, name):
+        return self.__conn.execute('SELECT 1 FROM stage WHERE name = ?', (name,)).fetchone() is not None
+
+    def getStageData(self, name):
+        """ Return the data saved with a completed stage, or None
+        """
+        row = self.__conn.execute('SELECT data FROM stage WHERE name = ?', (name,)).fetchone()
+        if (row is None) or (row[0] is None):
+            return None
+        #
+        return pickle.loads(bytes(row[0]))
+
+    def setStageDone(self, name, data=None):
+        blob = None
+        if data is not None:
+            blob = sqlite3.Binary(pickle.dumps(data, protocol=2))
+        #
+        self.__conn.execute('INSERT OR REPLACE INTO stage (name, data, done_time) VALUES (?, ?, ?)', (name, blob, time.time()))
+        self.__conn.commit()
+
+    def putSearchResultList(self, resultList):
+        """ Store [{'term', 'id', 'searched'}] search results. Only completed searches are kept.
+        """
+        rows = [(rdir['term'], json.dumps(rdir['id']), 1) for rdir in resultList if rdir.get('searched')]
+        if not rows:
+            return
+        #
+        self.__conn.executemany('INSERT OR REPLACE INTO search_result (term, id_list, searched) VALUES (?, ?, ?)', rows)
+        self.__conn.commit()
+
+    def getSearchResultMap(self):
+        """ Return term -> pubmed ID list of the completed searches
+        """
+        resultMap = {}
+        for term, idList in self.__conn.execute('SELECT term, id_list FROM search_result WHERE searched = 1'):
+            resultMap[term] = json.loads(idList)
+        #
+        return resultMap
+
+    def putArticleList(self, infoList):
+        """ Store fetched pubmed information
+        """
+        if not infoList:
+            return
+        #
+        self.__conn.executemany('INSERT OR REPLACE INTO pubmed_article (pmid, info) VALUES (?, ?)',
+                                [(info['pdbx_database_id_PubMed'], json.dumps(info)) for info in infoList])
+        self.__conn.commit()
+
+    def lookupArticles(self, idList):
+        """ Return pubmed ID -> pubmed information map for the fetched records in idList
+        """
+        infoMap = {}
+        for pmid in idList:
+            row = self.__conn.execute('SELECT info FROM pubmed_article WHERE pmid = ?', (pmid,)).fetchone()
+            if row is not None:
+                infoMap[pmid] = json.loads(row[0])
+            #
+        #
+        return infoMap
+
+    def getStatistics(self):
+        return {'search': self.__conn.execute('SELECT COUNT(*) FROM search_result').fetchone()[0],
+                'article': self.__conn.execute('SELECT COUNT(*) FROM pubmed_article').fetchone()[0],
+                'stage': [row[0] for row in self.__conn.execute('SELECT name FROM stage ORDER BY done_time')]}
+
+    def close(self):
+        if self.__conn is not None:
+            self.__conn.close()
+            self.__conn = None
+        #
@@ -32,6 +32,7 @@ except ImportError:
 import copy
 import operator
 import time
+import traceback
 
 from mmcif.api.DataCategory import DataCategory
 from mmcif.api.PdbxContainers import DataContainer
@@ -40,7 +41,11 @@ from wwpdb.io.file.mmCIFUtil import mmCIFUtil
 from wwpdb.utils.config.ConfigInfo import ConfigInfo
 from wwpdb.utils.config.ConfigInfoApp import ConfigInfoAppCommon
 
+from wwpdb.apps.releasemodule.citation.CitationCheckpoint import CitationCheckpoint
+from wwpdb.apps.releasemodule.citation.CitationFinderState import CitationFinderState
+from wwpdb.apps.releasemodule.citation.EUtilsClient import getEUtilsClient
 from wwpdb.apps.releasemodule.citation.FetchMP import FetchMP
+from wwpdb.apps.releasemodule.citation.PubmedCache import PubmedCache
 from wwpdb.apps.releasemodule.citation.SearchMP import SearchMP
 from wwpdb.apps.releasemodule.utils.ContentDbApi import ContentDbApi
 from wwpdb.apps.releasemodule.utils.StatusDbApi_v2 import StatusDbApi
@@ -51,8 +56,20 @@ class CitationFinder(object):
     """
     """
 
-    def __init__(self, siteId="WWPDB_DEPLOY_TEST", path='.', output='citation_finder.db', log=sys.stderr, verbose=False):
+    def __init__(self, siteId="WWPDB_DEPLOY_TEST", path='.', output='citation_finder.db', cacheMode=None, engine=None,
+                 resume=False, incremental=False, log=sys.stderr, verbose=False):
         """ Initial CitationFinder class
+
+            cacheMode: 'off' (no pubmed cache), 'on' (re-query stale cached results) or 'refresh' (re-query stale
+                       author term results only for records entered since the last search). Defaults to
+                       NCBI_CACHE_MODE site setting, or 'refresh' since the weekly runs are further apart than the
+                       author term TTL. The cache is kept next to the output file (<output>_pubmed_cache.sqlite).
+            engine: 'process' (SearchMP then FetchMP worker processes) or 'asyncio' (PubmedPipeline fetching records
+                    while searches are running and matching entries as soon as their terms are resolved).
+                    Defaults to NCBI_SEARCH_ENGINE site setting, or 'process'.
+            resume: continue from the checkpoint left in the session path by a failed run, skipping completed work
+            incremental: search the author terms of unchanged entries only for the records entered since the last run,
+                         using the state saved next to the output file (<output>_state.pickle)
         """
         self.__siteId = siteId
         self.__sessionPath = path
@@ -66,12 +83,44 @@ class CitationFinder(object):
         self.__pubmedIdList = []
         self.__pubmedInfo = {}
         self.__matchResultMap = {}
+        self.__matchResultFileList = []
         self.__annotEntryMap = {}
 
         self.__cI = ConfigInfo(self.__siteId)
         self.__cICommon = ConfigInfoAppCommon(self.__siteId)
+        #
+        self.__cacheMode = cacheMode
+        if not self.__cacheMode:
+            self.__cacheMode = str(self.__cI.get('NCBI_CACHE_MODE', 'refresh') or 'refresh').lower()
+        #
+        self.__cache = None
+        self.__resume = resume
+        self.__checkpoint = None
+        self.__incremental = incremental
+        self.__state = None
+        self.__searchTime = time.time()
+        self.__searchedTermMap = {}
+        self.__incrementalTermSet = set()
+        #
+        self.__engine = engine
+        if not self.__engine:
+            self.__engine = str(self.__cI.get('NCBI_SEARCH_ENGINE', 'process') or 'process').lower()
+        #
+        if (self.__engine == 'asyncio') and (not getEUtilsClient(siteId=self.__siteId, log=self.__lfh, verbose=self.__verbose)):
+            # The pipeline runs requests in threads and needs the in-process E-utilities client
+            self.__engine = 'process'
+        #
 
     def searchPubmed(self, year=2):
+        checkpoint = self.__getCheckpoint()
+        if checkpoint and checkpoint.isStageDone('result') and os.access(self.__resultfile, os.F_OK):
+            print('citation finder result ' + self.__resultfile + ' already completed')
+            fb = open(self.__resultfile, 'rb')
+            self.__annotEntryMap = pickle.load(fb)
+            fb.close()
+            self._closeCheckpoint()
+            return
+        #
         Time1 = time.time()
         self._getcandidateList(year=year)
         Time2 = time.time()
@@ -93,47 +142,70 @@ class CitationFinder(object):
         print('__authorList=' + str(len(self.__termList)))
         print(diffTime)
         #
-        Time1 = time.time()
-        self._runNCBIPubmedSearch(year=year)
-        Time2 = time.time()
-        diffTime = Time2 - Time1
-        print('__termMap=' + str(len(self.__termMap)))
-        print(diffTime)
-        #
-        Time1 = time.time()
-        self._getPubmedIdList()
-        Time2 = time.time()
-        diffTime = Time2 - Time1
-        print('__pubmedIdList=' + str(len(self.__pubmedIdList)))
-        print(diffTime)
-        #
-        Time1 = time.time()
-        self._runPubmedFetch()
-        Time2 = time.time()
-        diffTime = Time2 - Time1
-        print('__pubmedInfo=' + str(len(self.__pubmedInfo)))
-        print(diffTime)
-        #
-        Time1 = time.time()
-        self._writeResultCif()
-        Time2 = time.time()
-        diffTime = Time2 - Time1
-        print('_writeResultCif')
-        print(diffTime)
-        #
-        Time1 = time.time()
-        self._runCitationMatch()
-        Time2 = time.time()
-        diffTime = Time2 - Time1
-        print('_runCitationMatch')
-        print(diffTime)
-        #
-        Time1 = time.time()
-        self._readCitationMatchResult()
-        Time2 = time.time()
-        diffTime = Time2 - Time1
-        print('_readCitationMatchResult')
-        print(diffTime)
+        self.__searchTime = time.time()
+        if self.__engine == 'asyncio':
+            Time1 = time.time()
+            self._runPubmedPipeline(year=year)
+            self._closeCache()
+            Time2 = time.time()
+            diffTime = Time2 - Time1
+            print('__termMap=' + str(len(self.__termMap)))
+            print('__pubmedIdList=' + str(len(self.__pubmedIdList)))
+            print('__pubmedInfo=' + str(len(self.__pubmedInfo)))
+            print(diffTime)
+            #
+            Time1 = time.time()
+            self._writeResultCif()
+            for filename in self.__matchResultFileList:
+                self._readCitationMatchResult(filename=filename)
+            #
+            Time2 = time.time()
+            diffTime = Time2 - Time1
+            print('_readCitationMatchResult')
+            print(diffTime)
+        else:
+            Time1 = time.time()
+            self._runNCBIPubmedSearch(year=year)
+            Time2 = time.time()
+            diffTime = Time2 - Time1
+            print('__termMap=' + str(len(self.__termMap)))
+            print(diffTime)
+            #
+            Time1 = time.time()
+            self._getPubmedIdList()
+            Time2 = time.time()
+            diffTime = Time2 - Time1
+            print('__pubmedIdList=' + str(len(self.__pubmedIdList)))
+            print(diffTime)
+            #
+            Time1 = time.time()
+            self._runPubmedFetch()
+            self._closeCache()
+            Time2 = time.time()
+            diffTime = Time2 - Time1
+            print('__pubmedInfo=' + str(len(self.__pubmedInfo)))
+            print(diffTime)
+            #
+            Time1 = time.time()
+            self._writeResultCif()
+            Time2 = time.time()
+            diffTime = Time2 - Time1
+            print('_writeResultCif')
+            print(diffTime)
+            #
+            Time1 = time.time()
+            self._runCitationMatch()
+            Time2 = time.time()
+            diffTime = Time2 - Time1
+            print('_runCitationMatch')
+            print(diffTime)
+            #
+            Time1 = time.time()
+            self._readCitationMatchResult()
+            Time2 = time.time()
+            diffTime = Time2 - Time1
+            print('_readCitationMatchResult')
+            print(diffTime)
         #
         Time1 = time.time()
         self._sortMatchResultMap()
@@ -158,6 +230,11 @@ class CitationFinder(object):
         #
         Time1 = time.time()
         self._writeResult()
+        self._saveState(year=year)
+        if checkpoint:
+            checkpoint.setStageDone('result')
+        #
+        self._closeCheckpoint()
         Time2 = time.time()
         diffTime = Time2 - Time1
         print('_writeResult')
@@ -169,8 +246,19 @@ class CitationFinder(object):
     def _getcandidateList(self, year=2):
         """ Get candidate list from database
         """
+        checkpoint = self.__getCheckpoint()
+        if checkpoint and checkpoint.isStageDone('candidate'):
+            candidateYear, candidateList = checkpoint.getStageData('candidate')
+            if candidateYear == year:
+                self.__candidateList = candidateList
+                return
+            #
+        #
         connect = ContentDbApi(siteId=self.__siteId, verbose=True, log=self.__lfh)
         self.__candidateList = connect.getPubmedSearchList(year=year)
+        if checkpoint:
+            checkpoint.setStageDone('candidate', (year, self.__candidateList))
+        #
 
     def _getAnnotatorList(self):
         """ Get active annotator initial list from da_users.status database
@@ -183,8 +271,16 @@ class CitationFinder(object):
         elif self.__cI.get('WWPDB_SITE_LOC').lower() == 'pdbc':
             site = 'PDBc'
         #
+        checkpoint = self.__getCheckpoint()
+        if checkpoint and checkpoint.isStageDone('annotator'):
+            self.__annotatorList = checkpoint.getStageData('annotator')
+            return
+        #
         connect = StatusDbApi(siteId=self.__siteId, verbose=True, log=self.__lfh)
         self.__annotatorList = connect.getAnnoList(siteId=site)
+        if checkpoint:
+            checkpoint.setStageDone('annotator', self.__annotatorList)
+        #
 
     def _getTermList(self):
         """ Get Author term list
@@ -219,10 +315,136 @@ class CitationFinder(object):
         if not self.__termList:
             return
         #
-        aSearch = SearchMP(siteId=self.__siteId, termList=self.__termList, log=self.__lfh, verbose=self.__verbose,
-                           path=self.__sessionPath)
-        aSearch.run(year=year)
-        self.__termMap = aSearch.getTermMap()
+        reldate = year * 365
+        termList = self.__termList
+        refreshMap = {}
+        cache = self.__getCache()
+        if cache:
+            termList, refreshMap = self.__lookupSearchCache(cache, reldate)
+        #
+        self.__addStateRefreshMap(termList, refreshMap, year)
+        if termList:
+            mindateMap = {}
+            for term, (_idList, mindate) in refreshMap.items():
+                mindateMap[term] = mindate
+            #
+            searchedTermList, termMap = self.__runSearchMP(termList, mindateMap, year)
+            self.__mergeSearchResult(cache, reldate, searchedTermList, termMap, refreshMap)
+        #
+        if cache:
+            print('search cache=' + str(cache.getStatistics()))
+        #
+
+    def __runSearchMP(self, termList, mindateMap, year):
+        """ Run SearchMP for the terms not searched yet by a failed run, returns (searched term list, term map)
+        """
+        searchedTermList, termMap, termList = self.__getCheckpointSearchResult(termList)
+        if termList:
+            callback = None
+            if self.__getCheckpoint():
+                callback = self.__getCheckpoint().putSearchResultList
+            #
+            aSearch = SearchMP(siteId=self.__siteId, termList=termList, mindateMap=mindateMap, callback=callback,
+                               log=self.__lfh, verbose=self.__verbose, path=self.__sessionPath)
+            aSearch.run(year=year)
+            searchedTermList.extend(aSearch.getSearchedTermList())
+            termMap.update(aSearch.getTermMap())
+        #
+        return searchedTermList, termMap
+
+    def __getCheckpointSearchResult(self, termList):
+        """ Returns (searched term list, term map) of the terms searched by a failed run, and the remaining terms
+        """
+        checkpoint = self.__getCheckpoint()
+        if not checkpoint:
+            return [], {}, termList
+        #
+        doneMap = checkpoint.getSearchResultMap()
+        searchedTermList = []
+        termMap = {}
+        remainList = []
+        for term in termList:
+            if term not in doneMap:
+                remainList.append(term)
+                continue
+            #
+            searchedTermList.append(term)
+            if doneMap[term]:
+                termMap[term] = doneMap[term]
+            #
+        #
+        if searchedTermList:
+            print('checkpoint search=' + str(len(searchedTermList)))
+        #
+        return searchedTermList, termMap, remainList
+
+    def __lookupSearchCache(self, cache, reldate):
+        """ Add cached search results to term map, returns (terms to be searched, refreshMap)
+        """
+        cachedMap, refreshMap = cache.lookupSearch(self.__termList, reldate, refresh=(self.__cacheMode == 'refresh'))
+        for term, idList in cachedMap.items():
+            self.__searchedTermMap[term] = idList
+            if idList:
+                self.__termMap[term] = idList
+            #
+        #
+        return [term for term in self.__termList if term not in cachedMap], refreshMap
+
+    def __addStateRefreshMap(self, termList, refreshMap, year):
+        """ Add the terms of termList to be searched incrementally since the last run to refreshMap
+        """
+        if not self.__incremental:
+            return
+        #
+        self.__state = CitationFinderState(os.path.splitext(self.__resultfile)[0] + '_state.pickle', log=self.__lfh,
+                                           verbose=self.__verbose)
+        self.__state.load(year)
+        for term, (idList, mindate) in self.__state.getRefreshMap(self.__candidateList, termList).items():
+            if term not in refreshMap:
+                refreshMap[term] = (idList, mindate)
+                self.__incrementalTermSet.add(term)
+            #
+        #
+        print('incremental=' + str(self.__state.getStatistics()))
+
+    def _saveState(self, year=2):
+        """ Save candidate entries and term results for the next incremental run
+        """
+        if self.__state is None:
+            return
+        #
+        self.__state.save(year, self.__searchTime, self.__candidateList, self.__searchedTermMap, self.__incrementalTermSet)
+
+    def __mergeSearchResult(self, cache, reldate, searchedTermList, termMap, refreshMap):
+        """ Add new search results to term map and cache (if any), merging incremental results with previous ones
+        """
+        fullMap = {}
+        incrementalMap = {}
+        for term in searchedTermList:
+            idList = termMap.get(term, [])
+            if term in refreshMap:
+                # Newly entered records first, as a full search would list them
+                newIdSet = set(idList)
+                idList = idList + [pid for pid in refreshMap[term][0] if pid not in newIdSet]
+                incrementalMap[term] = idList
+            else:
+                fullMap[term] = idList
+            #
+            self.__searchedTermMap[term] = idList
+            if idList:
+                self.__termMap[term] = idList
+            #
+        #
+        # Keep previous results of failed incremental searches
+        for term, (idList, _mindate) in refreshMap.items():
+            if (term not in incrementalMap) and idList:
+                self.__termMap[term] = idList
+            #
+        #
+        if cache:
+            cache.putSearch(fullMap, reldate)
+            cache.putSearch(incrementalMap, reldate, incremental=True)
+        #
 
     def _getPubmedIdList(self):
         """ Get unique Pubmed ID list
@@ -247,38 +469,234 @@ class CitationFinder(object):
         if not self.__pubmedIdList:
             return
         #
-        pFetch = FetchMP(siteId=self.__siteId, idList=self.__pubmedIdList, log=self.__lfh, verbose=self.__verbose,
-                         path=self.__sessionPath)
-        pFetch.run()
-        self.__pubmedInfo = pFetch.getPubmedInfoMap()
+        idList = self.__pubmedIdList
+        callback = None
+        checkpoint = self.__getCheckpoint()
+        cache = self.__getCache()
+        if checkpoint:
+            # Records fetched by a failed run
+            self.__pubmedInfo = checkpoint.lookupArticles(idList)
+            idList = [pid for pid in idList if pid not in self.__pubmedInfo]
+            callback = checkpoint.putArticleList
+            if cache and self.__pubmedInfo:
+                cache.putArticles(self.__pubmedInfo)
+            #
+        #
+        if cache:
+            self.__pubmedInfo.update(cache.lookupArticles(idList))
+            idList = [pid for pid in idList if pid not in self.__pubmedInfo]
+        #
+        if idList:
+            pFetch = FetchMP(siteId=self.__siteId, idList=idList, callback=callback, log=self.__lfh, verbose=self.__verbose,
+                             path=self.__sessionPath)
+            pFetch.run()
+            pubmedInfo = pFetch.getPubmedInfoMap()
+            if cache:
+                cache.putArticles(pubmedInfo)
+            #
+            self.__pubmedInfo.update(pubmedInfo)
+        #
+        if cache:
+            print('fetch cache=' + str(cache.getStatistics()))
+        #
+        if checkpoint:
+            checkpoint.setStageDone('fetch')
+        #
 
-    def _writeResultCif(self):
-        """ Write search result cif file
+    def _runPubmedPipeline(self, year=2):
+        """ Run NCBI Pubmed author and DOI search, fetch found pubmed records and run CitationMatch in one asyncio pipeline.
+            Entries are matched in chunks as soon as all their terms are resolved, the result files are listed in
+            self.__matchResultFileList.
         """
+        if not self.__termList:
+            return
+        #
+        # Python 3 only module
+        from wwpdb.apps.releasemodule.citation.PubmedPipeline import PubmedPipeline
+        #
+        reldate = year * 365
+        termList = self.__termList
+        refreshMap = {}
+        cache = self.__getCache()
+        if cache:
+            termList, refreshMap = self.__lookupSearchCache(cache, reldate)
+        #
+        self.__addStateRefreshMap(termList, refreshMap, year)
+        # Records of cached search results are fetched while the remaining terms are searched
+        knownTermMap = dict(self.__termMap)
+        mindateMap = {}
+        for term, (idList, mindate) in refreshMap.items():
+            knownTermMap[term] = idList
+            mindateMap[term] = mindate
+        #
+        # Terms searched by a failed run are known as well
+        doneTermList, doneTermMap, termList = self.__getCheckpointSearchResult(termList)
+        for term in doneTermList:
+            idList = doneTermMap.get(term, [])
+            if term in refreshMap:
+                idSet = set(idList)
+                idList = idList + [pid for pid in refreshMap[term][0] if pid not in idSet]
+            #
+            knownTermMap[term] = idList
+            mindateMap.pop(term, None)
+        #
+        checkpoint = self.__getCheckpoint()
+        resumedInfo = {}
+
+        def articleLookup(idList):
+            infoMap = {}
+            if checkpoint:
+                infoMap = checkpoint.lookupArticles(idList)
+                resumedInfo.update(infoMap)
+            #
+            if cache:
+                infoMap.update(cache.lookupArticles([pid for pid in idList if pid not in infoMap]))
+            #
+            return infoMap
+        #
+        searchCallback = None
+        fetchCallback = None
+        if checkpoint:
+            searchCallback = checkpoint.putSearchResultList
+            fetchCallback = checkpoint.putArticleList
+        #
+        entryTermMap = {}
+        for i, cdt in enumerate(self.__candidateList):
+            if ('structure_id' not in cdt) or ('c_title' not in cdt) or ('pubmed_author' not in cdt):
+                continue
+            #
+            entryTermMap[i] = list(cdt['pubmed_author'])
+            if 'pdbx_database_id_DOI' in cdt:
+                entryTermMap[i].append(str(cdt['pdbx_database_id_DOI']) + '[aid]')
+            #
+        #
+        pipeline = PubmedPipeline(path=self.__sessionPath, termList=termList, siteId=self.__siteId, mindateMap=mindateMap,
+                                  knownTermMap=knownTermMap, articleLookup=articleLookup, entryTermMap=entryTermMap,
+                                  matchFunction=self._runChunkCitationMatch, searchCallback=searchCallback,
+                                  fetchCallback=fetchCallback, log=self.__lfh, verbose=self.__verbose)
+        pipeline.run(year=year)
+        self.__matchResultFileList = [filename for filename in pipeline.getMatchResultList() if filename]
+        doneTermMap.update(pipeline.getTermMap())
+        self.__mergeSearchResult(cache, reldate, doneTermList + pipeline.getSearchedTermList(), doneTermMap, refreshMap)
+        if cache:
+            cache.putArticles(resumedInfo)
+            cache.putArticles(pipeline.getPubmedInfoMap(fetchedOnly=True))
+            print('pipeline cache=' + str(cache.getStatistics()))
+        #
+        if checkpoint:
+            checkpoint.setStageDone('fetch')
+        #
+        self._getPubmedIdList()
+        pubmedInfo = pipeline.getPubmedInfoMap()
+        for pid in self.__pubmedIdList:
+            if pid in pubmedInfo:
+                self.__pubmedInfo[pid] = pubmedInfo[pid]
+            #
+        #
+        print('pipeline=' + str(pipeline.getStatistics()))
+
+    def __getCheckpoint(self):
+        """ Open the checkpoint of this run in the session path, continuing the one of a failed run if resume is set
+        """
+        if self.__checkpoint is None:
+            try:
+                self.__checkpoint = CitationCheckpoint(os.path.join(self.__sessionPath, 'citation_finder_checkpoint.sqlite'),
+                                                       resume=self.__resume, log=self.__lfh, verbose=self.__verbose)
+                if self.__resume:
+                    print('checkpoint=' + str(self.__checkpoint.getStatistics()))
+                #
+            except:  # noqa: E722 pylint: disable=bare-except
+                if self.__verbose:
+                    traceback.print_exc(file=self.__lfh)
+                #
+                self.__checkpoint = False
+            #
+            # Later calls continue the checkpoint just opened
+            self.__resume = True
+        #
+        return self.__checkpoint
+
+    def _closeCheckpoint(self):
+        if self.__checkpoint:
+            self.__checkpoint.close()
+        #
+        self.__checkpoint = None
+
+    def __getCache(self):
+        """ Open persistent pubmed cache next to the output file, the session path is removed after each run
+        """
+        if self.__cacheMode == 'off':
+            return None
+        #
+        if self.__cache is None:
+            try:
+                self.__cache = PubmedCache(os.path.splitext(self.__resultfile)[0] + '_pubmed_cache.sqlite', log=self.__lfh,
+                                           verbose=self.__verbose)
+            except:  # noqa: E722 pylint: disable=bare-except
+                if self.__verbose:
+                    traceback.print_exc(file=self.__lfh)
+                #
+                self.__cacheMode = 'off'
+            #
+        #
+        return self.__cache
+
+    def _closeCache(self):
+        if self.__cache is not None:
+            self.__cache.close()
+            self.__cache = None
+        #
+
+    def _runChunkCitationMatch(self, chunkIndex, keyList, termMap, pubmedInfo):
+        """ Run CitationMatch for a chunk of candidate entries (called from PubmedPipeline match threads),
+            returns the name of the match result file
+        """
+        label = '_' + str(chunkIndex + 1)
+        # Never read the result left behind by a previous run
+        if os.access(os.path.join(self.__sessionPath, 'matchresult' + label + '.cif'), os.F_OK):
+            os.remove(os.path.join(self.__sessionPath, 'matchresult' + label + '.cif'))
+        #
+        candidateList = [self.__candidateList[key] for key in sorted(keyList)]
+        self._writeResultCif(filename='input' + label + '.cif', candidateList=candidateList, termMap=termMap, pubmedInfo=pubmedInfo)
+        self._runCitationMatch(inputFile='input' + label + '.cif', outputFile='matchresult' + label + '.cif', label=label)
+        return 'matchresult' + label + '.cif'
+
+    def _writeResultCif(self, filename='input.cif', candidateList=None, termMap=None, pubmedInfo=None):
+        """ Write search result cif file, by default for all candidates, term results and pubmed records
+        """
+        if candidateList is None:
+            candidateList = self.__candidateList
+        #
+        if termMap is None:
+            termMap = self.__termMap
+        #
+        if pubmedInfo is None:
+            pubmedInfo = self.__pubmedInfo
+        #
         curContainer = DataContainer('citation_finder')
 
-        curCat = self._getEntyCategory()
+        curCat = self._getEntyCategory(candidateList)
         if curCat:
             curContainer.append(curCat)
         #
-        curCat = self._getTermPubmedIdMappingCategory()
+        curCat = self._getTermPubmedIdMappingCategory(termMap)
         if curCat:
             curContainer.append(curCat)
         #
-        curCat = self._getPubmedCitationCategory()
+        curCat = self._getPubmedCitationCategory(pubmedInfo)
         if curCat:
             curContainer.append(curCat)
         #
         myDataList = []
         myDataList.append(curContainer)
-        filename = os.path.join(self.__sessionPath, 'input.cif')
+        filename = os.path.join(self.__sessionPath, filename)
         ofh = open(filename, 'w')
         pdbxW = PdbxWriter(ofh)
         pdbxW.write(myDataList)
         ofh.close()
 
-    def _getEntyCategory(self):
-        if not self.__candidateList:
+    def _getEntyCategory(self, candidateList):
+        if not candidateList:
             return None
         #
         cat = DataCategory('entry_info')
@@ -290,7 +708,7 @@ class CitationFinder(object):
         cat.appendAttribute('DOI_term')
         #
         row = 0
-        for cdt in self.__candidateList:
+        for cdt in candidateList:
             if ('structure_id' not in cdt) or ('c_title' not in cdt) or ('pubmed_author' not in cdt):
                 continue
             #
@@ -308,8 +726,8 @@ class CitationFinder(object):
         #
         return cat
 
-    def _getTermPubmedIdMappingCategory(self):
-        if not self.__termMap:
+    def _getTermPubmedIdMappingCategory(self, termMap):
+        if not termMap:
             return None
         #
         cat = DataCategory('term_pubmed_mapping')
@@ -317,15 +735,15 @@ class CitationFinder(object):
         cat.appendAttribute('pubmed_ids')
         #
         row = 0
-        for key, plist in self.__termMap.items():
+        for key, plist in termMap.items():
             cat.setValue(str(key), 'term', row)
             cat.setValue(str(','.join(plist)), 'pubmed_ids', row)
             row += 1
         #
         return cat
 
-    def _getPubmedCitationCategory(self):
-        if not self.__pubmedInfo:
+    def _getPubmedCitationCategory(self, pubmedInfo):
+        if not pubmedInfo:
             return None
         #
         cat = DataCategory('pubmed_info')
@@ -334,7 +752,7 @@ class CitationFinder(object):
         cat.appendAttribute('title')
         #
         row = 0
-        for _key, v_dict in self.__pubmedInfo.items():
+        for _key, v_dict in pubmedInfo.items():
             cat.setValue(str(v_dict['pdbx_database_id_PubMed']), 'id', row)
             if 'pdbx_database_id_DOI' in v_dict:
                 cat.setValue(str(v_dict['pdbx_database_id_DOI']), 'doi', row)
@@ -346,21 +764,21 @@ class CitationFinder(object):
         #
         return cat
 
-    def _runCitationMatch(self):
-        script = os.path.join(self.__sessionPath, 'runCitationMatch.csh')
+    def _runCitationMatch(self, inputFile='input.cif', outputFile='matchresult.cif', label=''):
+        script = os.path.join(self.__sessionPath, 'runCitationMatch' + label + '.csh')
         f = open(script, 'w')
         f.write('#!/bin/tcsh -f\n')
         f.write('#\n')
         f.write('setenv RCSBROOT   ' + self.__cICommon.get_site_annot_tools_path() + '\n')
         f.write('setenv BINPATH  ${RCSBROOT}/bin\n')
         f.write('#\n')
-        f.write('${BINPATH}/CitationMatch -input input.cif -output matchresult.cif\n')
+        f.write('${BINPATH}/CitationMatch -input ' + inputFile + ' -output ' + outputFile + '\n')
         f.close()
         #
-        RunScript(self.__sessionPath, 'runCitationMatch.csh', 'runCitationMatch.log')
+        RunScript(self.__sessionPath, 'runCitationMatch' + label + '.csh', 'runCitationMatch' + label + '.log')
 
-    def _readCitationMatchResult(self):
-        filename = os.path.join(self.__sessionPath, 'matchresult.cif')
+    def _readCitationMatchResult(self, filename='matchresult.cif'):
+        filename = os.path.join(self.__sessionPath, filename)
         if not os.access(filename, os.F_OK):
             return
         #
@@ -481,11 +899,17 @@ class CitationFinder(object):
 
 
 def main_test():
+    """ Usage: CitationFinder.py siteId sessionPath output [year] [--resume] [--incremental]
+    """
     startTime = time.time()
-    cf = CitationFinder(siteId=sys.argv[1], path=sys.argv[2], output=sys.argv[3], log=sys.stderr, verbose=False)
+    argv = [arg for arg in sys.argv if arg not in ('--resume', '--incremental')]
+    resume = '--resume' in sys.argv
+    incremental = '--incremental' in sys.argv
+    cf = CitationFinder(siteId=argv[1], path=argv[2], output=argv[3], resume=resume, incremental=incremental, log=sys.stderr,
+                        verbose=False)
     year = 2
-    if len(sys.argv) == 5:
-        year = int(sys.argv[4])
+    if len(argv) == 5:
+        year = int(argv[4])
     #
     cf.searchPubmed(year=year)
     endTime = time.time()
@@ -0,0 +1,157 @@
+##
+# File:  CitationFinderState.py
+# Date:  18-Oct-2026
+# Updates:
+##
+"""
+Candidate entries and term search results of the last citation finder run, used by incremental runs.
+
+This software was developed as part of the World Wide Protein Data Bank
+Common Deposition and Annotation System Project
+
+Copyright (c) 2026 wwPDB
+
+This software is provided under a Creative Commons Attribution 3.0 Unported
+License described at http://creativecommons.org/licenses/by/3.0/.
+
+"""
+__docformat__ = "restructuredtext en"
+__author__ = "Zukang Feng"
+__email__ = "zfeng@rcsb.rutgers.edu"
+__license__ = "Creative Commons Attribution 3.0 Unported"
+__version__ = "V0.07"
+
+import os
+import sys
+import time
+import traceback
+
+try:
+    import cPickle as pickle
+except ImportError:
+    import pickle as pickle
+
+DAY = 86400.0
+
+# Longest time author term results are kept up to date with incremental searches before a full search
+DEFAULT_MAX_AGE = 28.0 * DAY
+
+
+class CitationFinderState(object):
+    """ Keep the candidate entries and the term -> pubmed ID results of the last completed run in a pickle file.
+
+        Author terms of entries that are unchanged since that run are searched only for the records entered
+        since then (datetype=edat search with 'mindate'), and merged with the saved results. Terms of new or
+        changed entries, DOI terms and results whose last full search is older than maxAge are searched over
+        the full window.
+    """
+
+    def __init__(self, filePath, maxAge=DEFAULT_MAX_AGE, log=sys.stderr, verbose=False):
+        self.__filePath = filePath
+        self.__maxAge = maxAge
+        self.__lfh = log
+        self.__verbose = verbose
+        self.__state = {}
+        self.__statistics = {'entry': 0, 'new': 0, 'changed': 0, 'full': 0, 'incremental': 0}
+
+    def load(self, year):
+        """ Read the state of the last run, returns False if there is none for the same search window
+        """
+        self.__state = {}
+        if not os.access(self.__filePath, os.F_OK):
+            return False
+        #
+        try:
+            fb = open(self.__filePath, 'rb')
+            state = pickle.load(fb)
+            fb.close()
+            if state.get('year') == year:
+                self.__state = state
+            #
+        except:  # noqa: E722 pylint: disable=bare-except
+            if self.__verbose:
+                traceback.print_exc(file=self.__lfh)
+            #
+        #
+        return bool(self.__state)
+
+    def getRefreshMap(self, candidateList, termList):
+        """ Return term -> (pubmed ID list, mindate) for the terms in termList to be searched incrementally
+        """
+        refreshMap = {}
+        if not self.__state:
+            self.__statistics['full'] = len(termList)
+            return refreshMap
+        #
+        lastCandidateMap = self.__state.get('candidate', {})
+        changedTermSet = set()
+        for structureId, entryTermList in self.__getCandidateMap(candidateList).items():
+            self.__statistics['entry'] += 1
+            if structureId not in lastCandidateMap:
+                self.__statistics['new'] += 1
+            elif lastCandidateMap[structureId] != entryTermList:
+                self.__statistics['changed'] += 1
+            else:
+                continue
+            #
+            changedTermSet.update(entryTermList)
+        #
+        now = time.time()
+        # one day overlap so that records entered while the last search was running are not missed
+        mindate = time.strftime('%Y/%m/%d', time.localtime(self.__state['time'] - DAY))
+        lastTermMap = self.__state.get('term', {})
+        for term in termList:
+            if (term in changedTermSet) or (term not in lastTermMap) or term.endswith('[aid]') or \
+               (now - lastTermMap[term][1] > self.__maxAge):
+                self.__statistics['full'] += 1
+                continue
+            #
+            refreshMap[term] = (lastTermMap[term][0], mindate)
+            self.__statistics['incremental'] += 1
+        #
+        return refreshMap
+
+    def save(self, year, searchTime, candidateList, termMap, incrementalTermSet):
+        """ Write the state of this run: candidate entries and term -> pubmed ID list of all the terms searched.
+            Incrementally searched terms keep the time of their last full search.
+        """
+        lastTermMap = self.__state.get('term', {})
+        stateTermMap = {}
+        for term, idList in termMap.items():
+            fullSearchTime = searchTime
+            if (term in incrementalTermSet) and (term in lastTermMap):
+                fullSearchTime = lastTermMap[term][1]
+            #
+            stateTermMap[term] = (idList, fullSearchTime)
+        #
+        state = {'year': year, 'time': searchTime, 'candidate': self.__getCandidateMap(candidateList), 'term': stateTermMap}
+        try:
+            # Never leave a partially written state behind
+            tmpPath = self.__filePath + '.tmp'
+            fb = open(tmpPath, 'wb')
+            pickle.dump(state, fb, protocol=2)
+            fb.close()
+            os.rename(tmpPath, self.__filePath)
+            self.__state = state
+        except:  # noqa: E722 pylint: disable=bare-except
+            traceback.print_exc(file=self.__lfh)
+        #
+
+    def getStatistics(self):
+        return dict(self.__statistics)
+
+    def __getCandidateMap(self, candidateList):
+        """ Return structure_id -> sorted search term list of the candidate entries
+        """
+        candidateMap = {}
+        for cdt in candidateList:
+            if 'structure_id' not in cdt:
+                continue
+            #
+            termSet = set(cdt.get('pubmed_author', []))
+            if 'pdbx_database_id_DOI' in cdt:
+                termSet.add(str(cdt['pdbx_database_id_DOI']) + '[aid]')
+            #
+            candidateMap[cdt['structure_id']] = sorted(termSet)
+        #
+        return candidateMap
@@ -0,0 +1,298 @@
+##
+# File:  EUtilsClient.py
+# Date:  18-Oct-2026
+# Updates:
+##
+"""
+In-process NCBI E-utilities client with keep-alive connections and retry.
+
+This software was developed as part of the World Wide Protein Data Bank
+Common Deposition and Annotation System Project
+
+Copyright (c) 2026 wwPDB
+
+This software is provided under a Creative Commons Attribution 3.0 Unported
+License described at http://creativecommons.org/licenses/by/3.0/.
+
+"""
+__docformat__ = "restructuredtext en"
+__author__ = "Zukang Feng"
+__email__ = "zfeng@rcsb.rutgers.edu"
+__license__ = "Creative Commons Attribution 3.0 Unported"
+__version__ = "V0.07"
+
+import os
+import sys
+import threading
+import time
+from xml.dom import minidom
+
+try:
+    import http.client as httplib
+    from urllib.parse import quote, urlsplit
+except ImportError:
+    import httplib
+    from urllib import quote
+    from urlparse import urlsplit
+
+from wwpdb.utils.config.ConfigInfo import ConfigInfo
+
+NCBI_EUTILS_URL = "https://eutils.ncbi.nlm.nih.gov/entrez/eutils/"
+
+
+class EUtilsClient(object):
+    """ Run NCBI E-utilities requests over a small pool of persistent HTTP(S) connections.
+
+        Responses are returned as raw bytes so that they can be parsed from memory.
+        Failed requests (connection errors, HTTP 429 and 5xx) are retried with
+        exponential backoff; None is returned once all retries are exhausted.
+        If a rate limiter (MultiProcLimit) is given, every attempt waits for its slot and
+        rate limit rejections are reported to it instead of backing off locally.
+    """
+
+    def __init__(self, baseUrl=None, apiKey=None, timeout=60, maxRetry=4, backoff=1.0, poolSize=4, log=sys.stderr, verbose=False):
+        """
+        """
+        if not baseUrl:
+            baseUrl = NCBI_EUTILS_URL
+        #
+        url = urlsplit(baseUrl)
+        self.__scheme = url.scheme
+        self.__host = url.hostname
+        self.__port = url.port
+        self.__path = url.path
+        if not self.__path.endswith('/'):
+            self.__path += '/'
+        #
+        self.__apikey = apiKey
+        self.__timeout = timeout
+        self.__maxRetry = maxRetry
+        self.__backoff = backoff
+        self.__poolSize = poolSize
+        self.__lfh = log
+        self.__verbose = verbose
+        #
+        self.__lock = threading.Lock()
+        self.__pool = []
+        self.__pid = os.getpid()
+        #
+        self.__statistics = {'request': 0, 'retry': 0, 'failure': 0, 'connection': 0, 'throttled': 0}
+
+    def esearch(self, term, reldate=None, retmax=None, extraParams=None, limiter=None):
+        """ Run esearch for a pubmed term, returns the raw xml response
+        """
+        params = [('db', 'pubmed'), ('term', term)]
+        if reldate:
+            params.append(('reldate', str(reldate)))
+        #
+        if retmax:
+            params.append(('retmax', str(retmax)))
+        #
+        if extraParams:
+            params.extend(extraParams)
+        #
+        params.append(('retmode', 'xml'))
+        return self.request('esearch.fcgi', params, limiter=limiter)
+
+    def efetch(self, ids, post=False, limiter=None):
+        """ Run efetch for a list (or comma separated string) of pubmed IDs, returns the raw xml response
+        """
+        if isinstance(ids, (list, tuple)):
+            ids = ','.join(ids)
+        #
+        params = [('db', 'pubmed'), ('id', ids), ('retmode', 'xml'), ('rettype', 'abstract')]
+        return self.request('efetch.fcgi', params, post=post, limiter=limiter)
+
+    def epost(self, ids, limiter=None):
+        """ Upload a list of pubmed IDs to the NCBI history server, returns (WebEnv, query_key) or (None, None)
+        """
+        if isinstance(ids, (list, tuple)):
+            ids = ','.join(ids)
+        #
+        data = self.request('epost.fcgi', [('db', 'pubmed'), ('id', ids)], post=True, limiter=limiter)
+        if data is None:
+            return None, None
+        #
+        try:
+            doc = minidom.parseString(data)
+            webEnv = self.__getElementText(doc, 'WebEnv')
+            queryKey = self.__getElementText(doc, 'QueryKey')
+        except:  # noqa: E722 pylint: disable=bare-except
+            return None, None
+        #
+        if (not webEnv) or (not queryKey):
+            return None, None
+        #
+        return webEnv, queryKey
+
+    def efetchHistory(self, webEnv, queryKey, retstart=0, retmax=10000, limiter=None):
+        """ Fetch one page of records stored on the NCBI history server, returns the raw xml response
+        """
+        params = [('db', 'pubmed'), ('WebEnv', webEnv), ('query_key', str(queryKey)), ('retstart', str(retstart)),
+                  ('retmax', str(retmax)), ('retmode', 'xml'), ('rettype', 'abstract')]
+        return self.request('efetch.fcgi', params, post=True, limiter=limiter)
+
+    def request(self, utility, params, post=False, limiter=None):
+        """ Send GET (or POST) request to NCBI E-utilities service
+        """
+        params = list(params)
+        if self.__apikey:
+            params.append(('api_key', self.__apikey))
+        #
+        query = self.__encode(params)
+        if post:
+            method = 'POST'
+            url = self.__path + utility
+            body = query.encode('ascii')
+            headers = {'Content-Type': 'application/x-www-form-urlencoded'}
+        else:
+            method = 'GET'
+            url = self.__path + utility + '?' + query
+            body = None
+            headers = {}
+        #
+        for retry in range(0, self.__maxRetry + 1):
+            if retry > 0:
+                self.__statistics['retry'] += 1
+            #
+            if limiter:
+                limiter.waitnext()
+            #
+            self.__statistics['request'] += 1
+            conn = self.__getConnection()
+            delay = self.__backoff * (2 ** retry)
+            try:
+                conn.request(method, url, body=body, headers=headers)
+                response = conn.getresponse()
+                data = response.read()
+                if (response.status == 200) and (not self.__isRateLimitError(data)):
+                    if response.will_close:
+                        conn.close()
+                    else:
+                        self.__releaseConnection(conn)
+                    #
+                    if limiter:
+                        limiter.succeeded()
+                    #
+                    return data
+                #
+                conn.close()
+                if self.__verbose:
+                    self.__lfh.write("+EUtilsClient.request() %s returned HTTP %d\n" % (utility, response.status))
+                #
+                rateLimited = (response.status == 429) or self.__isRateLimitError(data)
+                if (not rateLimited) and (response.status < 500):
+                    break
+                #
+                retryAfter = self.__getRetryAfter(response)
+                if rateLimited and limiter:
+                    self.__statistics['throttled'] += 1
+                    limiter.throttled(retryAfter)
+                    # the limiter holds back the next attempt of every worker
+                    delay = 0
+                elif retryAfter:
+                    delay = max(delay, retryAfter)
+                #
+            except (httplib.HTTPException, OSError) as e:
+                conn.close()
+                if self.__verbose:
+                    self.__lfh.write("+EUtilsClient.request() %s failed: %s\n" % (utility, str(e)))
+                #
+            #
+            if (retry < self.__maxRetry) and (delay > 0):
+                time.sleep(delay)
+            #
+        #
+        self.__statistics['failure'] += 1
+        return None
+
+    def getStatistics(self):
+        return dict(self.__statistics)
+
+    def close(self):
+        """ Close all pooled connections
+        """
+        with self.__lock:
+            pool = self.__pool
+            self.__pool = []
+        #
+        for conn in pool:
+            conn.close()
+        #
+
+    def __isRateLimitError(self, data):
+        """ NCBI reports an exceeded rate limit as {"error":"API rate limit exceeded", ...}
+        """
+        return (data is not None) and (len(data) < 512) and (b'API rate limit exceeded' in data)
+
+    def __getRetryAfter(self, response):
+        retryAfter = response.getheader('Retry-After')
+        if not retryAfter:
+            return None
+        #
+        try:
+            return float(retryAfter)
+        except ValueError:
+            return None
+        #
+
+    def __getElementText(self, doc, tagName):
+        for node in doc.getElementsByTagName(tagName):
+            if node.firstChild:
+                return str(node.firstChild.data).strip()
+            #
+        #
+        return ''
+
+    def __encode(self, params):
+        """ Encode query parameters. '+' is kept as is since it is used as the word separator in pubmed terms.
+        """
+        return '&'.join([k + '=' + quote(str(v), safe='+[],:/()') for k, v in params])
+
+    def __getConnection(self):
+        with self.__lock:
+            if self.__pid != os.getpid():
+                # Never share sockets inherited from the parent process
+                self.__pool = []
+                self.__pid = os.getpid()
+            #
+            if self.__pool:
+                return self.__pool.pop()
+            #
+        #
+        self.__statistics['connection'] += 1
+        if self.__scheme == 'http':
+            return httplib.HTTPConnection(self.__host, self.__port, timeout=self.__timeout)
+        #
+        return httplib.HTTPSConnection(self.__host, self.__port, timeout=self.__timeout)
+
+    def __releaseConnection(self, conn):
+        with self.__lock:
+            if (self.__pid == os.getpid()) and (len(self.__pool) < self.__poolSize):
+                self.__pool.append(conn)
+                return
+            #
+        #
+        conn.close()
+
+
+_clientMap = {}
+_clientLock = threading.Lock()
+
+
+def getEUtilsClient(siteId=None, log=sys.stderr, verbose=False):
+    """ Return the process wide shared client for the site, or None if the script based path is configured
+    """
+    cI = ConfigInfo(siteId)
+    if str(cI.get('NCBI_EUTILS_MODE', '')).lower() == 'script':
+        return None
+    #
+    apikey = cI.get('NCBI_API_KEY')
+    baseUrl = cI.get('NCBI_EUTILS_URL')
+    key = (os.getpid(), baseUrl, apikey)
+    with _clientLock:
+        if key not in _clientMap:
+            _clientMap[key] = EUtilsClient(baseUrl=baseUrl, apiKey=apikey, log=log, verbose=verbose)
+        #
+        return _clientMap[key]
+    #
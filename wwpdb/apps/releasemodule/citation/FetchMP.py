@@ -26,6 +26,7 @@ import sys
 import traceback
 from wwpdb.utils.config.ConfigInfo import ConfigInfo
 
+from wwpdb.apps.releasemodule.citation.EUtilsClient import getEUtilsClient
 from wwpdb.apps.releasemodule.citation.FetchUtil import FetchUtil
 from wwpdb.apps.releasemodule.utils.MultiProcLimit import MultiProcLimit
 
@@ -53,6 +54,12 @@ class FetchWorker(multiprocessing.Process):
         fetch.doFetch()
         return fetch.getPubmedInfoList()
 
+    def fetchHistoryPage(self, webEnv, queryKey, retstart, retmax):
+        fetch = FetchUtil(path=self.__sessionPath, processLabel=self.__processLabel,
+                          siteId=self.__siteId, mpl=self.__mpl, log=self.__lfh, verbose=self.__verbose)
+        fetch.fetchHistoryPage(webEnv, queryKey, retstart, retmax)
+        return fetch.getPubmedInfoList()
+
     def run(self):
         # processName = self.name
         while True:
@@ -61,7 +68,12 @@ class FetchWorker(multiprocessing.Process):
             if nextList is None:
                 break
             #
-            self.__resultQueue.put(self.fetchEntryList(nextList))
+            if isinstance(nextList, tuple):
+                # (WebEnv, query_key, retstart, retmax) history server page
+                self.__resultQueue.put(self.fetchHistoryPage(*nextList))
+            else:
+                self.__resultQueue.put(self.fetchEntryList(nextList))
+            #
         #
 
 
@@ -69,27 +81,84 @@ class FetchMP(object):
     """
     """
 
-    def __init__(self, path='.', idList=None, siteId=None, log=sys.stderr, verbose=False):
-        """
+    def __init__(self, path='.', idList=None, siteId=None, pageSize=2000, callback=None, log=sys.stderr, verbose=False):
+        """ callback: called with the pubmed information list of each completed fetch request
         """
         self.__sessionPath = path
         self.__pubmedIdList = idList
+        self.__pageSize = pageSize
+        self.__callback = callback
         self.__lfh = log
         self.__verbose = verbose
         self.__pubmedInfoMap = {}
+        self.__mpl = None
         self.__siteId = siteId
         self.__cI = ConfigInfo(self.__siteId)
         self.__apikey = self.__cI.get('NCBI_API_KEY')
         self.__apirate = self.__cI.get('NCBI_API_RATE')
 
     def runSequential(self):
-        fetch = FetchUtil(path=self.__sessionPath, idList=self.__pubmedIdList,
+        fetch = FetchUtil(path=self.__sessionPath, idList=self.__pubmedIdList, siteId=self.__siteId,
                           log=self.__lfh, verbose=self.__verbose)
-        fetch.doFetch()
-        self.__pubmedInfoMap = fetch.getPubmedInfoMap()
+        fetch.doHistoryFetch(pageSize=self.__pageSize)
+        self.__addPubmedInfoList(fetch.getPubmedInfoList())
 
     def runMultiProcessing(self):
         numBlock = int(len(self.__pubmedIdList) / 200 + 1)
+        numProc, mpl = self.__getProcessLimit(numBlock)
+        # One efetch request per block, handed out on demand
+        subLists = [self.__pubmedIdList[i:i + 200] for i in range(0, len(self.__pubmedIdList), 200)]
+        #
+        self.__runWorkers(numProc, mpl, subLists)
+
+    def runHistory(self):
+        """ Upload the whole ID set once to NCBI history server and fetch it back in large pages over worker processes
+        """
+        uniqList = sorted(set(self.__pubmedIdList))
+        numPage = int((len(uniqList) + self.__pageSize - 1) / self.__pageSize)
+        numProc, mpl = self.__getProcessLimit(numPage)
+        #
+        fetch = FetchUtil(path=self.__sessionPath, idList=uniqList, siteId=self.__siteId, mpl=mpl,
+                          log=self.__lfh, verbose=self.__verbose)
+        webEnv, queryKey = fetch.postIdList()
+        if not webEnv:
+            self.runMultiProcessing()
+            return
+        #
+        pageList = [(webEnv, queryKey, retstart, self.__pageSize) for retstart in range(0, len(uniqList), self.__pageSize)]
+        self.__runWorkers(numProc, mpl, pageList)
+        #
+        # Pick up records lost in failed pages
+        #
+        missingList = [pid for pid in uniqList if pid not in self.__pubmedInfoMap]
+        if missingList:
+            fetch = FetchUtil(path=self.__sessionPath, idList=missingList, siteId=self.__siteId, mpl=mpl,
+                              log=self.__lfh, verbose=self.__verbose)
+            fetch.doFetch()
+            self.__addPubmedInfoList(fetch.getPubmedInfoList())
+        #
+
+    def run(self):
+        """
+        """
+        if not self.__pubmedIdList:
+            return
+        #
+        if len(self.__pubmedIdList) < 201:
+            self.runSequential()
+        elif getEUtilsClient(siteId=self.__siteId, log=self.__lfh, verbose=self.__verbose):
+            self.runHistory()
+        else:
+            self.runMultiProcessing()
+        #
+        if self.__verbose and self.__mpl:
+            statistics = self.__mpl.getStatistics()
+            self.__lfh.write("FetchMP: %d requests at %.2f/s (limit %.2f/s), average wait %.3fs, throttled %d\n"
+                             % (statistics['request'], statistics['achievedRate'], statistics['rate'],
+                                statistics['waitAverage'], statistics['throttled']))
+        #
+
+    def __getProcessLimit(self, numBlock):
         numProc = multiprocessing.cpu_count() * 2
         # Leave room for other processes
         if self.__apikey:
@@ -105,9 +174,12 @@ class FetchMP(object):
         if numBlock < numProc:
             numProc = numBlock
         #
-        mpl = MultiProcLimit(rate)
-        subLists = [self.__pubmedIdList[i::numProc] for i in range(numProc)]
+        if self.__mpl is None:
+            self.__mpl = MultiProcLimit(rate)
         #
+        return numProc, self.__mpl
+
+    def __runWorkers(self, numProc, mpl, taskList):
         taskQueue = multiprocessing.Queue()
         resultQueue = multiprocessing.Queue()
         #
@@ -119,17 +191,14 @@ class FetchMP(object):
         for w in workers:
             w.start()
         #
-        for subList in subLists:
-            taskQueue.put(subList)
+        for task in taskList:
+            taskQueue.put(task)
         #
         for i in range(numProc):
             taskQueue.put(None)
         #
-        for i in range(len(subLists)):
-            rlist = resultQueue.get()
-            for info in rlist:
-                self.__pubmedInfoMap[info['pdbx_database_id_PubMed']] = info
-            #
+        for i in range(len(taskList)):
+            self.__addPubmedInfoList(resultQueue.get())
         #
         try:
             for w in workers:
@@ -142,21 +211,28 @@ class FetchMP(object):
             #
         #
 
-    def run(self):
-        """
-        """
-        if not self.__pubmedIdList:
+    def __addPubmedInfoList(self, infoList):
+        if not infoList:
             return
         #
-        if len(self.__pubmedIdList) < 201:
-            self.runSequential()
-        else:
-            self.runMultiProcessing()
+        for info in infoList:
+            self.__pubmedInfoMap[info['pdbx_database_id_PubMed']] = info
+        #
+        if self.__callback:
+            self.__callback(infoList)
         #
 
     def getPubmedInfoMap(self):
         return self.__pubmedInfoMap
 
+    def getRateStatistics(self):
+        """ Return request rate limiter statistics of the last run
+        """
+        if self.__mpl is None:
+            return {}
+        #
+        return self.__mpl.getStatistics()
+
 
 if __name__ == '__main__':
     f = open(sys.argv[1], 'r')
@@ -21,16 +21,26 @@ __email__ = "zfeng@rcsb.rutgers.edu"
 __license__ = "Creative Commons Attribution 3.0 Unported"
 __version__ = "V0.07"
 
+import io
+import re
 import unicodedata
-from xml.dom import minidom
+import xml.etree.ElementTree as ET
 
 import sys
 
+try:
+    from functools import lru_cache
+except ImportError:
+    lru_cache = None
+
 
 class UniCodeHandler(object):
     """ Convert non-ascii unicode into ascii code if possible
     """
 
+    # The normalization function is built once and shared by all instances
+    __normalizerMap = {}
+
     def __init__(self):
         # pylint: disable=redundant-u-string-prefix
         self.__unicodeMapping = {
@@ -782,144 +792,171 @@ class UniCodeHandler(object):
                               'mu', 'nu', 'xi', 'omicron', 'pi', 'rho', 'sigmaf',
                               'sigma', 'tau', 'upsilon', 'phi', 'chi', 'psi', 'omega']
         #
+        if 'normalize' not in UniCodeHandler.__normalizerMap:
+            UniCodeHandler.__normalizerMap['normalize'] = self.__buildNormalizer()
+        #
+        self.__normalize = UniCodeHandler.__normalizerMap['normalize']
 
     def process(self, input_data, angstromFlag):
         if not input_data:
             return input_data
         #
-        data = self.__processUniCode(input_data, self.__unicodeMapping)
-        if angstromFlag:
-            data = self.__processUniCode(data, self.__unicodeAngstromMapping)
-        else:
-            data = self.__processUniCode(data, self.__unicodeLetterAMapping)
+        return self.__normalize(input_data, bool(angstromFlag))
+
+    def __buildNormalizer(self):
+        """ Build the shared normalization function from the mapping tables: one translate table per angstrom
+            option (the letter mappings are applied after the generic mapping, so generic entries win) and one
+            regex removing the space between a hyphen and a greek letter name. Results are memoized since journal
+            names, affiliations and author names repeat across records.
+        """
+        translateTableMap = {}
+        for flag, letterMapping in ((True, self.__unicodeAngstromMapping), (False, self.__unicodeLetterAMapping)):
+            table = {}
+            for mapping in (letterMapping, self.__unicodeMapping):
+                for c, value in mapping.items():
+                    # multi-character keys (e.g. u'\u1D6D7') never matched the per character lookup
+                    if len(c) == 1:
+                        table[ord(c)] = value
+                    #
+                #
+            #
+            translateTableMap[flag] = table
         #
-        data = unicodedata.normalize('NFKD', data).encode('ascii', 'xmlcharrefreplace')
-        if sys.version_info[0] > 2:
-            data = data.decode('ascii')
-        data = str(data)
-        data = data.replace('  ', ' ')
-        data = data.replace(' .', '.')
-        data = data.strip()
-        for word in self.__greekLetter:
-            data = data.replace('- ' + word, '-' + word)
-            data = data.replace(word + ' -', word + '-')
-        return data
+        wordPattern = '|'.join(sorted(self.__greekLetter, key=len, reverse=True))
+        endPattern = '|'.join(['(?<=' + word + ')' for word in self.__greekLetter])
+        greekLetterPattern = re.compile('(?:' + endPattern + ') -(?: (?=' + wordPattern + '))?|- (?=' + wordPattern + ')')
 
-    def __processUniCode(self, input_data, Mapping):
-        data = u''  # pylint: disable=redundant-u-string-prefix
-        for c in input_data:
-            if c in Mapping:
-                data += Mapping[c]
-            else:
-                data += c
-        return data
+        def normalize(input_data, angstromFlag):
+            data = input_data.translate(translateTableMap[angstromFlag])
+            data = unicodedata.normalize('NFKD', data).encode('ascii', 'xmlcharrefreplace')
+            if sys.version_info[0] > 2:
+                data = data.decode('ascii')
+            data = str(data)
+            data = data.replace('  ', ' ')
+            data = data.replace(' .', '.')
+            data = data.strip()
+            return greekLetterPattern.sub('-', data)
+        #
+        if lru_cache is None:
+            return normalize
+        #
+        return lru_cache(maxsize=8192)(normalize)
 
 
 class FetchResultParser(object):
     """Parse Pubmed fetch result xml file, return pubmed information list
+
+       The xml is read incrementally with ElementTree iterparse. Each <PubmedArticle> element is
+       converted into an information dictionary as soon as it is complete and then cleared, so
+       memory use stays flat regardless of the size of the efetch response.
     """
 
-    def __init__(self, xmlfile=None):
+    def __init__(self, xmlfile=None, xmldata=None, stream=False):
         self.__xmlfile = xmlfile
+        self.__xmldata = xmldata
         self.__pubmedInfoList = []
         self.__codeHandler = UniCodeHandler()
-        self._parseXml()
+        if not stream:
+            self._parseXml()
+        #
 
     def getPubmedInfoList(self):
         return self.__pubmedInfoList
 
+    def iterPubmedInfo(self):
+        """ Generator returning pubmed information dictionaries one <PubmedArticle> at a time.
+            Parsing errors are raised to the caller after the articles read so far have been returned.
+        """
+        if self.__xmldata is not None:
+            if isinstance(self.__xmldata, bytes):
+                source = io.BytesIO(self.__xmldata)
+            else:
+                source = io.StringIO(self.__xmldata)
+            #
+        else:
+            source = self.__xmlfile
+        #
+        context = ET.iterparse(source, events=('start', 'end'))
+        _event, root = next(context)
+        for event, elem in context:
+            if (event != 'end') or (elem.tag != 'PubmedArticle'):
+                continue
+            #
+            try:
+                info = self._processPubmedArticleNode(elem)
+            except:  # noqa: E722 pylint: disable=bare-except
+                info = {}
+            #
+            elem.clear()
+            root.clear()
+            if info:
+                yield info
+            #
+        #
+
     def _parseXml(self):
         try:
-            __doc = minidom.parse(self.__xmlfile)
-            self.__pubmedInfoList = self._parseDoc(__doc)
+            self.__pubmedInfoList = list(self.iterPubmedInfo())
         except:  # noqa: E722 pylint: disable=bare-except
             pass
 
-    def _parseDoc(self, doc):
-        infolist = []
-        entryList = doc.getElementsByTagName('PubmedArticle')
-        if len(entryList) > 0:
-            for entry in entryList:
-                try:
-                    doi = ''
-                    info = {}
-                    for node in entry.childNodes:
-                        if node.nodeType != node.ELEMENT_NODE:
-                            continue
-                        #
-                        if node.tagName == 'MedlineCitation':
-                            info = self._processMedlineCitationNode(node)
-                        elif node.tagName == 'PubmedData':
-                            doi = self._processPubmedDataNode(node)
-                        #
-                    #
-                    if info:
-                        if doi and ('pdbx_database_id_DOI' not in info):
-                            info['pdbx_database_id_DOI'] = doi
-                        #
-                        infolist.append(info)
-                    #
-                except:  # noqa: E722 pylint: disable=bare-except
-                    continue
+    def _processPubmedArticleNode(self, entry):
+        doi = ''
+        info = {}
+        for node in entry:
+            if node.tag == 'MedlineCitation':
+                info = self._processMedlineCitationNode(node)
+            elif node.tag == 'PubmedData':
+                doi = self._processPubmedDataNode(node)
             #
         #
-        return infolist
+        if info and doi and ('pdbx_database_id_DOI' not in info):
+            info['pdbx_database_id_DOI'] = doi
+        #
+        return info
 
     def _processMedlineCitationNode(self, entry):
         id = ''  # pylint: disable=redefined-builtin
         info = {}
-        for node in entry.childNodes:
-            if node.nodeType != node.ELEMENT_NODE:
-                continue
-            #
-            if node.tagName == 'PMID':
-                id = str(node.firstChild.data)
+        for node in entry:
+            if node.tag == 'PMID':
+                if not node.text:
+                    raise ValueError('Missing PMID value')
+                #
+                id = str(node.text)
             #
-            elif node.tagName == 'Article':
-                for childnode in node.childNodes:
-                    if childnode.nodeType != childnode.ELEMENT_NODE:
-                        continue
+            elif node.tag == 'Article':
+                for childnode in node:
+                    if childnode.tag == 'Journal':
+                        self._parseJournalInfo(childnode, info)
                     #
-                    if childnode.tagName == 'Journal':
-                        self._parseJournalInfo(childnode.childNodes, info)
-                    #
-                    elif childnode.tagName == 'ArticleDate':
+                    elif childnode.tag == 'ArticleDate':
                         if ('year' not in info) or (not info['year']):
-                            for grandchildnode in childnode.childNodes:
-                                if grandchildnode.nodeType != grandchildnode.ELEMENT_NODE:
-                                    continue
-                                #
-                                if grandchildnode.tagName == 'Year':
-                                    info['year'] = self._processNodes(grandchildnode.childNodes, False)
+                            for grandchildnode in childnode:
+                                if grandchildnode.tag == 'Year':
+                                    info['year'] = self._processText(grandchildnode, False)
                                 #
                             #
                         #
-                    elif childnode.tagName == 'ArticleTitle':
-                        info['title'] = self._processNodes(childnode.childNodes, True)
-                    elif childnode.tagName == 'Pagination':
-                        self._parsePageInfo(childnode.childNodes, info)
-                    elif childnode.tagName == 'AuthorList':
-                        self._parseAuthorList(childnode.childNodes, info)
-                    elif childnode.tagName == 'ELocationID':
-                        if childnode.hasAttribute('EIdType') and childnode.hasAttribute('ValidYN'):
-                            EIdType = childnode.getAttribute('EIdType')
-                            ValidYN = childnode.getAttribute('ValidYN')
-                            if EIdType == 'doi' and ValidYN == 'Y':
-                                info['pdbx_database_id_DOI'] = self._processNodes(childnode.childNodes, False)
-                            #
+                    elif childnode.tag == 'ArticleTitle':
+                        info['title'] = self._processText(childnode, True)
+                    elif childnode.tag == 'Pagination':
+                        self._parsePageInfo(childnode, info)
+                    elif childnode.tag == 'AuthorList':
+                        self._parseAuthorList(childnode, info)
+                    elif childnode.tag == 'ELocationID':
+                        if (childnode.get('EIdType') == 'doi') and (childnode.get('ValidYN') == 'Y'):
+                            info['pdbx_database_id_DOI'] = self._processText(childnode, False)
                         #
                     #
                 #
-            elif node.tagName == 'MedlineJournalInfo':
+            elif node.tag == 'MedlineJournalInfo':
                 if 'journal_abbrev' in info:
                     continue
                 #
-                for childnode in node.childNodes:
-                    if childnode.nodeType != childnode.ELEMENT_NODE:
-                        continue
-                    #
-                    if childnode.tagName == 'MedlineTA':
-                        info['journal_abbrev'] = self._processNodes(childnode.childNodes, False)
+                for childnode in node:
+                    if childnode.tag == 'MedlineTA':
+                        info['journal_abbrev'] = self._processText(childnode, False)
                     #
                 #
             #
@@ -931,78 +968,44 @@ class FetchResultParser(object):
 
     def _processPubmedDataNode(self, entry):
         doi = ''
-        for node in entry.childNodes:
-            if node.nodeType != node.ELEMENT_NODE:
-                continue
-            #
-            if node.tagName == 'ArticleIdList':
-                for childnode in node.childNodes:
-                    if childnode.nodeType != childnode.ELEMENT_NODE:
-                        continue
-                    #
-                    if childnode.tagName == 'ArticleId':
-                        if childnode.hasAttribute('IdType'):
-                            IdType = childnode.getAttribute('IdType')
-                            if IdType == 'doi':
-                                doi = self._processNodes(childnode.childNodes, False)
-                            #
-                        #
+        for node in entry:
+            if node.tag == 'ArticleIdList':
+                for childnode in node:
+                    if (childnode.tag == 'ArticleId') and (childnode.get('IdType') == 'doi'):
+                        doi = self._processText(childnode, False)
                     #
                 #
             #
         #
         return doi
 
-    def _parseJournalInfo(self, childNodes, info):
-        for node in childNodes:
-            if node.nodeType != node.ELEMENT_NODE:
-                continue
-            #
-            if node.tagName == 'ISSN':
-                info['journal_id_ISSN'] = self._processNodes(node.childNodes, False)
-            elif node.tagName == 'JournalIssue':
-                self._parseJournalIssue(node.childNodes, info)
-            elif node.tagName == 'ISOAbbreviation':
-                info['journal_abbrev'] = self._processNodes(node.childNodes, False)
+    def _parseJournalInfo(self, entry, info):
+        for node in entry:
+            if node.tag == 'ISSN':
+                info['journal_id_ISSN'] = self._processText(node, False)
+            elif node.tag == 'JournalIssue':
+                self._parseJournalIssue(node, info)
+            elif node.tag == 'ISOAbbreviation':
+                info['journal_abbrev'] = self._processText(node, False)
         #
 
-    def _parseJournalIssue(self, childNodes, info):
-        for node in childNodes:
-            if node.nodeType != node.ELEMENT_NODE:
-                continue
-            #
-            if node.tagName == 'Volume':
-                info['journal_volume'] = self._processNodes(node.childNodes, False)
-            elif node.tagName == 'PubDate':
-                for childnode in node.childNodes:
-                    if childnode.nodeType != childnode.ELEMENT_NODE:
-                        continue
-                    #
-                    if childnode.tagName == 'Year':
-                        info['year'] = self._processNodes(childnode.childNodes, False)
+    def _parseJournalIssue(self, entry, info):
+        for node in entry:
+            if node.tag == 'Volume':
+                info['journal_volume'] = self._processText(node, False)
+            elif node.tag == 'PubDate':
+                for childnode in node:
+                    if childnode.tag == 'Year':
+                        info['year'] = self._processText(childnode, False)
                     #
                 #
-
-    #               if (not info.has_key('year')) or (not info['year']):
-    #                   for childnode in node.childNodes:
-    #                       if childnode.nodeType != childnode.ELEMENT_NODE:
-    #                           continue
-    #                       #
-    #                       if childnode.tagName == 'MedlineDate':
-    #                           info['year'] = self._processNodes(childnode.childNodes, False)
-    #                       #
-    #                   #
-    #               #
-    #
-    #
-
-    def _parsePageInfo(self, childNodes, info):
-        for node in childNodes:
-            if node.nodeType != node.ELEMENT_NODE:
-                continue
             #
-            if node.tagName == 'MedlinePgn':
-                pages = self._processNodes(node.childNodes, False)
+        #
+
+    def _parsePageInfo(self, entry, info):
+        for node in entry:
+            if node.tag == 'MedlinePgn':
+                pages = self._processText(node, False)
                 if not pages:
                     continue
                 #
@@ -1022,40 +1025,33 @@ class FetchResultParser(object):
             #
         #
 
-    def _parseAuthorList(self, childNodes, info):
+    def _parseAuthorList(self, entry, info):
         authorListString = ''
         authorListArray = []
-        for node in childNodes:
-            if node.nodeType != node.ELEMENT_NODE or \
-                    node.tagName != 'Author':
+        for node in entry:
+            if node.tag != 'Author':
                 continue
             #
             initial = ''
             lastName = ''
             suffix = ''
             orcid = ''
-            for childnode in node.childNodes:
-                if childnode.nodeType != childnode.ELEMENT_NODE:
-                    continue
-                #
-                if childnode.tagName == 'LastName':
-                    lastName = self._processNodes(childnode.childNodes, False)
-                elif childnode.tagName == 'Initials':
-                    initial = self._processNodes(childnode.childNodes, False)
-                elif childnode.tagName == 'Suffix':
-                    suffix = self._processNodes(childnode.childNodes, False)
+            for childnode in node:
+                if childnode.tag == 'LastName':
+                    lastName = self._processText(childnode, False)
+                elif childnode.tag == 'Initials':
+                    initial = self._processText(childnode, False)
+                elif childnode.tag == 'Suffix':
+                    suffix = self._processText(childnode, False)
                     # if suffix and (not suffix.endswith('.')):
                     if (suffix == 'Jr') or (suffix == 'Sr'):
                         suffix += '.'
                     #
-                elif childnode.tagName == 'Identifier':
-                    if childnode.hasAttribute('Source'):
-                        Source = childnode.getAttribute('Source')
-                        if Source == 'ORCID':
-                            orcid = self._processNodes(childnode.childNodes, False)
-                            orcid = orcid.replace(' ', '').replace('http://orcid.org/', '').replace(
-                                'https://orcid.org/', '')
-                        #
+                elif childnode.tag == 'Identifier':
+                    if childnode.get('Source') == 'ORCID':
+                        orcid = self._processText(childnode, False)
+                        orcid = orcid.replace(' ', '').replace('http://orcid.org/', '').replace(
+                            'https://orcid.org/', '')
                     #
                 #
             #
@@ -1082,28 +1078,32 @@ class FetchResultParser(object):
             info['author_list'] = authorListArray
         #
 
-    def _processNodes(self, childNodes, angstromFlag):
+    def _processText(self, node, angstromFlag):
+        """ Concatenate all text pieces under node (mixed content such as <i>, <sup> included), separated by single space
+        """
         text = ''
-        for node in childNodes:
-            if node.nodeType == node.ELEMENT_NODE:
-                if text:
-                    text += ' '
-                #
-                text += self._processNodes(node.childNodes, angstromFlag)
-            else:
+        if node.text:
+            text += self._processData(node.text, angstromFlag)
+        #
+        for childnode in node:
+            if text:
+                text += ' '
+            #
+            text += self._processText(childnode, angstromFlag)
+            if childnode.tail:
                 if text:
                     text += ' '
                 #
-                text += self._processData(node, angstromFlag)
+                text += self._processData(childnode.tail, angstromFlag)
             #
         #
         return text
 
-    def _processData(self, node, angstromFlag):
-        if not node:
+    def _processData(self, data, angstromFlag):
+        if not data:
             return ''
         #
-        return self.__codeHandler.process(node.data, angstromFlag)
+        return self.__codeHandler.process(data, angstromFlag)
 
 
 if __name__ == "__main__":
@@ -24,6 +24,7 @@ __version__ = "V0.07"
 import os
 import sys
 from wwpdb.utils.config.ConfigInfo import ConfigInfo
+from wwpdb.apps.releasemodule.citation.EUtilsClient import getEUtilsClient
 from wwpdb.apps.releasemodule.citation.FetchResultParser import FetchResultParser
 from wwpdb.apps.releasemodule.utils.Utility import getFileName, RunScript
 
@@ -31,19 +32,23 @@ from wwpdb.apps.releasemodule.utils.Utility import getFileName, RunScript
 class FetchUtil(object):
     """
     """
-    def __init__(self, path='.', processLabel='', idList=None, siteId=None, mpl=None, log=sys.stderr, verbose=False):  # pylint: disable=unused-argument
+    def __init__(self, path='.', processLabel='', idList=None, siteId=None, mpl=None, client=None, log=sys.stderr, verbose=False):
         """
         """
         self.__sessionPath = path
         self.__processLabel = processLabel
         self.__pubmedIdList = idList
-        # self.__lfh = log
-        # self.__verbose = verbose
+        self.__lfh = log
+        self.__verbose = verbose
         self.__pubmedInfoList = []
         # self.__pubmedInfoMap = {}
         self.__cI = ConfigInfo(siteId)
         self.__apikey = self.__cI.get('NCBI_API_KEY')
         self.__mpl = mpl
+        self.__client = client
+        if self.__client is None:
+            self.__client = getEUtilsClient(siteId=siteId, log=self.__lfh, verbose=self.__verbose)
+        #
 
     def doFetch(self):
         """ Run NCBI Pubmed fetch
@@ -69,6 +74,77 @@ class FetchUtil(object):
             beg += num
         #
 
+    def doHistoryFetch(self, pageSize=2000):
+        """ Run NCBI Pubmed fetch through NCBI history server. The ID set is uploaded once with epost
+            (or POSTed straight to efetch if it fits into one page) and read back in large pages.
+        """
+        if not self.__pubmedIdList:
+            return
+        #
+        if not self.__client:
+            self.doFetch()
+            return
+        #
+        self.__pubmedIdList = sorted(set(self.__pubmedIdList))
+        length = len(self.__pubmedIdList)
+        if length <= pageSize:
+            data = self.__client.efetch(self.__pubmedIdList, post=True, limiter=self.__mpl)
+            if data is None:
+                self.doFetch()
+            else:
+                self._readFetchResultData(data)
+            #
+            return
+        #
+        webEnv, queryKey = self.postIdList()
+        if not webEnv:
+            self.doFetch()
+            return
+        #
+        allFetched = True
+        for retstart in range(0, length, pageSize):
+            if not self.fetchHistoryPage(webEnv, queryKey, retstart, pageSize):
+                allFetched = False
+            #
+        #
+        if not allFetched:
+            self.fetchMissing()
+        #
+
+    def postIdList(self):
+        """ Upload unique pubmed ID list to NCBI history server, returns (WebEnv, query_key)
+        """
+        if (not self.__client) or (not self.__pubmedIdList):
+            return None, None
+        #
+        return self.__client.epost(sorted(set(self.__pubmedIdList)), limiter=self.__mpl)
+
+    def fetchHistoryPage(self, webEnv, queryKey, retstart, retmax):
+        """ Fetch one page of records from NCBI history server
+        """
+        if not self.__client:
+            return False
+        #
+        data = self.__client.efetchHistory(webEnv, queryKey, retstart=retstart, retmax=retmax, limiter=self.__mpl)
+        if data is None:
+            return False
+        #
+        self._readFetchResultData(data)
+        return True
+
+    def fetchMissing(self):
+        """ Re-fetch pubmed IDs not returned yet with batched efetch requests
+        """
+        fetchedMap = self.getPubmedInfoMap()
+        missingList = [pid for pid in self.__pubmedIdList if pid not in fetchedMap]
+        if not missingList:
+            return
+        #
+        allIdList = self.__pubmedIdList
+        self.__pubmedIdList = missingList
+        self.doFetch()
+        self.__pubmedIdList = allIdList
+
     def getPubmedInfoList(self):
         return self.__pubmedInfoList
 
@@ -83,6 +159,19 @@ class FetchUtil(object):
         return pubmedInfoMap
 
     def _runNCBIFetchCommand(self, ids):
+        """ Run NCBI efetch with in-process E-utilities client, fall back to tcsh+curl script
+        """
+        if self.__client:
+            # Speed limit requests (including retries)
+            data = self.__client.efetch(ids, limiter=self.__mpl)
+            if data is not None:
+                self._readFetchResultData(data)
+                return
+            #
+        #
+        self._runNCBIFetchScript(ids)
+
+    def _runNCBIFetchScript(self, ids):
         """ Create NCBI webservice URL and run webservice
         """
         if self.__apikey:
@@ -114,6 +203,15 @@ class FetchUtil(object):
         RunScript(self.__sessionPath, scriptfile, logfile)
         self._readFetchResultXml(xmlfile)
 
+    def _readFetchResultData(self, data):
+        """ Read pubmed fetch result xml from memory
+        """
+        parser = FetchResultParser(xmldata=data)
+        pubmedInfo = parser.getPubmedInfoList()
+        if pubmedInfo:
+            self.__pubmedInfoList.extend(pubmedInfo)
+        #
+
     def _readFetchResultXml(self, xmlfile):
         """ Read pubmed fetch result xml file
         """
@@ -27,6 +27,17 @@ import traceback
 from wwpdb.apps.releasemodule.citation.MatchUtil import MatchUtil
 
 
+def getMatchKey(entry):
+    """ Return the entry items MatchUtil results depend on, or None if MatchUtil would skip the entry
+    """
+    for item in ('rcsb_annotator', 'c_title', 'pubmed_author', 'structure_id'):
+        if item not in entry:
+            return None
+        #
+    #
+    return entry['c_title'], tuple(entry['pubmed_author'])
+
+
 class MatchWorker(multiprocessing.Process):
     """
     """
@@ -40,12 +51,24 @@ class MatchWorker(multiprocessing.Process):
         self.__resultQueue = resultQueue
         self.__lfh = log
         self.__verbose = verbose
+        self.__matchListMap = {}
 
     def getMatchList(self, entry):
+        """ Entries with the same title and author search terms (e.g. group depositions) have the same match list,
+            which is only calculated once
+        """
+        key = getMatchKey(entry)
+        if (key is not None) and (key in self.__matchListMap):
+            return list(self.__matchListMap[key])
+        #
         mUtil = MatchUtil(entry=entry, termMap=self.__termMap, pubmedInfo=self.__pubmedInfo,
                           log=self.__lfh, verbose=self.__verbose)
         mUtil.run()
-        return mUtil.getMatchList()
+        mlist = mUtil.getMatchList()
+        if key is not None:
+            self.__matchListMap[key] = mlist
+        #
+        return mlist
 
     def run(self):
         # processName = self.name
@@ -84,7 +107,25 @@ class MatchMP(object):
     def run(self):
         numProc = multiprocessing.cpu_count() * 2
         #
-        subLists = [self.__entryList[i::numProc] for i in range(numProc)]
+        # Keep entries with the same title and author terms in the same sub list so they are matched only once
+        groupMap = {}
+        groupList = []
+        for entry in self.__entryList:
+            key = getMatchKey(entry)
+            if (key is None) or (key not in groupMap):
+                group = []
+                groupList.append(group)
+                if key is not None:
+                    groupMap[key] = group
+                #
+            else:
+                group = groupMap[key]
+            #
+            group.append(entry)
+        #
+        subLists = [[] for i in range(numProc)]
+        for i, group in enumerate(groupList):
+            subLists[i % numProc].extend(group)
         #
         taskQueue = multiprocessing.Queue()
         resultQueue = multiprocessing.Queue()
@@ -23,7 +23,7 @@ __version__ = "V0.07"
 import operator
 import sys
 
-from wwpdb.apps.releasemodule.citation.StringUtil import calStringSimilarity
+from wwpdb.apps.releasemodule.citation.StringUtil import calStringSimilarityList
 
 
 class MatchUtil(object):
@@ -73,11 +73,10 @@ class MatchUtil(object):
         return idlist
 
     def _findMatchList(self, idlist):
-        for p_id in idlist:
-            if p_id not in self.__pubmedInfo:
-                continue
-            sim = calStringSimilarity(self.__entry['c_title'],
-                                      self.__pubmedInfo[p_id]['title'])
+        idlist = [p_id for p_id in idlist if p_id in self.__pubmedInfo]
+        simList = calStringSimilarityList(self.__entry['c_title'], [self.__pubmedInfo[p_id]['title'] for p_id in idlist],
+                                          minSimilarity=0.5)
+        for p_id, sim in zip(idlist, simList):
             if sim < 0.5:
                 continue
             #
@@ -162,7 +162,7 @@ class MonitorCitationUpdate(object):
                 #
                 # Update similarity score
                 #
-                sim = calStringSimilarity(dir['c_title'], pdir['title'])
+                sim = calStringSimilarity(dir['c_title'], pdir['title'], minSimilarity=0.5)
                 if sim < 0.5:
                     continue
                 #
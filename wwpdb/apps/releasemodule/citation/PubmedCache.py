@@ -0,0 +1,172 @@
+##
+# File:  PubmedCache.py
+# Date:  18-Oct-2026
+# Updates:
+##
+"""
+Persistent SQLite cache of NCBI Pubmed esearch and efetch results shared between citation finder runs.
+
+This software was developed as part of the World Wide Protein Data Bank
+Common Deposition and Annotation System Project
+
+Copyright (c) 2026 wwPDB
+
+This software is provided under a Creative Commons Attribution 3.0 Unported
+License described at http://creativecommons.org/licenses/by/3.0/.
+
+"""
+__docformat__ = "restructuredtext en"
+__author__ = "Zukang Feng"
+__email__ = "zfeng@rcsb.rutgers.edu"
+__license__ = "Creative Commons Attribution 3.0 Unported"
+__version__ = "V0.07"
+
+import json
+import sqlite3
+import sys
+import time
+
+DAY = 86400.0
+
+# Time to live (seconds) for each kind of cached result
+DEFAULT_TTL = {
+    'author': 1.0 * DAY,     # author term search within reldate window
+    'doi': 7.0 * DAY,        # DOI [aid] search
+    'article': 30.0 * DAY,   # pubmed record with volume and page information
+    'inpress': 2.0 * DAY,    # pubmed record still missing volume or page information
+    'refresh': 28.0 * DAY,   # longest time author term results are kept up to date with incremental searches
+}
+
+
+class PubmedCache(object):
+    """ Cache esearch results keyed by (term, reldate) and efetch results keyed by pubmed ID.
+
+        Results older than the TTL of their kind are reported as missing, except in refresh mode where
+        stale author term results whose last full search is younger than the 'refresh' TTL are returned
+        together with the date to use as 'mindate' for an incremental (datetype=edat) search.
+    """
+
+    def __init__(self, dbPath, ttlMap=None, log=sys.stderr, verbose=False):
+        """
+        """
+        self.__dbPath = dbPath
+        self.__lfh = log  # pylint: disable=unused-private-member
+        self.__verbose = verbose  # pylint: disable=unused-private-member
+        self.__ttlMap = dict(DEFAULT_TTL)
+        if ttlMap:
+            self.__ttlMap.update(ttlMap)
+        #
+        self.__statistics = {}
+        for kind in ('author', 'doi', 'article'):
+            self.__statistics[kind] = {'hit': 0, 'stale': 0, 'miss': 0}
+        #
+        self.__conn = sqlite3.connect(self.__dbPath, timeout=60)
+        self.__conn.execute('CREATE TABLE IF NOT EXISTS search_result (term TEXT NOT NULL, reldate INTEGER NOT NULL, '
+                            + 'id_list TEXT NOT NULL, search_time REAL NOT NULL, full_search_time REAL NOT NULL, '
+                            + 'PRIMARY KEY (term, reldate))')
+        self.__conn.execute('CREATE TABLE IF NOT EXISTS pubmed_article (pmid TEXT NOT NULL PRIMARY KEY, '
+                            + 'info TEXT NOT NULL, fetch_time REAL NOT NULL)')
+        self.__conn.commit()
+
+    def lookupSearch(self, termList, reldate, refresh=False):
+        """ Return (cachedMap, refreshMap): term -> pubmed ID list for fresh results, and
+            term -> (pubmed ID list, mindate) for stale author term results to be refreshed incrementally.
+            DOI terms ('[aid]') are cached with reldate 0.
+        """
+        now = time.time()
+        cachedMap = {}
+        refreshMap = {}
+        for term in termList:
+            kind, key = self.__getSearchKey(term, reldate)
+            row = self.__conn.execute('SELECT id_list, search_time, full_search_time FROM search_result WHERE term = ? AND reldate = ?',
+                                      (term, key)).fetchone()
+            if row is None:
+                self.__statistics[kind]['miss'] += 1
+                continue
+            #
+            idList = json.loads(row[0])
+            if now - row[1] <= self.__ttlMap[kind]:
+                self.__statistics[kind]['hit'] += 1
+                cachedMap[term] = idList
+                continue
+            #
+            self.__statistics[kind]['stale'] += 1
+            if refresh and (kind == 'author') and (now - row[2] <= self.__ttlMap['refresh']):
+                # one day overlap so that records entered while the previous search was running are not missed
+                refreshMap[term] = (idList, time.strftime('%Y/%m/%d', time.localtime(row[1] - DAY)))
+            #
+        #
+        return cachedMap, refreshMap
+
+    def putSearch(self, termMap, reldate, incremental=False):
+        """ Store term -> pubmed ID list results. Incremental results keep the time of the last full search.
+        """
+        now = time.time()
+        for term, idList in termMap.items():
+            _kind, key = self.__getSearchKey(term, reldate)
+            fullSearchTime = now
+            if incremental:
+                row = self.__conn.execute('SELECT full_search_time FROM search_result WHERE term = ? AND reldate = ?',
+                                          (term, key)).fetchone()
+                if row is not None:
+                    fullSearchTime = row[0]
+                #
+            #
+            self.__conn.execute('INSERT OR REPLACE INTO search_result (term, reldate, id_list, search_time, full_search_time) VALUES (?, ?, ?, ?, ?)',
+                                (term, key, json.dumps(idList), now, fullSearchTime))
+        #
+        self.__conn.commit()
+
+    def lookupArticles(self, idList):
+        """ Return pubmed ID -> pubmed information map for fresh cached records
+        """
+        now = time.time()
+        infoMap = {}
+        for pmid in idList:
+            row = self.__conn.execute('SELECT info, fetch_time FROM pubmed_article WHERE pmid = ?', (pmid,)).fetchone()
+            if row is None:
+                self.__statistics['article']['miss'] += 1
+                continue
+            #
+            info = json.loads(row[0])
+            kind = 'article'
+            if ('journal_volume' not in info) or ('page_first' not in info):
+                kind = 'inpress'
+            #
+            if now - row[1] > self.__ttlMap[kind]:
+                self.__statistics['article']['stale'] += 1
+                continue
+            #
+            self.__statistics['article']['hit'] += 1
+            infoMap[pmid] = info
+        #
+        return infoMap
+
+    def putArticles(self, infoMap):
+        """ Store pubmed ID -> pubmed information map
+        """
+        now = time.time()
+        self.__conn.executemany('INSERT OR REPLACE INTO pubmed_article (pmid, info, fetch_time) VALUES (?, ?, ?)',
+                                [(pmid, json.dumps(info), now) for pmid, info in infoMap.items()])
+        self.__conn.commit()
+
+    def getStatistics(self):
+        """ Return kind -> {'hit', 'stale', 'miss'} counts of the lookups made so far
+        """
+        statistics = {}
+        for kind, countMap in self.__statistics.items():
+            statistics[kind] = dict(countMap)
+        #
+        return statistics
+
+    def close(self):
+        if self.__conn is not None:
+            self.__conn.close()
+            self.__conn = None
+        #
+
+    def __getSearchKey(self, term, reldate):
+        if term.endswith('[aid]'):
+            return 'doi', 0
+        #
+        return 'author', reldate
@@ -0,0 +1,487 @@
+##
+# File:  PubmedPipeline.py
+# Date:  18-Oct-2026
+# Updates:
+##
+"""
+Run NCBI pubmed searches and fetches as one asyncio pipeline sharing a single request rate limit.
+
+This software was developed as part of the World Wide Protein Data Bank
+Common Deposition and Annotation System Project
+
+Copyright (c) 2026 wwPDB
+
+This software is provided under a Creative Commons Attribution 3.0 Unported
+License described at http://creativecommons.org/licenses/by/3.0/.
+
+"""
+__docformat__ = "restructuredtext en"
+__author__ = "Zukang Feng"
+__email__ = "zfeng@rcsb.rutgers.edu"
+__license__ = "Creative Commons Attribution 3.0 Unported"
+__version__ = "V0.07"
+
+import asyncio
+import multiprocessing
+import sys
+import threading
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+
+from wwpdb.utils.config.ConfigInfo import ConfigInfo
+
+from wwpdb.apps.releasemodule.citation.EUtilsClient import getEUtilsClient
+from wwpdb.apps.releasemodule.citation.FetchUtil import FetchUtil
+from wwpdb.apps.releasemodule.citation.SearchUtil import SearchUtil
+from wwpdb.apps.releasemodule.utils.MultiProcLimit import MultiProcLimit
+
+
+class PubmedPipeline(object):
+    """ Search pubmed terms and fetch the found pubmed records in one bounded pipeline:
+
+            search tasks --(new pubmed IDs)--> batcher --(ID batches)--> fetch tasks --(ready entries)--> match tasks
+
+        Search tasks take terms from a shared queue, so that a slow term only holds up one task. New pubmed IDs
+        are fetched in batches of 'batchSize' while searches are still running. Requests are made by worker
+        threads over the shared E-utilities client, all of them paced by one MultiProcLimit.
+
+        If entryTermMap and matchFunction are given, an entry is ready once all its terms are resolved and all
+        pubmed IDs found by them are fetched (or failed). Ready entries are passed on in chunks of 'matchBatchSize'
+        to matchFunction(chunkIndex, entryKeyList, termMap, pubmedInfo), run in its own thread pool with the term
+        results and pubmed records of the chunk. Its return values are listed by getMatchResultList().
+    """
+
+    def __init__(self, path='.', termList=None, siteId=None, mindateMap=None, seedIdList=None, articleLookup=None,
+                 rate=None, concurrency=None, batchSize=200, client=None, knownTermMap=None, entryTermMap=None,
+                 matchFunction=None, matchBatchSize=200, matchConcurrency=None, searchCallback=None, fetchCallback=None,
+                 log=sys.stderr, verbose=False):
+        """ mindateMap: term -> 'YYYY/MM/DD' for terms to be searched only for records entered since that date
+            seedIdList: pubmed IDs known before searching to be fetched as well
+            articleLookup: function returning pubmed ID -> pubmed information map for records not to be fetched again
+            knownTermMap: term -> pubmed ID list known before searching (e.g. cached search results). Their pubmed IDs
+                          are fetched; results of terms searched incrementally (mindateMap) are merged into them.
+            entryTermMap: entry key -> term list used for matching
+            searchCallback, fetchCallback: called with the [{'term', 'id', 'searched'}] result of each search and
+                                           the pubmed information list of each fetch request, as in SearchMP and FetchMP
+        """
+        self.__sessionPath = path
+        self.__termList = termList or []
+        self.__siteId = siteId
+        self.__mindateMap = mindateMap or {}
+        self.__seedIdList = seedIdList or []
+        self.__knownTermMap = knownTermMap or {}
+        self.__entryTermMap = entryTermMap or {}
+        self.__matchFunction = matchFunction
+        self.__matchBatchSize = matchBatchSize
+        self.__matchConcurrency = matchConcurrency
+        self.__searchCallback = searchCallback
+        self.__fetchCallback = fetchCallback
+        if not self.__matchConcurrency:
+            self.__matchConcurrency = max(1, int(multiprocessing.cpu_count() / 2))
+        #
+        self.__articleLookup = articleLookup
+        self.__batchSize = batchSize
+        self.__lfh = log
+        self.__verbose = verbose
+        self.__client = client
+        if self.__client is None:
+            self.__client = getEUtilsClient(siteId=self.__siteId, log=self.__lfh, verbose=self.__verbose)
+        #
+        self.__rate = rate
+        if not self.__rate:
+            self.__rate = self.__getRate()
+        #
+        self.__concurrency = concurrency
+        if not self.__concurrency:
+            # Threads only wait on the network, keep enough requests in flight to use the full rate
+            self.__concurrency = max(2, int(self.__rate * 2))
+        #
+        self.__mpl = MultiProcLimit(self.__rate)
+        self.__termMap = {}
+        self.__searchedTermList = []
+        self.__pubmedInfoMap = {}
+        self.__fetchedIdSet = set()
+        self.__matchResultList = []
+        self.__statistics = {}
+        #
+        # Entry readiness bookkeeping, only used in the event loop thread
+        self.__resolvedTermMap = {}
+        self.__resolvedIdSet = set()
+        self.__termWaiterMap = {}
+        self.__idWaiterMap = {}
+        self.__entryIdMap = {}
+        self.__entryWaitCount = {}
+        self.__readyList = []
+        self.__chunkCount = 0
+
+    def run(self, year=2):
+        """ Run the pipeline until all terms are searched and all found pubmed IDs are fetched
+        """
+        self.__statistics = {}
+        for stage in ('search', 'fetch', 'match'):
+            self.__statistics[stage] = {'item': 0, 'request': 0, 'start': None, 'end': None}
+        #
+        executor = ThreadPoolExecutor(max_workers=self.__concurrency)
+        matchExecutor = ThreadPoolExecutor(max_workers=self.__matchConcurrency)
+        loop = asyncio.new_event_loop()
+        try:
+            loop.run_until_complete(self.__runPipeline(loop, executor, matchExecutor, year))
+        finally:
+            loop.close()
+            executor.shutdown(wait=True)
+            matchExecutor.shutdown(wait=True)
+        #
+        if self.__verbose:
+            for stage, stat in self.getStatistics().items():
+                self.__lfh.write("PubmedPipeline %s: %d items in %d requests, %.2fs, %.2f items/s, %.2f requests/s\n"
+                                 % (stage, stat['item'], stat['request'], stat['elapsed'], stat['itemRate'], stat['requestRate']))
+            #
+        #
+
+    def getTermMap(self):
+        return self.__termMap
+
+    def getSearchedTermList(self):
+        """ Return terms whose search completed, including the ones without hit
+        """
+        return self.__searchedTermList
+
+    def getPubmedInfoMap(self, fetchedOnly=False):
+        """ Return pubmed ID -> pubmed information map, including records returned by articleLookup unless fetchedOnly
+        """
+        if not fetchedOnly:
+            return self.__pubmedInfoMap
+        #
+        infoMap = {}
+        for pid in self.__fetchedIdSet:
+            if pid in self.__pubmedInfoMap:
+                infoMap[pid] = self.__pubmedInfoMap[pid]
+            #
+        #
+        return infoMap
+
+    def getMatchResultList(self):
+        """ Return matchFunction results in chunk order
+        """
+        return [result for _index, result in sorted(self.__matchResultList, key=lambda x: x[0])]
+
+    def getStatistics(self):
+        """ Return stage -> {'item', 'request', 'elapsed', 'itemRate', 'requestRate'} throughput of the last run
+        """
+        statistics = {}
+        for stage, stat in self.__statistics.items():
+            elapsed = 0.0
+            if stat['start'] is not None:
+                elapsed = stat['end'] - stat['start']
+            #
+            itemRate = 0.0
+            requestRate = 0.0
+            if elapsed > 0:
+                itemRate = stat['item'] / elapsed
+                requestRate = stat['request'] / elapsed
+            #
+            statistics[stage] = {'item': stat['item'], 'request': stat['request'], 'elapsed': elapsed,
+                                 'itemRate': itemRate, 'requestRate': requestRate}
+        #
+        return statistics
+
+    def getRateStatistics(self):
+        """ Return request rate limiter statistics of the last run
+        """
+        return self.__mpl.getStatistics()
+
+    async def __runPipeline(self, loop, executor, matchExecutor, year):
+        termQueue = asyncio.Queue()
+        for term in self.__termList:
+            termQueue.put_nowait(term)
+        #
+        idQueue = asyncio.Queue(maxsize=self.__batchSize * 4)
+        batchQueue = asyncio.Queue(maxsize=self.__concurrency)
+        matchQueue = asyncio.Queue()
+        #
+        self.__initEntryWait()
+        self.__flushReady(matchQueue, False)
+        #
+        batcher = loop.create_task(self.__runBatcher(idQueue, batchQueue, matchQueue))
+        fetchers = [loop.create_task(self.__runFetcher(loop, executor, batchQueue, matchQueue)) for _i in range(self.__concurrency)]
+        matchers = []
+        if self.__matchFunction:
+            matchers = [loop.create_task(self.__runMatcher(loop, matchExecutor, matchQueue)) for _i in range(self.__matchConcurrency)]
+        #
+        searchers = [loop.create_task(self.__runSearcher(loop, executor, termQueue, idQueue, matchQueue, year))
+                     for _i in range(min(self.__concurrency, max(1, len(self.__termList))))]
+        for pid in self.__seedIdList:
+            await idQueue.put(pid)
+        #
+        for idList in self.__knownTermMap.values():
+            for pid in idList:
+                await idQueue.put(pid)
+            #
+        #
+        await asyncio.gather(*searchers)
+        await idQueue.put(None)
+        await batcher
+        for _fetcher in fetchers:
+            await batchQueue.put(None)
+        #
+        await asyncio.gather(*fetchers)
+        #
+        # Every entry is resolved by now
+        self.__readyList.extend([key for key in self.__entryTermMap if self.__entryWaitCount.get(key, 0) > 0])
+        self.__flushReady(matchQueue, True)
+        for _matcher in matchers:
+            matchQueue.put_nowait(None)
+        #
+        await asyncio.gather(*matchers)
+
+    async def __runSearcher(self, loop, executor, termQueue, idQueue, matchQueue, year):
+        while True:
+            try:
+                term = termQueue.get_nowait()
+            except asyncio.QueueEmpty:
+                break
+            #
+            self.__markStage('search')
+            idList, searched = await loop.run_in_executor(executor, self.__search, term, year)
+            self.__markStage('search', item=1, request=1)
+            if searched:
+                self.__searchedTermList.append(term)
+            #
+            if self.__searchCallback:
+                self.__searchCallback([{'term': term, 'id': idList, 'searched': searched}])
+            #
+            self.__resolveTerm(term, idList, matchQueue)
+            if not idList:
+                continue
+            #
+            self.__termMap[term] = idList
+            for pid in idList:
+                await idQueue.put(pid)
+            #
+        #
+
+    async def __runBatcher(self, idQueue, batchQueue, matchQueue):
+        seenSet = set()
+        batch = []
+        while True:
+            pid = await idQueue.get()
+            if pid is None:
+                break
+            #
+            if pid in seenSet:
+                continue
+            #
+            seenSet.add(pid)
+            batch.append(pid)
+            if len(batch) >= self.__batchSize:
+                await self.__putBatch(batch, batchQueue, matchQueue)
+                batch = []
+            #
+        #
+        if batch:
+            await self.__putBatch(batch, batchQueue, matchQueue)
+        #
+
+    async def __putBatch(self, batch, batchQueue, matchQueue):
+        if self.__articleLookup:
+            infoMap = self.__articleLookup(batch)
+            self.__pubmedInfoMap.update(infoMap)
+            batch = [pid for pid in batch if pid not in infoMap]
+            self.__resolveIds(infoMap.keys(), matchQueue)
+        #
+        if batch:
+            await batchQueue.put(batch)
+        #
+
+    async def __runFetcher(self, loop, executor, batchQueue, matchQueue):
+        while True:
+            batch = await batchQueue.get()
+            if batch is None:
+                break
+            #
+            self.__markStage('fetch')
+            infoMap = await loop.run_in_executor(executor, self.__fetch, batch)
+            self.__markStage('fetch', item=len(batch), request=int((len(batch) + 199) / 200))
+            self.__fetchedIdSet.update(infoMap.keys())
+            self.__pubmedInfoMap.update(infoMap)
+            if self.__fetchCallback and infoMap:
+                self.__fetchCallback(list(infoMap.values()))
+            #
+            # Records missing from the result are not waited for any longer
+            self.__resolveIds(batch, matchQueue)
+        #
+
+    async def __runMatcher(self, loop, matchExecutor, matchQueue):
+        while True:
+            chunk = await matchQueue.get()
+            if chunk is None:
+                break
+            #
+            index, keyList, termMap, pubmedInfo = chunk
+            self.__markStage('match')
+            try:
+                result = await loop.run_in_executor(matchExecutor, self.__matchFunction, index, keyList, termMap, pubmedInfo)
+                self.__matchResultList.append((index, result))
+            except:  # noqa: E722 pylint: disable=bare-except
+                if self.__verbose:
+                    traceback.print_exc(file=self.__lfh)
+                #
+            #
+            self.__markStage('match', item=len(keyList), request=1)
+        #
+
+    def __initEntryWait(self):
+        """ Entries wait for their terms still to be searched and for the pubmed IDs of the known term results
+        """
+        searchSet = set(self.__termList)
+        for key, termList in self.__entryTermMap.items():
+            self.__entryIdMap[key] = set()
+            self.__entryWaitCount[key] = 0
+            for term in set(termList):
+                if term in searchSet:
+                    self.__termWaiterMap.setdefault(term, []).append(key)
+                    self.__entryWaitCount[key] += 1
+                else:
+                    self.__waitForIds(key, self.__knownTermMap.get(term, []))
+                #
+            #
+            if self.__entryWaitCount[key] == 0:
+                self.__readyList.append(key)
+            #
+        #
+
+    def __getTermIdList(self, term):
+        """ Pubmed ID list of a resolved term, incremental search results first followed by previously known ones
+        """
+        knownList = self.__knownTermMap.get(term, [])
+        if term not in self.__resolvedTermMap:
+            return knownList
+        #
+        idList = self.__resolvedTermMap[term]
+        idSet = set(idList)
+        return idList + [pid for pid in knownList if pid not in idSet]
+
+    def __resolveTerm(self, term, idList, matchQueue):
+        self.__resolvedTermMap[term] = idList
+        termIdList = self.__getTermIdList(term)
+        for key in self.__termWaiterMap.pop(term, []):
+            self.__waitForIds(key, termIdList)
+            self.__entryWaitCount[key] -= 1
+            if self.__entryWaitCount[key] == 0:
+                self.__readyList.append(key)
+            #
+        #
+        self.__flushReady(matchQueue, False)
+
+    def __waitForIds(self, key, idList):
+        for pid in idList:
+            if (pid in self.__resolvedIdSet) or (pid in self.__entryIdMap[key]):
+                continue
+            #
+            self.__entryIdMap[key].add(pid)
+            self.__idWaiterMap.setdefault(pid, []).append(key)
+            self.__entryWaitCount[key] += 1
+        #
+
+    def __resolveIds(self, idList, matchQueue):
+        for pid in idList:
+            self.__resolvedIdSet.add(pid)
+            for key in self.__idWaiterMap.pop(pid, []):
+                self.__entryWaitCount[key] -= 1
+                if self.__entryWaitCount[key] == 0:
+                    self.__readyList.append(key)
+                #
+            #
+        #
+        self.__flushReady(matchQueue, False)
+
+    def __flushReady(self, matchQueue, final):
+        """ Pass ready entries on to the match stage in chunks, together with the term results and records they use
+        """
+        if not self.__matchFunction:
+            self.__readyList = []
+            return
+        #
+        while (len(self.__readyList) >= self.__matchBatchSize) or (final and self.__readyList):
+            keyList = self.__readyList[:self.__matchBatchSize]
+            self.__readyList = self.__readyList[self.__matchBatchSize:]
+            termMap = {}
+            pubmedInfo = {}
+            for key in keyList:
+                self.__entryWaitCount[key] = 0
+                for term in self.__entryTermMap[key]:
+                    idList = self.__getTermIdList(term)
+                    if not idList:
+                        continue
+                    #
+                    termMap[term] = idList
+                    for pid in idList:
+                        if pid in self.__pubmedInfoMap:
+                            pubmedInfo[pid] = self.__pubmedInfoMap[pid]
+                        #
+                    #
+                #
+            #
+            matchQueue.put_nowait((self.__chunkCount, keyList, termMap, pubmedInfo))
+            self.__chunkCount += 1
+        #
+
+    def __search(self, term, year):
+        """ Run in worker thread
+        """
+        try:
+            search = SearchUtil(path=self.__sessionPath, processLabel=self.__getProcessLabel(), term=term, siteId=self.__siteId,
+                                client=self.__client, mpl=self.__mpl, log=self.__lfh, verbose=self.__verbose)
+            search.doSearch(year=year, mindate=self.__mindateMap.get(term))
+            return search.getPubmedIdList(), search.isSearched()
+        except:  # noqa: E722 pylint: disable=bare-except
+            if self.__verbose:
+                traceback.print_exc(file=self.__lfh)
+            #
+        #
+        return [], False
+
+    def __fetch(self, idList):
+        """ Run in worker thread
+        """
+        try:
+            fetch = FetchUtil(path=self.__sessionPath, processLabel=self.__getProcessLabel(), idList=idList, siteId=self.__siteId,
+                              mpl=self.__mpl, client=self.__client, log=self.__lfh, verbose=self.__verbose)
+            fetch.doFetch()
+            return fetch.getPubmedInfoMap()
+        except:  # noqa: E722 pylint: disable=bare-except
+            if self.__verbose:
+                traceback.print_exc(file=self.__lfh)
+            #
+        #
+        return {}
+
+    def __getProcessLabel(self):
+        """ Label of the script and result files of the curl fallback, one set per worker thread so that
+            concurrent fallbacks never read each other's results
+        """
+        return 'pipeline_' + str(threading.get_ident())
+
+    def __markStage(self, stage, item=0, request=0):
+        stat = self.__statistics[stage]
+        now = time.time()
+        if stat['start'] is None:
+            stat['start'] = now
+        #
+        stat['end'] = now
+        stat['item'] += item
+        stat['request'] += request
+
+    def __getRate(self):
+        cI = ConfigInfo(self.__siteId)
+        apikey = cI.get('NCBI_API_KEY')
+        apirate = cI.get('NCBI_API_RATE')
+        # Leave room for other processes
+        if apikey:
+            if apirate:
+                return int(apirate)
+            #
+            return 8
+        #
+        return 1
@@ -127,8 +127,8 @@ class ReadCitationFinderResult(object):
         #
         # Re-fetch NCBI pubmed server for selected pubmed entries
         #
-        fu = FetchUtil(path=self.__sessionPath, idList=idlist, log=self.__lfh, verbose=self.__verbose)
-        fu.doFetch()
+        fu = FetchUtil(path=self.__sessionPath, idList=idlist, siteId=self.__siteId, log=self.__lfh, verbose=self.__verbose)
+        fu.doHistoryFetch()
         self.__pubmedInfoMap = fu.getPubmedInfoMap()
 
     def __updateEntryList(self, annotator):
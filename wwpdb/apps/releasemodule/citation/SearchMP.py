@@ -35,7 +35,7 @@ class SearchWorker(multiprocessing.Process):
     """
 
     def __init__(self, path='.', processLabel='', siteId=None, taskQueue=None, resultQueue=None,
-                 mpl=None, year=2, log=sys.stderr, verbose=False):
+                 mpl=None, year=2, mindateMap=None, log=sys.stderr, verbose=False):
         multiprocessing.Process.__init__(self)
         self.__sessionPath = path
         self.__processLabel = processLabel
@@ -44,17 +44,16 @@ class SearchWorker(multiprocessing.Process):
         self.__resultQueue = resultQueue
         self.__mpl = mpl
         self.__year = year
+        self.__mindateMap = mindateMap or {}
         self.__lfh = log
         self.__verbose = verbose
 
     def fetchEntryList(self, term):
-        search = SearchUtil(path=self.__sessionPath, processLabel=self.__processLabel,
-                            term=term, siteId=self.__siteId, log=self.__lfh, verbose=self.__verbose)
-        # Speed limit
-        if self.__mpl:
-            self.__mpl.waitnext()
-        search.doSearch(year=self.__year)
-        return search.getPubmedIdList()
+        # Speed limit is applied to each request made by the search
+        search = SearchUtil(path=self.__sessionPath, processLabel=self.__processLabel, term=term,
+                            siteId=self.__siteId, mpl=self.__mpl, log=self.__lfh, verbose=self.__verbose)
+        search.doSearch(year=self.__year, mindate=self.__mindateMap.get(term))
+        return search.getPubmedIdList(), search.isSearched()
 
     def run(self):
         # processName = self.name
@@ -66,13 +65,14 @@ class SearchWorker(multiprocessing.Process):
             #
             resultList = []
             for term in nextList:
-                f_list = self.fetchEntryList(term)
-                if not f_list:
+                f_list, searched = self.fetchEntryList(term)
+                if (not f_list) and (not searched):
                     continue
                 #
                 tdir = {}
                 tdir['term'] = term
                 tdir['id'] = f_list
+                tdir['searched'] = searched
                 resultList.append(tdir)
             #
             self.__resultQueue.put(resultList)
@@ -83,15 +83,21 @@ class SearchMP(object):
     """
     """
 
-    def __init__(self, path='.', termList=None, siteId=None, log=sys.stderr, verbose=False):
-        """
+    def __init__(self, path='.', termList=None, siteId=None, mindateMap=None, callback=None, chunkSize=20, log=sys.stderr, verbose=False):
+        """ mindateMap: term -> 'YYYY/MM/DD' for terms to be searched only for records entered since that date
+            callback: called with the [{'term', 'id', 'searched'}] results of each completed chunk of terms
         """
         self.__siteId = siteId
         self.__sessionPath = path
         self.__termList = termList
         self.__lfh = log
         self.__verbose = verbose
+        self.__mindateMap = mindateMap
+        self.__callback = callback
+        self.__chunkSize = chunkSize
         self.__termMap = {}
+        self.__searchedTermList = []
+        self.__rateStatistics = {}
         self.__cI = ConfigInfo(self.__siteId)
         self.__apikey = self.__cI.get('NCBI_API_KEY')
         self.__apirate = self.__cI.get('NCBI_API_RATE')
@@ -110,14 +116,16 @@ class SearchMP(object):
         numProc = min(numProc, rate + 1)
         mpl = MultiProcLimit(rate)
         #
-        subLists = [self.__termList[i::numProc] for i in range(numProc)]
+        # Small chunks handed out on demand, so that a slow chunk does not hold up the others
+        subLists = [self.__termList[i:i + self.__chunkSize] for i in range(0, len(self.__termList), self.__chunkSize)]
         #
         taskQueue = multiprocessing.Queue()
         resultQueue = multiprocessing.Queue()
         #
         workers = [SearchWorker(path=self.__sessionPath, processLabel=str(i + 1),
                                 siteId=self.__siteId, taskQueue=taskQueue, resultQueue=resultQueue,
-                                mpl=mpl, year=year, log=self.__lfh, verbose=self.__verbose) for i in range(numProc)]
+                                mpl=mpl, year=year, mindateMap=self.__mindateMap, log=self.__lfh, verbose=self.__verbose)
+                   for i in range(numProc)]
         #
         for w in workers:
             w.start()
@@ -133,8 +141,16 @@ class SearchMP(object):
             if not rqlist:
                 continue
             #
+            if self.__callback:
+                self.__callback(rqlist)
+            #
             for rqdir in rqlist:
-                self.__termMap[rqdir['term']] = rqdir['id']
+                if rqdir['searched']:
+                    self.__searchedTermList.append(rqdir['term'])
+                #
+                if rqdir['id']:
+                    self.__termMap[rqdir['term']] = rqdir['id']
+                #
             #
         #
         try:
@@ -147,10 +163,26 @@ class SearchMP(object):
                 traceback.print_exc(file=self.__lfh)
             #
         #
+        self.__rateStatistics = mpl.getStatistics()
+        if self.__verbose:
+            self.__lfh.write("SearchMP: %d requests at %.2f/s (limit %.2f/s), average wait %.3fs, throttled %d\n"
+                             % (self.__rateStatistics['request'], self.__rateStatistics['achievedRate'], self.__rateStatistics['rate'],
+                                self.__rateStatistics['waitAverage'], self.__rateStatistics['throttled']))
+        #
 
     def getTermMap(self):
         return self.__termMap
 
+    def getSearchedTermList(self):
+        """ Return terms whose search completed, including the ones without hit
+        """
+        return self.__searchedTermList
+
+    def getRateStatistics(self):
+        """ Return request rate limiter statistics of the last run
+        """
+        return self.__rateStatistics
+
 
 if __name__ == '__main__':
     f = open(sys.argv[1], 'r')
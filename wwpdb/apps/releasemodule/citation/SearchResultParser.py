@@ -30,18 +30,30 @@ class SearchResultParser(object):
     """Parse Pubmed search result xml file, return pubmed id list
     """
 
-    def __init__(self, xmlfile=None):
+    def __init__(self, xmlfile=None, xmldata=None):
         self.__xmlfile = xmlfile
+        self.__xmldata = xmldata
         self.__pubmedIdList = []
+        self.__valid = False
         self._parseXml()
 
     def getIdList(self):
         return self.__pubmedIdList
 
+    def isValid(self):
+        """ Return True if the xml is a complete esearch result (has <Count>), i.e. an empty ID list means no hit
+        """
+        return self.__valid
+
     def _parseXml(self):
         try:
-            __doc = minidom.parse(self.__xmlfile)
+            if self.__xmldata is not None:
+                __doc = minidom.parseString(self.__xmldata)
+            else:
+                __doc = minidom.parse(self.__xmlfile)
+            #
             self.__pubmedIdList = self._parseDoc(__doc)
+            self.__valid = len(__doc.getElementsByTagName('Count')) > 0
         except:  # noqa: E722 pylint: disable=bare-except
             pass
 
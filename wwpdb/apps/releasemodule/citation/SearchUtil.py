@@ -23,9 +23,11 @@ __version__ = "V0.07"
 
 import os
 import sys
+import time
 
 from wwpdb.utils.config.ConfigInfo import ConfigInfo
 
+from wwpdb.apps.releasemodule.citation.EUtilsClient import getEUtilsClient
 from wwpdb.apps.releasemodule.citation.SearchResultParser import SearchResultParser
 # from wwpdb.apps.releasemodule.utils.Utility import *
 from wwpdb.apps.releasemodule.utils.Utility import getFileName, RunScript
@@ -35,19 +37,49 @@ class SearchUtil(object):
     """
     """
 
-    def __init__(self, path='.', processLabel='', term=None, siteId=None, log=sys.stderr, verbose=False):  # pylint: disable=unused-argument
+    def __init__(self, path='.', processLabel='', term=None, siteId=None, client=None, mpl=None, log=sys.stderr, verbose=False):
         """
         """
         self.__sessionPath = path
         self.__processLabel = processLabel
         self.__term = term
-        # self.__lfh = log
-        # self.__verbose = verbose
+        self.__lfh = log
+        self.__verbose = verbose
         self.__pubmedIdList = []
+        self.__searched = False
         self.__cI = ConfigInfo(siteId)
         self.__apikey = self.__cI.get('NCBI_API_KEY')
+        self.__mpl = mpl
+        self.__client = client
+        if self.__client is None:
+            self.__client = getEUtilsClient(siteId=siteId, log=self.__lfh, verbose=self.__verbose)
+        #
+
+    def doSearch(self, year=2, mindate=None):
+        """ Run pubmed author search with in-process E-utilities client, fall back to tcsh+curl script.
+            If mindate ('YYYY/MM/DD') is given, only records entered into pubmed (edat) since then are searched.
+        """
+        if self.__client:
+            if mindate:
+                data = self.__client.esearch(self.__term, retmax=10000, extraParams=self.__getDateParams(mindate), limiter=self.__mpl)
+            elif self.__term.endswith("[aid]"):
+                data = self.__client.esearch(self.__term, limiter=self.__mpl)
+            else:
+                data = self.__client.esearch(self.__term, reldate=year * 365, retmax=10000, limiter=self.__mpl)
+            #
+            if data is not None:
+                parser = SearchResultParser(xmldata=data)
+                self.__pubmedIdList = parser.getIdList()
+                self.__searched = parser.isValid()
+                return
+            #
+        #
+        self._runNCBISearchCommand(year=year, mindate=mindate)
 
-    def doSearch(self, year=2):
+    def __getDateParams(self, mindate):
+        return [('datetype', 'edat'), ('mindate', mindate), ('maxdate', time.strftime('%Y/%m/%d'))]
+
+    def _runNCBISearchCommand(self, year=2, mindate=None):
         """ Create NCBI webservice URL and run pubmed author search webservice
         """
         # NCBI esearch URL
@@ -57,7 +89,9 @@ class SearchUtil(object):
             api = ""
         #
         query = "https://eutils.ncbi.nlm.nih.gov/entrez/eutils/esearch.fcgi?" + "db=pubmed&term=" + self.__term
-        if self.__term.endswith("[aid]"):
+        if mindate:
+            query += "&retmax=10000&" + "&".join([k + "=" + v for k, v in self.__getDateParams(mindate)]) + "&retmode=xml" + api
+        elif self.__term.endswith("[aid]"):
             query += "&retmode=xml" + api
         else:
             query += "&reldate=%d&retmax=10000&retmode=xml" % (year * 365) + api
@@ -77,6 +111,9 @@ class SearchUtil(object):
         f.write('#\n')
         f.write('/usr/bin/curl -g "' + query + '" > ' + xmlfile + '\n')
         f.close()
+        # Speed limit requests
+        if self.__mpl:
+            self.__mpl.waitnext()
         #
         RunScript(self.__sessionPath, scriptfile, logfile)
         #
@@ -86,10 +123,16 @@ class SearchUtil(object):
         #
         parser = SearchResultParser(xmlfile=filename)
         self.__pubmedIdList = parser.getIdList()
+        self.__searched = parser.isValid()
 
     def getPubmedIdList(self):
         return self.__pubmedIdList
 
+    def isSearched(self):
+        """ Return True if the search completed, so that an empty ID list is a real (cacheable) result
+        """
+        return self.__searched
+
 
 if __name__ == '__main__':
     cf = SearchUtil(term='Badger+J[au]', log=sys.stderr, verbose=False)
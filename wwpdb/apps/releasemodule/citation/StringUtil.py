@@ -22,29 +22,71 @@ __license__ = "Creative Commons Attribution 3.0 Unported"
 __version__ = "V0.07"
 
 
-def calLevenshteinDistance(first, second):
+def getPatternMaskMap(pattern):
+    """ Return character -> bit mask of the positions where the character occurs in pattern,
+        used by the bit-parallel distance calculation.
+    """
+    maskMap = {}
+    bit = 1
+    for c in pattern:
+        maskMap[c] = maskMap.get(c, 0) | bit
+        bit <<= 1
+    #
+    return maskMap
+
+
+def calLevenshteinDistance(first, second, maxDistance=None, maskMap=None):
     """ Find the Levenshtein distance between two strings.
+
+        Uses the bit-parallel algorithm of Myers (1999) as formulated by Hyyro (2001), with the
+        whole column of the (first x second) matrix held in one integer, so that the cost is
+        O(len(second)) integer operations. maskMap may hold getPatternMaskMap(first) when the
+        same first string is compared against many strings.
+
+        If maxDistance is given, the calculation stops as soon as the distance is known to be
+        larger than maxDistance and maxDistance + 1 is returned.
     """
-    if len(first) > len(second):
-        first, second = second, first
-    if len(second) == 0:
-        return len(first)
-    first_length = len(first) + 1
-    second_length = len(second) + 1
-    distance_matrix = [[0] * second_length for x in range(first_length)]
-    for i in range(first_length):
-        distance_matrix[i][0] = i
-    for j in range(second_length):
-        distance_matrix[0][j] = j
-    for i in range(1, first_length):
-        for j in range(1, second_length):
-            deletion = distance_matrix[i - 1][j] + 1
-            insertion = distance_matrix[i][j - 1] + 1
-            substitution = distance_matrix[i - 1][j - 1]
-            if first[i - 1] != second[j - 1]:
-                substitution += 1
-            distance_matrix[i][j] = min(insertion, deletion, substitution)
-    return distance_matrix[first_length - 1][second_length - 1]
+    m = len(first)
+    n = len(second)
+    if m == 0:
+        return n
+    if n == 0:
+        return m
+    #
+    if (maxDistance is not None) and (abs(m - n) > maxDistance):
+        return maxDistance + 1
+    #
+    if maskMap is None:
+        maskMap = getPatternMaskMap(first)
+    #
+    allBits = (1 << m) - 1
+    lastBit = 1 << (m - 1)
+    pv = allBits
+    mv = 0
+    score = m
+    remaining = n
+    for c in second:
+        eq = maskMap.get(c, 0)
+        xv = eq | mv
+        xh = ((((eq & pv) + pv) & allBits) ^ pv) | eq
+        ph = mv | (allBits & ~(xh | pv))
+        mh = pv & xh
+        if ph & lastBit:
+            score += 1
+        elif mh & lastBit:
+            score -= 1
+        #
+        ph = ((ph << 1) | 1) & allBits
+        mh = (mh << 1) & allBits
+        pv = mh | (allBits & ~(xv | ph))
+        mv = ph & xv
+        remaining -= 1
+        # every remaining column can lower the score by at most one
+        if (maxDistance is not None) and (score - remaining > maxDistance):
+            return maxDistance + 1
+        #
+    #
+    return score
 
 
 def levenshtein(seq1, seq2):
@@ -60,8 +102,26 @@ def levenshtein(seq1, seq2):
     return thisrow[len(seq2) - 1]
 
 
-def calStringSimilarity(first, second):
+def getMaxDistance(length, minSimilarity):
+    """ Return the largest distance whose similarity (computed as in calStringSimilarity) is not below minSimilarity
+    """
+    if minSimilarity is None:
+        return None
+    #
+    maxDistance = int((1.0 - minSimilarity) * length)
+    while (maxDistance < length) and ((1.0 - float(maxDistance + 1) / float(length)) >= minSimilarity):
+        maxDistance += 1
+    #
+    while (maxDistance >= 0) and ((1.0 - float(maxDistance) / float(length)) < minSimilarity):
+        maxDistance -= 1
+    #
+    return maxDistance
+
+
+def calStringSimilarity(first, second, minSimilarity=None):
     """ Find similarity (0-1 scale) between two strings.
+
+        If minSimilarity is given, 0.0 is returned as soon as the similarity is known to be below it.
     """
     if not first or not second:
         return 0.0
@@ -74,8 +134,48 @@ def calStringSimilarity(first, second):
     if length == 0:
         return 0.0
     #
-    dist = calLevenshteinDistance(s1, s2)
-    # dist = levenshtein(s1, s2)
+    maxDistance = getMaxDistance(length, minSimilarity)
+    if (maxDistance is not None) and (maxDistance < 0):
+        return 0.0
+    #
+    dist = calLevenshteinDistance(s1, s2, maxDistance=maxDistance)
+    if (maxDistance is not None) and (dist > maxDistance):
+        return 0.0
+    #
     sim = 1.0 - float(dist) / float(length)
     #
     return sim
+
+
+def calStringSimilarityList(first, secondList, minSimilarity=None):
+    """ Find similarities (0-1 scale) between first string and each string in secondList, returns list of scores
+        in the same order. The bit masks of first string are built once for the whole list.
+
+        If minSimilarity is given, 0.0 is returned for the strings whose similarity is below it.
+    """
+    if not first:
+        return [0.0] * len(secondList)
+    #
+    s1 = first.lower()
+    maskMap = getPatternMaskMap(s1)
+    simList = []
+    for second in secondList:
+        if not second:
+            simList.append(0.0)
+            continue
+        #
+        s2 = second.lower()
+        length = max(len(s1), len(s2))
+        maxDistance = getMaxDistance(length, minSimilarity)
+        if (maxDistance is not None) and (maxDistance < 0):
+            simList.append(0.0)
+            continue
+        #
+        dist = calLevenshteinDistance(s1, s2, maxDistance=maxDistance, maskMap=maskMap)
+        if (maxDistance is not None) and (dist > maxDistance):
+            simList.append(0.0)
+            continue
+        #
+        simList.append(1.0 - float(dist) / float(length))
+    #
+    return simList
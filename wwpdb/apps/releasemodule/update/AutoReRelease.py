@@ -144,10 +144,10 @@ class AutoReRelease(object):
     def __findMatchEntryList(self, annotEntryMap):
         """ Find entry list with matched PUBMED ID or DOI citation
         """
-        dbUtil = CombineDbApi(siteId=self.__siteId, path=self.__sessionPath, verbose=self.__verbose, log=self.__lfh)
         entryList = []
         entryIdMap = {}
         pubmedInfoMap = {}
+        candidateList = []
         for _ann, dataList in annotEntryMap.items():
             for dataDict in dataList:
                 if ("status_code" not in dataDict) or (dataDict["status_code"] != "REL"):
@@ -161,52 +161,68 @@ class AutoReRelease(object):
                 if ("pubmed" not in dataDict) or (not dataDict["pubmed"]):
                     continue
                 #
-                pubmedInfo = self.__getMatchPubmedInfo(dataDict)
-                if not pubmedInfo:
+                if not self.__getMatchPubmedList(dataDict):
                     continue
                 #
-                EntryInfo = dbUtil.getEntryInfo([dataDict["structure_id"]])
-                if (not EntryInfo) or ("status_code" not in EntryInfo[0]) or (EntryInfo[0]["status_code"] != "REL"):
-                    continue
-                #
-                if ("post_rel_recvd_coord" in EntryInfo[0]) and (EntryInfo[0]["post_rel_recvd_coord"].upper() == "Y"):
-                    continue
-                #
-                isDEPLocked = False
-                if ("locking" in EntryInfo[0]) and EntryInfo[0]["locking"]:
-                    locking = EntryInfo[0]["locking"].upper()
-                    if locking.find("DEP") != -1:
-                        isDEPLocked = True
-                    #
-                #
-                if not isDEPLocked:
-                    continue
-                #
-                newDataDict = {}
-                for item in ("bmrb_id", "comb_ids", "emdb_id", "exp_method", "pdb_id", "wf_status_code"):
-                    if (item in EntryInfo[0]) and EntryInfo[0][item]:
-                        newDataDict[item] = EntryInfo[0][item]
-                    #
-                #
-                for item_pair in (("annotator", "rcsb_annotator"), ("approval_type", "author_approval_type"),
-                                  ("da_status_code", "status_code"), ("entry", "structure_id")):
-                    if (item_pair[1] in EntryInfo[0]) and EntryInfo[0][item_pair[1]]:
-                        newDataDict[item_pair[0]] = EntryInfo[0][item_pair[1]]
-                    #
+                candidateList.append(dataDict)
+            #
+        #
+        # Read marked unwanted pubmed IDs and entry information for all candidates at once
+        unwantedPubmedMap = self.__getUnwantedPubMedIDMap([dataDict["structure_id"] for dataDict in candidateList])
+        matchList = []
+        for dataDict in candidateList:
+            pubmedInfo = self.__getMatchPubmedInfo(dataDict, unwantedPubmedMap.get(dataDict["structure_id"], []))
+            if pubmedInfo:
+                matchList.append((dataDict, pubmedInfo))
+            #
+        #
+        entryInfoMap = {}
+        if matchList:
+            dbUtil = CombineDbApi(siteId=self.__siteId, path=self.__sessionPath, verbose=self.__verbose, log=self.__lfh)
+            entryInfoMap = dbUtil.getEntryInfoMap([dataDict["structure_id"] for dataDict, _pubmedInfo in matchList])
+        #
+        for dataDict, pubmedInfo in matchList:
+            EntryInfo = entryInfoMap.get(dataDict["structure_id"])
+            if (not EntryInfo) or ("status_code" not in EntryInfo) or (EntryInfo["status_code"] != "REL"):
+                continue
+            #
+            if ("post_rel_recvd_coord" in EntryInfo) and (EntryInfo["post_rel_recvd_coord"].upper() == "Y"):
+                continue
+            #
+            isDEPLocked = False
+            if ("locking" in EntryInfo) and EntryInfo["locking"]:
+                locking = EntryInfo["locking"].upper()
+                if locking.find("DEP") != -1:
+                    isDEPLocked = True
                 #
-                newDataDict["status_code"] = "REREL"
-                newDataDict["directory"] = "modified"
-                newDataDict["option"] = "citation_update"
-                if ("emdb_id" in newDataDict) and newDataDict["emdb_id"]:
-                    newDataDict["emdb_release"] = True
+            #
+            if not isDEPLocked:
+                continue
+            #
+            newDataDict = {}
+            for item in ("bmrb_id", "comb_ids", "emdb_id", "exp_method", "pdb_id", "wf_status_code"):
+                if (item in EntryInfo) and EntryInfo[item]:
+                    newDataDict[item] = EntryInfo[item]
                 #
-                pubmedInfo["id"] = "primary"
-                newDataDict["pubmed"] = [pubmedInfo]
-                entryList.append(newDataDict)
-                if not pubmedInfo["pdbx_database_id_PubMed"] in pubmedInfoMap:
-                    pubmedInfoMap[pubmedInfo["pdbx_database_id_PubMed"]] = pubmedInfo
+            #
+            for item_pair in (("annotator", "rcsb_annotator"), ("approval_type", "author_approval_type"),
+                              ("da_status_code", "status_code"), ("entry", "structure_id")):
+                if (item_pair[1] in EntryInfo) and EntryInfo[item_pair[1]]:
+                    newDataDict[item_pair[0]] = EntryInfo[item_pair[1]]
                 #
             #
+            newDataDict["status_code"] = "REREL"
+            newDataDict["directory"] = "modified"
+            newDataDict["option"] = "citation_update"
+            if ("emdb_id" in newDataDict) and newDataDict["emdb_id"]:
+                newDataDict["emdb_release"] = True
+            #
+            pubmedInfo["id"] = "primary"
+            newDataDict["pubmed"] = [pubmedInfo]
+            entryList.append(newDataDict)
+            if not pubmedInfo["pdbx_database_id_PubMed"] in pubmedInfoMap:
+                pubmedInfoMap[pubmedInfo["pdbx_database_id_PubMed"]] = pubmedInfo
+            #
         #
         if pubmedInfoMap:
             pubmed_file = "pubmed.db"
@@ -218,32 +234,27 @@ class AutoReRelease(object):
         #
         return entryList
 
-    def __getMatchPubmedInfo(self, dataDict):
-        """ Check if existing PUBMED ID or DOI matches with citation finder result
+    def __getMatchPubmedList(self, dataDict):
+        """ Get citation finder results whose PUBMED ID or DOI matches with existing one
         """
-        readUnwantedFalg = False
-        unwanted_pubmed_list = []
-        #
+        matchList = []
         for pdir in dataDict["pubmed"]:
-            foundMatch = False
             for item in ("pdbx_database_id_PubMed", "pdbx_database_id_DOI"):
                 if (item not in dataDict) or (not dataDict[item]) or (item not in pdir) or (not pdir[item]):
                     continue
                 #
                 if str(dataDict[item]).strip() == str(pdir[item]).strip():
-                    foundMatch = True
+                    matchList.append(pdir)
                 #
                 break
             #
-            if not foundMatch:
-                continue
-            #
-            # Get marked unwanted pubmed ID list
-            #
-            if not readUnwantedFalg:
-                readUnwantedFalg = True
-                unwanted_pubmed_list = self.__getUnwantedPubMedIDList(dataDict["structure_id"])
-            #
+        #
+        return matchList
+
+    def __getMatchPubmedInfo(self, dataDict, unwanted_pubmed_list):
+        """ Check if existing PUBMED ID or DOI matches with citation finder result
+        """
+        for pdir in self.__getMatchPubmedList(dataDict):
             if pdir["pdbx_database_id_PubMed"] in unwanted_pubmed_list:
                 continue
             #
@@ -277,6 +288,15 @@ class AutoReRelease(object):
         #
         return {}
 
+    def __getUnwantedPubMedIDMap(self, structureIdList):
+        """ Get structure_id -> unwanted pubmed ID list map
+        """
+        unwantedPubmedMap = {}
+        for structure_id in structureIdList:
+            unwantedPubmedMap[structure_id] = self.__getUnwantedPubMedIDList(structure_id)
+        #
+        return unwantedPubmedMap
+
     def __getUnwantedPubMedIDList(self, structure_id):
         """ Get unwanted pubmed ID list
         """
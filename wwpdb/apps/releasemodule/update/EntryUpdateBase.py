@@ -27,6 +27,7 @@ import os
 import shutil
 import sys
 import tarfile
+import threading
 import time
 import traceback
 
@@ -53,6 +54,8 @@ class EntryUpdateBase(UpdateBase):
         self._pickleData = {}
         self._actionList = []
         self._outPutFiles = []
+        # Bookkeeping calls of the release step running in the current thread, see _runStepGraph()
+        self.__stepRecord = threading.local()
         self.__pI = PathInfo(siteId=self._siteId, sessionPath=self._sessionPath, verbose=False, log=self._lfh)
         self.__checkEMEntry()
         #
@@ -149,13 +152,56 @@ class EntryUpdateBase(UpdateBase):
         tf.extractall(path=self._sessionPath)
         os.remove(tarFilePath)
 
+    def _runStepGraph(self, stepGraph):
+        """ Run the release steps of stepGraph (ReleaseStepGraph). The actions, messages, file status and release files
+            of each step are recorded while it runs and applied afterwards in the order the steps were added, so the
+            pickle content is the same as running the steps one after another. If a step fails, the calls of the
+            steps finished before are still applied before the exception is raised again.
+        """
+        callListMap = {}
+        try:
+            stepGraph.run(runFunction=self.__runRecordedStep, resultMap=callListMap)
+        finally:
+            for name in stepGraph.getStepNameList():
+                for function, args, kwargs in callListMap.get(name, []):
+                    function(*args, **kwargs)
+                #
+            #
+        #
+
+    def __runRecordedStep(self, function):
+        self.__stepRecord.callList = []
+        try:
+            function()
+            return self.__stepRecord.callList
+        finally:
+            self.__stepRecord.callList = None
+        #
+
+    def __recordStepCall(self, function, *args, **kwargs):
+        """ Keep the call for later if a release step is running in the current thread
+        """
+        callList = getattr(self.__stepRecord, 'callList', None)
+        if callList is None:
+            return False
+        #
+        callList.append((function, args, kwargs))
+        return True
+
     def _insertAction(self, action):
-        self._actionList.append({'time' : time.time(), 'action' : action})
+        actionDict = {'time' : time.time(), 'action' : action}
+        if self.__recordStepCall(self._actionList.append, actionDict):
+            return
+        #
+        self._actionList.append(actionDict)
 
     def _insertEntryMessage(self, errType=None, errMessage=None, messageType='error', uniqueFlag=False):
         if (not errType) or (not errMessage):
             return
         #
+        if self.__recordStepCall(self._insertEntryMessage, errType=errType, errMessage=errMessage, messageType=messageType, uniqueFlag=uniqueFlag):
+            return
+        #
         realType = errType
         if realType in self._fileTypeMap:
             realType = self._fileTypeMap[realType][1]
@@ -196,12 +242,18 @@ class EntryUpdateBase(UpdateBase):
         #
 
     def _insertFileStatus(self, fileType, statusCode):
+        if self.__recordStepCall(self._insertFileStatus, fileType, statusCode):
+            return
+        #
         self._fileStatus[fileType] = statusCode
 
     def _insertArchivalFile(self, contentType, formatType, fileName, initialFlag):
         if (contentType not in self._pickleData) or (not self._pickleData[contentType]):
             return
         #
+        if self.__recordStepCall(self._insertArchivalFile, contentType, formatType, fileName, initialFlag):
+            return
+        #
         if 'updated_archival_files' in self._pickleData[contentType]:
             self._pickleData[contentType]['updated_archival_files'][formatType] = fileName
         elif initialFlag:
@@ -212,6 +264,9 @@ class EntryUpdateBase(UpdateBase):
         if (contentType not in self._pickleData) or (not self._pickleData[contentType]):
             return
         #
+        if self.__recordStepCall(self._insertAuditRevisionInfo, contentType, major_revision, minor_revision):
+            return
+        #
         if 'revision' in self._pickleData[contentType]:
             self._pickleData[contentType]['revision']['major_revision'] = major_revision
             self._pickleData[contentType]['revision']['minor_revision'] = minor_revision
@@ -346,6 +401,9 @@ class EntryUpdateBase(UpdateBase):
         if (contentType not in self._pickleData) or (not self._pickleData[contentType]):
             return
         #
+        if self.__recordStepCall(self._insertReleseFile, releaseFileType, contentType, sourceFile, targetFile, entryDirectory, subDirectory, compressFlag):
+            return
+        #
         if releaseFileType in self._pickleData[contentType]:
             self._pickleData[contentType][releaseFileType].append([sourceFile, targetFile, entryDirectory, subDirectory, compressFlag])
         else:
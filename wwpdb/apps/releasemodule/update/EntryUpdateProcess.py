@@ -21,7 +21,6 @@ __email__ = "zfeng@rcsb.rutgers.edu"
 __license__ = "Creative Commons Attribution 3.0 Unported"
 __version__ = "V0.07"
 
-import gzip
 import os
 import shutil
 import sys
@@ -31,6 +30,7 @@ from wwpdb.apps.releasemodule.update.EntryUpdateBase import EntryUpdateBase
 from wwpdb.apps.releasemodule.update.ReleaseUtil import ReleaseUtil
 from wwpdb.apps.releasemodule.update.ReleaseDpUtil import ReleaseDpUtil
 from wwpdb.apps.releasemodule.update.UpdateUtil_v2 import UpdateUtil
+from wwpdb.apps.releasemodule.utils.GzipUtil import gzipFile
 
 
 class EntryUpdateProcess(EntryUpdateBase):
@@ -51,13 +51,31 @@ class EntryUpdateProcess(EntryUpdateBase):
         self.__EmXmlHeaderOnlyFlag = False
         self.__releaseDirectory = {}
         self.__emUtil = None
+        self.__updateUtil = None
+        # Compression of the release files. Entries already run in parallel scheduler workers and release step threads,
+        # so the default of one thread keeps the single threaded gzip module
+        self.__gzipLevel = int(self._cI.get('RELEASE_GZIP_LEVEL', 9))
+        self.__gzipThreads = int(self._cI.get('RELEASE_GZIP_THREADS', 1))
 
     def run(self):
+        if not self.prepare():
+            return
+        #
+        if self.__updateUtil:
+            self.__updateUtil.runPrepared()
+        #
+        self.finish()
+
+    def prepare(self):
+        """ Copy archival files and prepare the content update input, returns False if the entry has been blocked.
+            The content update of the prepared entries is run by getUpdateUtil().runPrepared() or runBatchUpdate(),
+            followed by finish().
+        """
         self.__copyArchivalFilesToSession()
         if self._blockErrorFlag:
             self.__startFiles = {}
             self.__updateEntryIndexPickle()
-            return
+            return False
         else:
             self._dumpLocalPickle()
         #
@@ -75,8 +93,20 @@ class EntryUpdateProcess(EntryUpdateBase):
                 updateEmInfoList = self.__emUtil.getEmUpdatedInfoList()
             #
             updateUtil = UpdateUtil(reqObj=self._reqObj, entryDir=self._entryDir, verbose=self._verbose, log=self._lfh)
-            updateUtil.run(updateEmInfoList)
+            if updateUtil.prepare(updateEmInfoList):
+                self.__updateUtil = updateUtil
+            #
         #
+        return True
+
+    def getUpdateUtil(self):
+        """ Returns the prepared UpdateUtil object, or None if the entry has no content update
+        """
+        return self.__updateUtil
+
+    def finish(self):
+        """ Release the entry after its content update
+        """
         if self.__releaseFlag:
             if self._processing_site == "PDBE":
                 releaseUtil = ReleaseDpUtil(reqObj=self._reqObj, entryDir=self._entryDir, verbose=self._verbose, log=self._lfh)
@@ -265,11 +295,8 @@ class EntryUpdateProcess(EntryUpdateBase):
                         self._copyFileUtil(os.path.join(self._sessionPath, self._entryId + '.summary'), os.path.join(topTargetPath, self._entryId + '.summary'))
                     #
                     if fileList[4]:
-                        with open(fileList[0], 'rb') as f_in:
-                            with gzip.open(os.path.join(targetPath, fileList[1] + '.gz'), 'wb') as f_out:
-                                shutil.copyfileobj(f_in, f_out)
-                            #
-                        #
+                        gzipFile(fileList[0], os.path.join(targetPath, fileList[1] + '.gz'), level=self.__gzipLevel, threads=self.__gzipThreads,
+                                 log=self._lfh, verbose=self._verbose)
                         if not os.access(os.path.join(targetPath, fileList[1] + '.gz'), os.F_OK):
                             self._insertEntryMessage(errType=typeList[5], errMessage="Copy " + fileList[0] + ".gz file to "
                                                      + os.path.join(targetPath, fileList[1] + '.gz') + " file failed for entry "
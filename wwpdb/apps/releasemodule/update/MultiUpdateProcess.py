@@ -22,21 +22,25 @@ __email__ = "zfeng@rcsb.rutgers.edu"
 __license__ = "Creative Commons Attribution 3.0 Unported"
 __version__ = "V0.07"
 
-import multiprocessing
 import os
 import sys
 import time
 import traceback
 
-from rcsb.utils.multiproc.MultiProcUtil import MultiProcUtil
 from wwpdb.apps.msgmodule.io.MessagingIo import MessagingIo
 from wwpdb.utils.db.DBLoadUtil import DBLoadUtil
 from wwpdb.utils.db.StatusHistoryUtils import StatusHistoryUtils
+from wwpdb.io.locator.PathInfo import PathInfo
 
 from wwpdb.apps.releasemodule.update.EntryPullProcess import EntryPullProcess
 from wwpdb.apps.releasemodule.update.EntryUpdateProcess import EntryUpdateProcess
 from wwpdb.apps.releasemodule.update.UpdateBase import UpdateBase
+from wwpdb.apps.releasemodule.update.UpdateUtil_v2 import runBatchUpdate
 from wwpdb.apps.releasemodule.utils.ContentDbApi import ContentDbApi
+from wwpdb.apps.releasemodule.utils.QueryResultCache import QueryResultCache
+import wwpdb.apps.releasemodule.utils.ReleaseProgressStore as ProgressStatus
+from wwpdb.apps.releasemodule.utils.ReleaseProgressStore import ReleaseProgressStore
+from wwpdb.apps.releasemodule.utils.ReleaseScheduler import ReleaseScheduler, getArchiveFileSizeInfo, getWorkerCount
 from wwpdb.apps.releasemodule.utils.StatusDbApi_v2 import StatusDbApi
 from wwpdb.apps.releasemodule.utils.Utility import getCleanValue
 
@@ -51,13 +55,14 @@ class MultiUpdateProcess(UpdateBase):
         self.__task = str(self._reqObj.getValue('task'))
         self.__errorContent = ''
         self.__returnContent = ''
-        if self._cI.get('USE_COMPUTE_CLUSTER'):
-            self.__numProc = len(self.__updateList)
-        else:
-            self.__numProc = int(multiprocessing.cpu_count() / 2)
-        #
+        self.__numProc = getWorkerCount(len(self.__updateList or []), useComputeCluster=self._cI.get('USE_COMPUTE_CLUSTER'))
+        # Entries with EM maps or large files are mostly limited by the archive file system
+        self.__ioBudget = max(1, int(self.__numProc / 2))
         #
         self.__statusHUtils = None
+        self.__timingList = []
+        self.__progressStore = None
+        self.__finishedEntrySet = set()
 
     def getErrorContent(self):
         return self.__errorContent
@@ -65,6 +70,31 @@ class MultiUpdateProcess(UpdateBase):
     def getReturnContent(self):
         return self.__returnContent
 
+    def getTimingList(self):
+        """ Per entry timings of the last run: [{'entry', 'worker', 'start', 'seconds', 'estimated', 'unit_size', 'ok'}]
+        """
+        return self.__timingList
+
+    def setLogHandle(self, log=sys.stderr):
+        """ Log redirection of the detached process (DetachUtils)
+        """
+        self._lfh = log
+
+    def runBackground(self):
+        """ Worker method of the detached update job started by ReleaseWebApp._UpdateOp, the job id is the semaphore
+            set by DetachUtils. Entry progress goes to the session ReleaseProgressStore, followed by the final result.
+        """
+        self.__progressStore = ReleaseProgressStore(self._sessionPath, str(self._reqObj.getValue('semaphore')), log=self._lfh,
+                                                    verbose=self._verbose)
+        try:
+            self.run()
+        except:  # noqa: E722 pylint: disable=bare-except
+            traceback.print_exc(file=self._lfh)
+            self.__errorContent += 'Update failed:\n' + traceback.format_exc()
+        #
+        self.__progressStore.setResult(returnContent=self.__returnContent, errorContent=self.__errorContent)
+        return not self.__errorContent
+
     def run(self):
         """
         """
@@ -72,11 +102,10 @@ class MultiUpdateProcess(UpdateBase):
         if self.__errorContent:
             return
         #
-        mpu = MultiProcUtil(verbose=True)
-        mpu.set(workerObj=self, workerMethod='runMultiProcess')
-        mpu.setWorkingDir(self._sessionPath)
-        _ok, _failList, _retLists, _diagList = mpu.runMulti(dataList=self.__updateList, numProc=self.__numProc,
-                                                            numResults=1)
+        if self.__progressStore:
+            self.__progressStore.addEntries([entryData['entry'] for entryData in self.__updateList])
+        #
+        self.__runScheduler()
         #
         if self.__task == 'Entries in release pending':
             self.__getReturnContentForPullEntries()
@@ -99,11 +128,7 @@ class MultiUpdateProcess(UpdateBase):
                 self._dumpPickle(entryPickleFile, {'id': idMap})
             #
         #
-        mpu = MultiProcUtil(verbose=True)
-        mpu.set(workerObj=self, workerMethod='runMultiProcess')
-        mpu.setWorkingDir(self._sessionPath)
-        _ok, _failList, _retLists, _diagList = mpu.runMulti(dataList=self.__updateList, numProc=self.__numProc,
-                                                            numResults=1)
+        self.__runScheduler()
         #
         dbLoadFileList = []
         updatedEntryList = []
@@ -139,20 +164,146 @@ class MultiUpdateProcess(UpdateBase):
         """
         statusDbUtil = StatusDbApi(siteId=self._siteId, verbose=self._verbose, log=self._lfh)
         rList = []
-        for entryData in dataList:
-            if self.__task == 'Entries in release pending':
+        if self.__task == 'Entries in release pending':
+            for entryData in dataList:
+                self.__addProgressEvent(entryData, ProgressStatus.RUNNING)
                 pulloffProcess = EntryPullProcess(reqObj=self._reqObj, entryDir=entryData, statusDB=statusDbUtil,
                                                   verbose=self._verbose, log=self._lfh)
                 pulloffProcess.run()
+                self.__addEntryResultEvent(entryData)
+                rList.append(entryData['entry'])
+            #
+            return rList, rList, []
+        #
+        # The content update of all entries in this batch is run by one ReleaseUpdate call
+        updateProcessList = []
+        for entryData in dataList:
+            self.__addProgressEvent(entryData, ProgressStatus.RUNNING, step='prepare')
+            updateProcess = EntryUpdateProcess(reqObj=self._reqObj, entryDir=entryData, statusDB=statusDbUtil,
+                                               verbose=self._verbose, log=self._lfh)
+            if updateProcess.prepare():
+                updateProcessList.append((entryData, updateProcess))
             else:
-                updateProcess = EntryUpdateProcess(reqObj=self._reqObj, entryDir=entryData, statusDB=statusDbUtil,
-                                                   verbose=self._verbose, log=self._lfh)
-                updateProcess.run()
+                self.__addEntryResultEvent(entryData)
             #
             rList.append(entryData['entry'])
         #
+        if updateProcessList:
+            for entryData, updateProcess in updateProcessList:
+                if updateProcess.getUpdateUtil():
+                    self.__addProgressEvent(entryData, ProgressStatus.STEP, step='content update')
+                #
+            #
+            runBatchUpdate([updateProcess.getUpdateUtil() for _entryData, updateProcess in updateProcessList if updateProcess.getUpdateUtil()],
+                           dataList[0]['entry'])
+        #
+        for entryData, updateProcess in updateProcessList:
+            self.__addProgressEvent(entryData, ProgressStatus.STEP, step='release files')
+            updateProcess.finish()
+            self.__addEntryResultEvent(entryData)
+        #
         return rList, rList, []
 
+    def getEntryReturnContent(self, entryData, pickleData=None, task=None):
+        """ Returns the result text and the system errors of one entry
+        """
+        if task is None:
+            task = self.__task
+        #
+        if pickleData is None:
+            pickleData = self._loadLocalEntryPickle(entryData['entry'])
+            if not pickleData:
+                return '', []
+            #
+        #
+        content = '\n\nEntry ' + entryData['entry']
+        if task == 'Entries in release pending':
+            if ('comb_ids' in entryData) and entryData['comb_ids']:
+                content += ' (' + entryData['comb_ids'] + ')'
+            elif ('pdb_id' in entryData) and entryData['pdb_id']:
+                content += ' (' + entryData['pdb_id'] + ')'
+            #
+            entryContent, _entrySysError, _status = self._generateReturnContent({}, pickleData['messages'],
+                                                                                pickleData['file_status'])
+            return content + ': ' + entryContent, []
+        #
+        if 'comb_ids' in entryData:
+            content += ' ' + entryData['comb_ids']
+        elif 'pdb_id' in entryData:
+            content += ' ' + entryData['pdb_id']
+        #
+        content += ': '
+        entryContent, entrySysError, status = self._generateReturnContent(entryData, pickleData['messages'],
+                                                                          pickleData['file_status'])
+        if status == 'OK':
+            content += '<span style="color:green">OK</span>'
+        elif status == 'EM-BLOCKED':
+            content += '<span style="color:green">PDB OK</span> / <span style="color:red">EM BLOCKED</span>'
+        elif status == 'BLOCKED':
+            content += '<span style="color:red">BLOCKED</span>'
+        #
+        selectText, _selectMap = self._getReleaseOptionFromPickle(pickleData)
+        content += '\n\nRelease Option: ' + selectText + entryContent
+        return content, entrySysError
+
+    def __addProgressEvent(self, entryData, status, step='', message='', data=None):
+        if self.__progressStore:
+            self.__progressStore.addEvent(entryData['entry'], status, step=step, message=message, data=data)
+        #
+
+    def __addEntryResultEvent(self, entryData):
+        """ Add the done/blocked event of a finished entry, with the task and its form data for rendering the result
+        """
+        if not self.__progressStore:
+            return
+        #
+        pickleData = self._loadLocalEntryPickle(entryData['entry'])
+        status = ProgressStatus.DONE
+        if (not pickleData) or (('block' in pickleData) and pickleData['block']):
+            status = ProgressStatus.BLOCKED
+        #
+        self.__addProgressEvent(entryData, status, data={'task': self.__task, 'entry_data': entryData})
+        self.__finishedEntrySet.add(entryData['entry'])
+
+    def __runScheduler(self):
+        """ Run runMultiProcess on the entries, most expensive first, handing out work to the idle workers
+        """
+        scheduler = ReleaseScheduler(numProc=self.__numProc, ioBudget=self.__ioBudget, historyFile=self._getReleaseTimingPickleFileName(),
+                                     log=self._lfh, verbose=self._verbose)
+        pI = PathInfo(siteId=self._siteId, sessionPath=self._sessionPath, verbose=self._verbose, log=self._lfh)
+        for entryData in self.__updateList:
+            if self.__task == 'Entries in release pending':
+                scheduler.addEntry(entryData)
+                continue
+            #
+            totalSize, emSize = 0, 0
+            try:
+                totalSize, emSize = getArchiveFileSizeInfo(pI.getDirPath(dataSetId=entryData['entry'], fileSource='archive'), entryData['entry'])
+            except:  # noqa: E722 pylint: disable=bare-except
+                traceback.print_exc(file=self._lfh)
+            #
+            scheduler.addEntry(entryData, totalSize=totalSize, emSize=emSize)
+        #
+        self.__timingList = scheduler.run(self.__runWorkUnit)
+
+    def __runWorkUnit(self, dataList, procName):
+        """ Entries of a failed unit without a done/blocked event are reported as failed, so a poll does not show them
+            running until the whole job has finished
+        """
+        try:
+            return self.runMultiProcess(dataList, procName, {}, self._sessionPath)
+        except:  # noqa: E722 pylint: disable=bare-except
+            if self.__progressStore:
+                message = traceback.format_exc().strip().split('\n')[-1]
+                for entryData in dataList:
+                    if entryData['entry'] not in self.__finishedEntrySet:
+                        self.__addProgressEvent(entryData, ProgressStatus.FAILED, message=message)
+                    #
+                #
+            #
+            raise
+        #
+
     def __initialize(self):
         """
         """
@@ -208,17 +359,7 @@ class MultiUpdateProcess(UpdateBase):
     def __getReturnContentForPullEntries(self):
         self.__returnContent = "Task: " + self.__task
         for entryData in self.__updateList:
-            self.__returnContent += '\n\nEntry ' + entryData['entry']
-            if ('comb_ids' in entryData) and entryData['comb_ids']:
-                self.__returnContent += ' (' + entryData['comb_ids'] + ')'
-            elif ('pdb_id' in entryData) and entryData['pdb_id']:
-                self.__returnContent += ' (' + entryData['pdb_id'] + ')'
-            #
-            self.__returnContent += ': '
-            #
-            pickleData = self._loadLocalEntryPickle(entryData['entry'])
-            entryContent, _entrySysError, _status = self._generateReturnContent({}, pickleData['messages'],
-                                                                                pickleData['file_status'])
+            entryContent, _entrySysError = self.getEntryReturnContent(entryData, self._loadLocalEntryPickle(entryData['entry']))
             self.__returnContent += entryContent
         #
 
@@ -253,24 +394,8 @@ class MultiUpdateProcess(UpdateBase):
                     ('update' in pickleData) and pickleData['update']:
                 dbLoadFileList.append(pickleData['model']['session_file'])
             #
-            allContents += '\n\nEntry ' + entryData['entry']
-            if 'comb_ids' in entryData:
-                allContents += ' ' + entryData['comb_ids']
-            elif 'pdb_id' in entryData:
-                allContents += ' ' + entryData['pdb_id']
-            #
-            allContents += ': '
-            entryContent, entrySysError, status = self._generateReturnContent(entryData, pickleData['messages'],
-                                                                              pickleData['file_status'])
-            if status == 'OK':
-                allContents += '<span style="color:green">OK</span>'
-            elif status == 'EM-BLOCKED':
-                allContents += '<span style="color:green">PDB OK</span> / <span style="color:red">EM BLOCKED</span>'
-            elif status == 'BLOCKED':
-                allContents += '<span style="color:red">BLOCKED</span>'
-            #
-            selectText, _selectMap = self._getReleaseOptionFromPickle(pickleData)
-            allContents += '\n\nRelease Option: ' + selectText + entryContent
+            entryContent, entrySysError = self.getEntryReturnContent(entryData, pickleData)
+            allContents += entryContent
             for error in entrySysError:
                 if error not in allSysErrors:
                     allSysErrors.append(error)
@@ -334,7 +459,8 @@ class MultiUpdateProcess(UpdateBase):
         if not entryIdList:
             return
         #
-        contentDB = ContentDbApi(siteId=self._siteId, verbose=self._verbose, log=self._lfh)
+        # getEntryInfo() and getEMInfo() read the same em_admin rows
+        contentDB = ContentDbApi(siteId=self._siteId, verbose=self._verbose, log=self._lfh, queryCache=QueryResultCache(log=self._lfh))
         statusMap = self.__getStatusMap(contentDB.getEntryInfo("', '".join(entryIdList)))
         emStatusMap = self.__getEmStatusMap(contentDB.getEMInfo("', '".join(entryIdList)))
         for entryData in self.__updateList:
@@ -26,12 +26,13 @@ import sys
 import tarfile
 
 from wwpdb.apps.releasemodule.update.EntryUpdateBase import EntryUpdateBase
+from wwpdb.apps.releasemodule.update.ReleaseStepGraph import ReleaseStepGraph
 
 
 class ReleaseDpUtil(EntryUpdateBase):
     """ Class responsible for generating and checking release files
     """
-    def __init__(self, reqObj=None, entryDir=None, verbose=False, log=sys.stderr):
+    def __init__(self, reqObj=None, entryDir=None, maxWorkers=4, verbose=False, log=sys.stderr):
         """
         """
         super(ReleaseDpUtil, self).__init__(reqObj=reqObj, entryDir=entryDir, statusDB=None, verbose=verbose, log=log)
@@ -40,6 +41,7 @@ class ReleaseDpUtil(EntryUpdateBase):
         self.__extendedPdbId = ""
         self.__major_revision = ""
         self.__minor_revision = ""
+        self.__maxWorkers = maxWorkers
         self._errorKeyWordList = self._readErrorKeyWordList()
 
     def run(self):
@@ -53,11 +55,13 @@ class ReleaseDpUtil(EntryUpdateBase):
         self.__major_revision, self.__minor_revision = self._getAuditRevisionInfo("model")
         #
         if self.__pdbId:
-            self.__releasingModelFiles()
-            self.__releasingSfFile()
-            self.__releasingMrFile()
-            self.__releasingCsFile()
-            self._releasingNefFile(self.__pdbId, self.__extendedPdbId)
+            stepGraph = ReleaseStepGraph(maxWorkers=self.__maxWorkers, log=self._lfh, verbose=self._verbose)
+            self.__addModelFileSteps(stepGraph)
+            stepGraph.addStep("sf", self.__releasingSfFile)
+            stepGraph.addStep("mr", self.__releasingMrFile)
+            stepGraph.addStep("cs", self.__releasingCsFile)
+            stepGraph.addStep("nef", lambda: self._releasingNefFile(self.__pdbId, self.__extendedPdbId))
+            self._runStepGraph(stepGraph)
         elif len(contentTypeList) > 0:
             self._insertEntryMessage(errType=contentTypeList[0], errMessage="Can not find the PDB ID.", uniqueFlag=True)
         #
@@ -68,26 +72,28 @@ class ReleaseDpUtil(EntryUpdateBase):
         #
         self._dumpLocalPickle()
 
-    def __releasingModelFiles(self):
+    def __addModelFileSteps(self, stepGraph):
         """
         """
         if not self._checkReleaseFlag("model"):
             return
         #
-        self.__releasingCIFFile(self._forReleaseDirPathMap["model"])
-        self.__releasingXMLFiles(self._forReleaseDirPathMap["model"])
-        self.__runMiscChecking()
+        forRelDirPathTupl = self._forReleaseDirPathMap["model"]
+        stepGraph.addStep("cif", lambda: self.__releasingCIFFile(forRelDirPathTupl))
+        # XML files are converted from the public CIF file
+        stepGraph.addStep("xml", lambda: self.__releasingXMLFiles(forRelDirPathTupl), dependList=["cif"])
+        stepGraph.addStep("misc", self.__runMiscChecking)
         #
         if self._entryDir["status_code"] == "RELOAD":
             return
         #
         if ("big_entry" in self._pickleData) and self._pickleData["big_entry"]:
-            self.__releasingPdbBundleFile(self._forReleaseDirPathMap["model"])
-            self.__releasingBioAssemblyFiles("GenBioCIFFile", "cif", self._forReleaseDirPathMap["model"])
+            stepGraph.addStep("pdb_bundle", lambda: self.__releasingPdbBundleFile(forRelDirPathTupl))
+            stepGraph.addStep("bio_cif", lambda: self.__releasingBioAssemblyFiles("GenBioCIFFile", "cif", forRelDirPathTupl))
         else:
-            self.__releasingPDBFile(self._forReleaseDirPathMap["model"])
-            self.__releasingBioAssemblyFiles("GenBioCIFFile", "cif", self._forReleaseDirPathMap["model"])
-            self.__releasingBioAssemblyFiles("GenBioPDBFile", "pdb", self._forReleaseDirPathMap["model"])
+            stepGraph.addStep("pdb", lambda: self.__releasingPDBFile(forRelDirPathTupl))
+            stepGraph.addStep("bio_cif", lambda: self.__releasingBioAssemblyFiles("GenBioCIFFile", "cif", forRelDirPathTupl))
+            stepGraph.addStep("bio_pdb", lambda: self.__releasingBioAssemblyFiles("GenBioPDBFile", "pdb", forRelDirPathTupl))
         #
 
     def __releasingCIFFile(self, forRelDirPathTupl):
@@ -0,0 +1,143 @@
+##
+# File:  ReleaseStepGraph.py
+# Date:  18-Oct-2026
+# Updates:
+##
+"""
+Dependency graph of the release file generation steps of one entry, run by a bounded pool of threads.
+
+This software was developed as part of the World Wide Protein Data Bank
+Common Deposition and Annotation System Project
+
+Copyright (c) 2026 wwPDB
+
+This software is provided under a Creative Commons Attribution 3.0 Unported
+License described at http://creativecommons.org/licenses/by/3.0/.
+
+"""
+__docformat__ = "restructuredtext en"
+__author__ = "Zukang Feng"
+__email__ = "zfeng@rcsb.rutgers.edu"
+__license__ = "Creative Commons Attribution 3.0 Unported"
+__version__ = "V0.07"
+
+import sys
+import threading
+
+
+class ReleaseStepGraph(object):
+    """ A step is started once all the steps it depends on have finished. Steps mostly wait on external
+        programs, so up to maxWorkers of them run at the same time in threads. maxWorkers=1 runs the steps
+        one by one in the order they were added.
+    """
+
+    def __init__(self, maxWorkers=4, log=sys.stderr, verbose=False):
+        self.__maxWorkers = maxWorkers
+        self.__lfh = log
+        self.__verbose = verbose
+        self.__nameList = []
+        self.__stepMap = {}
+
+    def addStep(self, name, function, dependList=None):
+        """ Add step name running function(), the steps in dependList must have been added before
+        """
+        if name in self.__stepMap:
+            raise ValueError("Duplicate release step '%s'" % name)
+        #
+        if dependList is None:
+            dependList = []
+        #
+        for depend in dependList:
+            if depend not in self.__stepMap:
+                raise ValueError("Release step '%s' depends on unknown step '%s'" % (name, depend))
+            #
+        #
+        self.__nameList.append(name)
+        self.__stepMap[name] = (function, list(dependList))
+
+    def getStepNameList(self):
+        return list(self.__nameList)
+
+    def run(self, runFunction=None, resultMap=None):
+        """ Run all steps and return {name: result}, where result is runFunction(function) (default function()).
+            The first exception raised by a step is raised again after the running steps have finished,
+            no new step is started after a failure. If resultMap is given, it is filled as the steps finish,
+            so it holds the results of the finished steps when a step fails.
+        """
+        if runFunction is None:
+            runFunction = self.__callFunction
+        #
+        if resultMap is None:
+            resultMap = {}
+        #
+        if (self.__maxWorkers <= 1) or (len(self.__nameList) < 2):
+            for name in self.__nameList:
+                resultMap[name] = runFunction(self.__stepMap[name][0])
+            #
+            return resultMap
+        #
+        condition = threading.Condition()
+        pendingList = list(self.__nameList)
+        errorList = []
+
+        def worker():
+            while True:
+                with condition:
+                    name = None
+                    while (not errorList) and pendingList:
+                        name = self.__getReadyStep(pendingList, resultMap)
+                        if name:
+                            break
+                        #
+                        condition.wait()
+                    #
+                    if (not name) or errorList:
+                        return
+                    #
+                    pendingList.remove(name)
+                #
+                if self.__verbose:
+                    self.__lfh.write("+ReleaseStepGraph.run() start step %s\n" % name)
+                #
+                try:
+                    result = runFunction(self.__stepMap[name][0])
+                except Exception as e:  # pylint: disable=broad-except
+                    with condition:
+                        errorList.append(e)
+                        condition.notify_all()
+                    #
+                    return
+                #
+                with condition:
+                    resultMap[name] = result
+                    condition.notify_all()
+                #
+            #
+        #
+        threadList = []
+        for _i in range(min(self.__maxWorkers, len(self.__nameList))):
+            thread = threading.Thread(target=worker)
+            thread.daemon = True
+            thread.start()
+            threadList.append(thread)
+        #
+        for thread in threadList:
+            thread.join()
+        #
+        if errorList:
+            raise errorList[0]
+        #
+        return resultMap
+
+    def __getReadyStep(self, pendingList, resultMap):
+        """ Return the first pending step whose dependencies have finished (called with the lock held)
+        """
+        for name in pendingList:
+            if all([depend in resultMap for depend in self.__stepMap[name][1]]):
+                return name
+            #
+        #
+        return None
+
+    def __callFunction(self, function):
+        return function()
@@ -60,10 +60,14 @@ class CitationUpdate:
     def clean_up(self):
         shutil.rmtree(self.citation_updates_path, ignore_errors=True)
 
-    def run_citation_finder(self):
+    def run_citation_finder(self, resume=False, incremental=False):
         logging.info('starting citation finder')
+        if resume:
+            logging.info('resuming from checkpoint in {}'.format(self.citation_updates_path))
+        if incremental:
+            logging.info('searching incrementally since the last run in {}'.format(self.citation_finder_path))
         CitationFinder(siteId=self.get_site_id(), path=self.get_citation_updates_path(),
-                       output=self.get_db_output()).searchPubmed()
+                       output=self.get_db_output(), resume=resume, incremental=incremental).searchPubmed()
         logging.info('finished citation finder')
 
     def run_auto_re_release(self):
@@ -72,11 +76,11 @@ class CitationUpdate:
         logging.info('finished auto re-release')
 
 
-def run_citation_finder(site_id=None):
+def run_citation_finder(site_id=None, resume=False, incremental=False):
     cu = CitationUpdate(site_id=site_id)
     cu.make_citation_updates_path()
     cu.make_citation_finder_path()
-    cu.run_citation_finder()
+    cu.run_citation_finder(resume=resume, incremental=incremental)
     cu.run_auto_re_release()
     cu.clean_up()
 
@@ -87,6 +91,10 @@ if __name__ == '__main__':
                         const=logging.DEBUG,
                         default=logging.INFO)
     parser.add_argument('--site_id', help='wwPDB site ID', type=str)
+    parser.add_argument('--resume', help='continue the citation finder run that failed, skipping completed work',
+                        action='store_true')
+    parser.add_argument('--incremental', help='only search the records entered since the last run for unchanged entries',
+                        action='store_true')
     args = parser.parse_args()
     logger.setLevel(args.loglevel)
-    run_citation_finder(site_id=args.site_id)
+    run_citation_finder(site_id=args.site_id, resume=args.resume, incremental=args.incremental)
@@ -46,17 +46,101 @@ class UpdateUtil(EntryUpdateBase):
                                  'page_first', 'page_last', 'year', 'journal_id_ISSN', 'author', 'single_author', 'insert_flag']
         #
         self.__pubmedInfo = {}
+        self.__inputContainer = None
 
     def run(self, updateEmInfoList):
+        if self.prepare(updateEmInfoList):
+            self.runPrepared()
+        #
+
+    def prepare(self, updateEmInfoList):
+        """ Build the update input data block of the entry, returns False if the entry has been blocked
+        """
         self._loadLocalPickle()
         if self._blockErrorFlag:
-            return
+            return False
         #
         self.__initializeFileName()
         self.__readPubmedInfo()
-        self.__generateInputFile(updateEmInfoList)
+        self._removeFile(self.__inputFilePath)
+        self.__inputContainer = self.__generateInputContainer(updateEmInfoList)
+        return True
+
+    def getInputContainer(self):
+        """ Returns the prepared input data block, or None if there is nothing to update
+        """
+        return self.__inputContainer
+
+    def isBatchSupported(self):
+        """ PDBe runs the update through annot-release-update, which handles one entry per call
+        """
+        return self._processing_site != "PDBE"
+
+    def runPrepared(self):
+        """ Run the update of the prepared entry alone
+        """
+        if self.__inputContainer is not None:
+            f = open(self.__inputFilePath, 'w')
+            pdbxW = PdbxWriter(f)
+            pdbxW.write([self.__inputContainer])
+            f.close()
+        #
         self.__runContentUpdate()
-        self.__readOutputFile()
+        self.__finish(os.path.join(self._sessionPath, self.__outputfile))
+
+    def runBatchCommand(self, containerList, batchId):
+        """ Run ReleaseUpdate on one input file holding the data blocks of containerList,
+            returns the command, the output file name and the command log message
+        """
+        inputfile = 'inputfile_batch_' + batchId + '.cif'
+        outputfile = 'outputfile_batch_' + batchId + '.cif'
+        logfile = 'update_logfile_batch_' + batchId + '.log'
+        clogfile = 'update_command_batch_' + batchId + '.log'
+        f = open(os.path.join(self._sessionPath, inputfile), 'w')
+        pdbxW = PdbxWriter(f)
+        pdbxW.write(containerList)
+        f.close()
+        #
+        cmd = self._getCmd('${BINPATH}/ReleaseUpdate', inputfile, outputfile, logfile, clogfile,
+                           ' -archivepath ' + os.path.join(self._cI.get('SITE_ARCHIVE_STORAGE_PATH'), 'archive') + ' ')
+        self._runCmd(cmd)
+        _status, msg = self._getLogMessage('ReleaseUpdate', os.path.join(self._sessionPath, clogfile))
+        return cmd, outputfile, msg
+
+    def getBatchEntrySet(self, outputfile):
+        """ Returns the set of entries with update_list, error_message or warning_message rows in the output file
+            of a batch run, or None if the output file does not exist
+        """
+        outputFilePath = os.path.join(self._sessionPath, outputfile)
+        if not os.access(outputFilePath, os.F_OK):
+            return None
+        #
+        entrySet = set()
+        cifObj = mmCIFUtil(filePath=outputFilePath)
+        for category in ('update_list', 'error_message', 'warning_message'):
+            rowList = cifObj.GetValue(category)
+            if not rowList:
+                continue
+            #
+            for rowDict in rowList:
+                if ('entry' in rowDict) and rowDict['entry']:
+                    entrySet.add(rowDict['entry'])
+                #
+            #
+        #
+        return entrySet
+
+    def getEntryId(self):
+        return self._entryId
+
+    def finishBatch(self, cmd, outputfile):
+        """ Read the entry's results from the output file of a batch run
+        """
+        self._insertAction(cmd)
+        self.__finish(os.path.join(self._sessionPath, outputfile))
+
+    def __finish(self, outputFilePath):
+        self.__readOutputFile(outputFilePath)
         if self._blockErrorFlag:
             for typeList in self._fileTypeList:
                 if (not ('status_code' + typeList[1]) in self._pickleData) or (not self._pickleData['status_code' + typeList[1]]):
@@ -84,7 +168,7 @@ class UpdateUtil(EntryUpdateBase):
         self.__pubmedInfo = pickle.load(fb)
         fb.close()
 
-    def __generateInputFile(self, updateEmInfoList):
+    def __generateInputContainer(self, updateEmInfoList):
         items = ['entry', 'pdbid', 'emdb_id', 'annotator', 'option', 'input_file', 'output_file', 'status_code', 'input_file_sf', 'output_file_sf',
                  'status_code_sf', 'beta_sf_file', 'input_file_mr', 'output_file_mr', 'status_code_mr', 'input_file_cs', 'output_file_cs', 'status_code_cs',
                  'input_file_nmr_data', 'output_file_nmr_data', 'status_code_nmr_data', 'status_code_em', 'approval_type', 'revdat_tokens', 'obsolete_ids',
@@ -94,9 +178,6 @@ class UpdateUtil(EntryUpdateBase):
                           'status_code_mr', 'input_file_cs', 'output_file_cs', 'status_code_cs', 'input_file_nmr_data', 'output_file_nmr_data',
                           'status_code_nmr_data', 'status_code_em', 'approval_type', 'revdat_tokens', 'obsolete_ids', 'supersede_ids', 'obspr_details']
         #
-        self._removeFile(self.__inputFilePath)
-        #
-        myDataList = []
         curContainer = DataContainer(self._entryId)
         curCat = DataCategory('update_info')
         for item in items:
@@ -192,15 +273,10 @@ class UpdateUtil(EntryUpdateBase):
                 hasValueFlag = True
             #
         #
-        myDataList.append(curContainer)
-        #
         if not hasValueFlag:
-            return
+            return None
         #
-        f = open(self.__inputFilePath, 'w')
-        pdbxW = PdbxWriter(f)
-        pdbxW.write(myDataList)
-        f.close()
+        return curContainer
 
     def __runContentUpdate(self):
         if not os.access(self.__inputFilePath, os.F_OK):
@@ -300,8 +376,7 @@ class UpdateUtil(EntryUpdateBase):
         #
         return cat
 
-    def __readOutputFile(self):
-        outputfile = os.path.join(self._sessionPath, self.__outputfile)
+    def __readOutputFile(self, outputfile):
         if not os.access(outputfile, os.F_OK):
             return
         #
@@ -353,3 +428,39 @@ class UpdateUtil(EntryUpdateBase):
 #           #
 #       #
 #       return emMapTypeList
+
+
+def runBatchUpdate(updateUtilList, batchId):
+    """ Run the content update of the prepared UpdateUtil objects with one ReleaseUpdate call. All input data blocks go into
+        one input file and the output file is shared, since its categories are keyed by entry. If the batch run reports
+        a system error, each entry is updated on its own so that one bad entry does not block the others. Entries without
+        any update_list or message row in the output file (or all entries if there is no output file) are updated again
+        on their own as well, rather than being released with files that were not updated.
+    """
+    batchList = [updateUtil for updateUtil in updateUtilList if (updateUtil.getInputContainer() is not None) and updateUtil.isBatchSupported()]
+    if len(batchList) < 2:
+        for updateUtil in updateUtilList:
+            updateUtil.runPrepared()
+        #
+        return
+    #
+    for updateUtil in updateUtilList:
+        if updateUtil not in batchList:
+            updateUtil.runPrepared()
+        #
+    #
+    cmd, outputfile, msg = batchList[0].runBatchCommand([updateUtil.getInputContainer() for updateUtil in batchList], batchId)
+    if msg:
+        for updateUtil in batchList:
+            updateUtil.runPrepared()
+        #
+        return
+    #
+    entrySet = batchList[0].getBatchEntrySet(outputfile)
+    for updateUtil in batchList:
+        if (entrySet is None) or (updateUtil.getEntryId() not in entrySet):
+            updateUtil.runPrepared()
+        else:
+            updateUtil.finishBatch(cmd, outputfile)
+        #
+    #
@@ -29,9 +29,10 @@ import sys
 # import traceback
 #
 from wwpdb.apps.releasemodule.utils.ContentDbApi import ContentDbApi
+from wwpdb.apps.releasemodule.utils.QueryResultCache import QueryResultCache
 from wwpdb.apps.releasemodule.utils.StatusDbApi_v2 import StatusDbApi
 from wwpdb.apps.releasemodule.utils.TimeUtil import TimeUtil
-from wwpdb.apps.releasemodule.utils.Utility import getCleanValue, getCombIDs, getCombStatus
+from wwpdb.apps.releasemodule.utils.Utility import getCleanValue, getCombIDs, getCombStatus, getArchiveMapFileSet
 from wwpdb.io.locator.PathInfo import PathInfo
 
 
@@ -48,6 +49,9 @@ class CombineDbApi(object):
         self.__sessionPath = path
         self.__ContentDB = None
         self.__StatusDB = None
+        # Query results are shared by the calls made through this object, i.e. within one request or job, and are
+        # dropped with it. Updates through either database API invalidate them.
+        self.__queryCache = QueryResultCache(log=self.__lfh, verbose=self.__verbose)
 
     def __connectContentDB(self):
         """
@@ -55,7 +59,7 @@ class CombineDbApi(object):
         if self.__ContentDB:
             return
         #
-        self.__ContentDB = ContentDbApi(siteId=self.__siteId, verbose=self.__verbose, log=self.__lfh)
+        self.__ContentDB = ContentDbApi(siteId=self.__siteId, verbose=self.__verbose, log=self.__lfh, queryCache=self.__queryCache)
 
     def __connectStatusDB(self):
         """
@@ -63,7 +67,7 @@ class CombineDbApi(object):
         if self.__StatusDB:
             return
         #
-        self.__StatusDB = StatusDbApi(siteId=self.__siteId, verbose=self.__verbose, log=self.__lfh)
+        self.__StatusDB = StatusDbApi(siteId=self.__siteId, verbose=self.__verbose, log=self.__lfh, queryCache=self.__queryCache)
 
     def __connectAllDB(self):
         """
@@ -71,6 +75,9 @@ class CombineDbApi(object):
         self.__connectContentDB()
         self.__connectStatusDB()
 
+    def getQueryCacheStatistics(self):
+        return self.__queryCache.getStatistics()
+
     def getFunctionCall(self, statusFlag, funcName, args):
         try:
             if statusFlag:
@@ -284,13 +291,16 @@ class CombineDbApi(object):
         #
         self.__connectContentDB()
         #
+        citationMap = self.__ContentDB.getPrimaryCitationMap(id_list)
+        authorListMap = self.__ContentDB.getPrimaryCitationAuthorListMap([entry_id for entry_id in id_list if entry_id in citationMap])
+        #
         return_map = {}
         for entry_id in id_list:
-            cInfo = self.__ContentDB.getPrimaryCitation(entry_id)
+            cInfo = citationMap.get(entry_id)
             if not cInfo:
                 continue
             #
-            authorList = self.__ContentDB.getPrimaryCitationAuthorList(entry_id)
+            authorList = authorListMap.get(entry_id)
             if authorList:
                 cInfo['author'] = ', '.join(authorList)
             #
@@ -354,7 +364,7 @@ class CombineDbApi(object):
         #
         pdbExtIdMap = self.__ContentDB.getPdbExtIdMap(pdbIdList)
         #
-        pI = PathInfo(siteId=self.__siteId, sessionPath=self.__sessionPath, verbose=self.__verbose, log=self.__lfh)
+        assoicatedEmdIdMap = self.__getMissingMapAssoicatedEmdIdMap(selectedEntryList)
         #
         for myD in selectedEntryList:
             if myD['structure_id'] in majorIssueEntryList:
@@ -367,23 +377,15 @@ class CombineDbApi(object):
                         del myD[item]
                     #
                 #
-            elif ('exp_method' in myD) and ((myD['exp_method'].upper().find("ELECTRON CRYSTALLOGRAPHY") != -1)
-                                            or (myD['exp_method'].upper().find("ELECTRON MICROSCOPY") != -1)
-                                            or (myD['exp_method'].upper().find("ELECTRON TOMOGRAPHY") != -1)):
-                emVolumeFile = pI.getFilePath(dataSetId=myD['structure_id'], wfInstanceId=None, contentType='em-volume', formatType='map',
-                                              fileSource='archive', versionId='latest', partNumber=1)
-                if (not emVolumeFile) or (not os.access(emVolumeFile, os.F_OK)):
-                    assoicatedEmdIdList = self.__ContentDB.getNotReleasedAssoicatedEmdId(myD['structure_id'])
-                    if len(assoicatedEmdIdList) > 0:
-                        warning_message = 'The entry does not have the associated map. The associated EMDB ID'
-                        if len(assoicatedEmdIdList) > 1:
-                            warning_message += 's = [ ' + ', '.join(assoicatedEmdIdList) + ' ].'
-                        else:
-                            warning_message += ' = [ ' + assoicatedEmdIdList[0] + ' ].'
-                        #
-                        myD['warning_message'] = warning_message
-                    #
+            elif (myD['structure_id'] in assoicatedEmdIdMap) and (len(assoicatedEmdIdMap[myD['structure_id']]) > 0):
+                assoicatedEmdIdList = assoicatedEmdIdMap[myD['structure_id']]
+                warning_message = 'The entry does not have the associated map. The associated EMDB ID'
+                if len(assoicatedEmdIdList) > 1:
+                    warning_message += 's = [ ' + ', '.join(assoicatedEmdIdList) + ' ].'
+                else:
+                    warning_message += ' = [ ' + assoicatedEmdIdList[0] + ' ].'
                 #
+                myD['warning_message'] = warning_message
             #
             if (myD['structure_id'] in dep_info_map) and dep_info_map[myD['structure_id']]:
                 merging_items = ('emdb_id', 'bmrb_id', 'author_release_status_code', 'status_code_em', 'author_release_status_code_em',
@@ -448,6 +450,36 @@ class CombineDbApi(object):
         #
         return selectedEntryList
 
+    def __getMissingMapAssoicatedEmdIdMap(self, selectedEntryList):
+        """ Returns structure_id -> not released associated EMDB ID list map of the EM method entries with PDB ID
+            which do not have a primary map in the archive
+        """
+        emEntryIdList = []
+        for myD in selectedEntryList:
+            if (not getCleanValue(myD, 'pdb_id')) or ('exp_method' not in myD):
+                continue
+            #
+            if (myD['exp_method'].upper().find("ELECTRON CRYSTALLOGRAPHY") != -1) or (myD['exp_method'].upper().find("ELECTRON MICROSCOPY") != -1) \
+               or (myD['exp_method'].upper().find("ELECTRON TOMOGRAPHY") != -1):
+                emEntryIdList.append(myD['structure_id'])
+            #
+        #
+        if not emEntryIdList:
+            return {}
+        #
+        # All archive entry directories sit side by side, so the path is only resolved once
+        pI = PathInfo(siteId=self.__siteId, sessionPath=self.__sessionPath, verbose=self.__verbose, log=self.__lfh)
+        archiveDirPath = pI.getDirPath(dataSetId=emEntryIdList[0], fileSource='archive')
+        mapFileSet = set()
+        if archiveDirPath:
+            mapFileSet = getArchiveMapFileSet(os.path.dirname(archiveDirPath), emEntryIdList)
+        #
+        missingMapEntryIdList = [entryId for entryId in emEntryIdList if (entryId + '_em-volume_P1.map') not in mapFileSet]
+        if not missingMapEntryIdList:
+            return {}
+        #
+        return self.__ContentDB.getNotReleasedAssoicatedEmdIdMap(missingMapEntryIdList)
+
     def __getEMInfo(self, id_string):
         em_info_map = {}
         emInfoList = self.__ContentDB.getEMInfo(id_string)
@@ -54,13 +54,18 @@ class ContentDbApi(object):
         "SELECT_PRIMARY_CITATION" : "select title, publication journal_abbrev, volume_no journal_volume, year, first_page page_first, "
                                   + "last_page page_last, pdbx_database_id_PubMed, pdbx_database_id_DOI from citation where "
                                   + "structure_id = '%s' and jrnl_serial_no = 1",
+        "SELECT_PRIMARY_CITATION_LIST" : "select structure_id, title, publication journal_abbrev, volume_no journal_volume, year, first_page page_first, "
+                                       + "last_page page_last, pdbx_database_id_PubMed, pdbx_database_id_DOI from citation where "
+                                       + "structure_id in ( %s ) and jrnl_serial_no = 1",
         "SELECT_ALL_CITATION_AUTHOR" : "select citation_id, name, identifier_ORCID orcid, ordinal from citation_author where structure_id = '%s' order by ordinal",
         "SELECT_PRIMARY_CITATION_AUTHOR" : "select name, ordinal from citation_author where structure_id = '%s' and citation_id = 'primary' order by ordinal",
+        "SELECT_PRIMARY_CITATION_AUTHOR_LIST" : "select structure_id, name, ordinal from citation_author where structure_id in ( %s ) and "
+                                              + "citation_id = 'primary' order by structure_id, ordinal",
         "SELECT_PUBMED_SEARCH_LIST" : "select r.structure_id, r.rcsb_annotator, r.status_code, r.post_rel_status, r.post_rel_recvd_coord, r.post_rel_recvd_coord_date, r.pdb_id, r.title, c.title c_title, "
                                     + "c.publication journal_abbrev, c.volume_no journal_volume, c.first_page page_first, c.last_page page_last, "
                                     + "c.year, c.pdbx_database_id_PubMed, c.pdbx_database_id_DOI, r.author_approval_type from rcsb_status r, "
                                     + "citation c where c.structure_id = r.structure_id and r.exp_method != 'theoretical model' and "
-                                    + "c.jrnl_serial_no = 1 and r.initial_deposition_date >= DATE_SUB(curdate(), interval %d day) and "
+                                    + "c.jrnl_serial_no = 1 and r.initial_deposition_date >= DATE_SUB(curdate(), interval %s day) and "
                                     + "r.status_code in ('HOLD','HPUB','AUTH','POLC','REPL','REL','PROC','WAIT') and (c.publication = "
                                     + "'TO BE PUBLISHED' or c.publication = '' or c.publication is null or c.first_page = '' or c.first_page "
                                     + "is null or c.volume_no = '' or c.volume_no is null or c.pdbx_database_id_PubMed = '' or "
@@ -83,6 +88,10 @@ class ContentDbApi(object):
                                     + "where structure_id in ( '%s' ) order by structure_id",
         "SELECT_LAST_PDBX_AUDIT_REVISION_HISTORY" : "select structure_id, ordinal, revision_date from pdbx_audit_revision_history where "
                                                   + "structure_id = '%s' order by ordinal desc limit 1",
+        "SELECT_LAST_PDBX_AUDIT_REVISION_HISTORY_LIST" : "select h.structure_id, h.ordinal, h.revision_date from pdbx_audit_revision_history h, "
+                                                       + "(select structure_id, max(ordinal) ordinal from pdbx_audit_revision_history where "
+                                                       + "structure_id in ( %s ) group by structure_id) m where h.structure_id = m.structure_id "
+                                                       + "and h.ordinal = m.ordinal",
         "SELECT_ALL_EXPIRED_PDB_ENTRY" : "select structure_id from rcsb_status where ( initial_deposition_date <= DATE_SUB( curdate(), interval 365 day ) ) and (pdb_id != '') "
                                        + "and (pdb_id is not null) and ( status_code in ( 'AUTH', 'HPUB', 'HOLD' ) ) and ( ( date_hold_coordinates is null ) or "
                                        + " ( date_hold_coordinates < curdate() ) ) order by structure_id",
@@ -105,12 +114,19 @@ class ContentDbApi(object):
         "SELECT_EMDB_ID_FROM_DATABASE_2" : "select database_code from database_2 where Structure_ID = '%s' and database_id = 'EMDB'",
         "SELECT_ENTRY_ID_FROM_DATABASE_2" : "select Structure_ID from database_2 where database_code = '%s' and database_id = 'EMDB'",
         "SELECT_EMDB_ID_FROM_DATABASE_RELATED" : "select db_id from pdbx_database_related where Structure_ID = '%s' and db_name = 'EMDB' and content_type = 'associated EM volume'",
+        "SELECT_EMDB_ID_FROM_DATABASE_2_LIST" : "select Structure_ID structure_id, database_code from database_2 where Structure_ID in ( %s ) and "
+                                              + "database_id = 'EMDB'",
+        "SELECT_ENTRY_ID_FROM_DATABASE_2_LIST" : "select database_code, Structure_ID structure_id from database_2 where database_code in ( %s ) and "
+                                               + "database_id = 'EMDB'",
+        "SELECT_EMDB_ID_FROM_DATABASE_RELATED_LIST" : "select Structure_ID structure_id, db_id from pdbx_database_related where Structure_ID in ( %s ) "
+                                                    + "and db_name = 'EMDB' and content_type = 'associated EM volume'",
+        "SELECT_EM_STATUS_LIST" : "select structure_id, current_status status_code_em from em_admin where structure_id in ( %s )",
     }
     #
 
-    def __init__(self, siteId=None, verbose=False, log=sys.stderr):
+    def __init__(self, siteId=None, verbose=False, log=sys.stderr, queryCache=None):
         """
-           connect to local database
+           connect to local database, query results are memoized in queryCache (QueryResultCache) if given
         """
         self.__lfh = log
         self.__verbose = verbose
@@ -127,6 +143,7 @@ class ContentDbApi(object):
         self.__dbApi = DbApiUtil(dbServer=self.__dbServer, dbHost=self.__dbHost, dbName=self.__dbName, dbUser=self.__dbUser, dbPw=self.__dbPw,
                                  dbSocket=self.__dbSocket, dbPort=self.__dbPort, verbose=self.__verbose, log=self.__lfh)
         self.__dbApi.setSchemaMap(self.__schemaMap)
+        self.__dbApi.setQueryCache(queryCache)
         #
         t = TimeUtil()
         self.__startDate = t.StartDay()
@@ -199,6 +216,33 @@ class ContentDbApi(object):
         list1, _list2 = self.__getCitationAuthor(entry_id)
         return list1
 
+    def getPrimaryCitationMap(self, entryIdList, chunkSize=500):
+        """ Returns structure_id -> primary citation map of the entries in entryIdList, with one query per chunkSize entries
+        """
+        citationMap = {}
+        if not entryIdList:
+            return citationMap
+        #
+        rows = self.__dbApi.selectBoundData(key='SELECT_PRIMARY_CITATION_LIST', parameter=(entryIdList,), chunkSize=chunkSize)
+        if rows:
+            for row in rows:
+                entry_id = row.pop('structure_id', None)
+                if entry_id and (entry_id not in citationMap):
+                    citationMap[entry_id] = row
+                #
+            #
+        #
+        return citationMap
+
+    def getPrimaryCitationAuthorListMap(self, entryIdList):
+        """ Returns structure_id -> primary citation author list map of the entries in entryIdList
+        """
+        authorListMap = {}
+        for entry_id, (list1, _list2) in self.__getCitationAuthorMap(entryIdList).items():
+            authorListMap[entry_id] = list1
+        #
+        return authorListMap
+
     def getCitationInfo(self, entry_id):
         return self.__dbApi.selectData(key='SELECT_ALL_CITATION', parameter=(entry_id))
 
@@ -206,22 +250,27 @@ class ContentDbApi(object):
         return self.__dbApi.selectData(key='SELECT_ALL_CITATION_AUTHOR', parameter=(entry_id))
 
     def getPubmedSearchList(self, year=2):
-        em_map_only_entries = self.__getSelectedIDList('SELECT_ALL_EM_ONLY_ENTRY_BY_STATUS', ('OBS'))
-        rows = self.__dbApi.selectData(key='SELECT_PUBMED_SEARCH_LIST', parameter=(year * 365))
+        em_map_only_entries = set(self.__getSelectedIDList('SELECT_ALL_EM_ONLY_ENTRY_BY_STATUS', ('OBS')))
+        # The candidate list covers all entries deposited within the search window, so it is streamed and the
+        # map only entries are dropped while reading
         retList = []
-        if rows:
-            for row in rows:
-                if ('structure_id' in row) and row['structure_id']:
-                    if (('pdb_id' not in row) or (not row['pdb_id'])) and (row['structure_id'] in em_map_only_entries):
-                        continue
-                    #
-                    list1, list2 = self.__getCitationAuthor(row['structure_id'])
+        for row in self.__dbApi.iterBoundData(key='SELECT_PUBMED_SEARCH_LIST', parameter=(year * 365,)):
+            if ('structure_id' in row) and row['structure_id'] and (('pdb_id' not in row) or (not row['pdb_id'])) and \
+               (row['structure_id'] in em_map_only_entries):
+                continue
+            #
+            retList.append(row)
+        #
+        if retList:
+            authorMap = self.__getCitationAuthorMap([row['structure_id'] for row in retList if ('structure_id' in row) and row['structure_id']])
+            for row in retList:
+                if ('structure_id' in row) and (row['structure_id'] in authorMap):
+                    list1, list2 = authorMap[row['structure_id']]
                     if list1:
                         row['citation_author'] = list1
                         row['pubmed_author'] = list2
                     #
                 #
-                retList.append(row)
             #
         #
         return retList
@@ -246,12 +295,14 @@ class ContentDbApi(object):
                     emReleaseDateMap[row['structure_id']] = myD
                 #
             #
+            releaseDateMap = self.getLastReleaseDateMap([row['structure_id'] for row in rows if ('structure_id' in row) and row['structure_id']
+                                                         and ('pdb_id' in row) and row['pdb_id']])
             for row in rows:
                 if ('structure_id' not in row) or (not row['structure_id']):
                     continue
                 #
                 if ('pdb_id' in row) and row['pdb_id']:
-                    lastReleasedate = self.getLastReleaseDate(row['structure_id'])
+                    lastReleasedate = releaseDateMap.get(row['structure_id'], '')
                     if ('date_of_RCSB_release' in row) and row['date_of_RCSB_release'] and lastReleasedate:
                         row['release_dates'] = str(row['date_of_RCSB_release']) + ' / ' + lastReleasedate
                         row['last_release_date'] = lastReleasedate
@@ -307,6 +358,24 @@ class ContentDbApi(object):
         #
         return release_date
 
+    def getLastReleaseDateMap(self, entryIdList):
+        """ Returns structure_id -> last revision date map of the entries in entryIdList, read with one grouped query
+        """
+        releaseDateMap = {}
+        if not entryIdList:
+            return releaseDateMap
+        #
+        rows = self.__dbApi.selectBoundData(key='SELECT_LAST_PDBX_AUDIT_REVISION_HISTORY_LIST', parameter=(entryIdList,))
+        if rows:
+            for row in rows:
+                if ('structure_id' in row) and row['structure_id'] and ('revision_date' in row) and row['revision_date'] and \
+                   (row['structure_id'] not in releaseDateMap):
+                    releaseDateMap[row['structure_id']] = str(row['revision_date'])
+                #
+            #
+        #
+        return releaseDateMap
+
     def getAssoicatedEmdId(self, entryid):
         emdIdList = self.__getSelectedIDList('SELECT_EMDB_ID_FROM_DATABASE_2', (entryid), item='database_code')
         emdIdList1 = self.__getSelectedIDList('SELECT_EMDB_ID_FROM_DATABASE_RELATED', (entryid), item='db_id')
@@ -344,6 +413,76 @@ class ContentDbApi(object):
         #
         return emdIdList
 
+    def getNotReleasedAssoicatedEmdIdMap(self, entryIdList):
+        """ Returns structure_id -> not released associated EMDB ID list map of the entries in entryIdList, the same as
+            getNotReleasedAssoicatedEmdId() for each entry but read with four queries over the whole list
+        """
+        emdIdListMap = {}
+        if not entryIdList:
+            return emdIdListMap
+        #
+        for key, item in (('SELECT_EMDB_ID_FROM_DATABASE_2_LIST', 'database_code'), ('SELECT_EMDB_ID_FROM_DATABASE_RELATED_LIST', 'db_id')):
+            rows = self.__dbApi.selectBoundData(key=key, parameter=(entryIdList,))
+            if not rows:
+                continue
+            #
+            for row in rows:
+                if ('structure_id' in row) and row['structure_id'] and (item in row) and row[item]:
+                    emdIdList = emdIdListMap.setdefault(row['structure_id'], [])
+                    if row[item] not in emdIdList:
+                        emdIdList.append(row[item])
+                    #
+                #
+            #
+        #
+        if not emdIdListMap:
+            return emdIdListMap
+        #
+        # EMDB ID -> entries which the map is assigned to
+        structureIdListMap = {}
+        rows = self.__dbApi.selectBoundData(key='SELECT_ENTRY_ID_FROM_DATABASE_2_LIST',
+                                            parameter=(sorted(set([emdId for emdIdList in emdIdListMap.values() for emdId in emdIdList])),))
+        if rows:
+            for row in rows:
+                if ('database_code' in row) and row['database_code'] and ('structure_id' in row) and row['structure_id']:
+                    structureIdListMap.setdefault(row['database_code'], []).append(row['structure_id'])
+                #
+            #
+        #
+        # An entry counts as released only if it has a single em_admin row with REL status
+        emStatusListMap = {}
+        structureIdSet = set([structureId for structureIdList in structureIdListMap.values() for structureId in structureIdList])
+        if structureIdSet:
+            rows = self.__dbApi.selectBoundData(key='SELECT_EM_STATUS_LIST', parameter=(structureIdSet,))
+            if rows:
+                for row in rows:
+                    if ('structure_id' in row) and row['structure_id']:
+                        emStatusListMap.setdefault(row['structure_id'], []).append(row.get('status_code_em'))
+                    #
+                #
+            #
+        #
+        for entryid, possibleEmdIdList in emdIdListMap.items():
+            emdIdList = []
+            for emdId in possibleEmdIdList:
+                isReleased = False
+                for structureId in structureIdListMap.get(emdId, []):
+                    if structureId == entryid:
+                        continue
+                    #
+                    if emStatusListMap.get(structureId) == ['REL']:
+                        isReleased = True
+                        break
+                    #
+                #
+                if not isReleased:
+                    emdIdList.append(emdId)
+                #
+            #
+            emdIdListMap[entryid] = emdIdList
+        #
+        return emdIdListMap
+
     def __getSelectedIDList(self, key, parameter, item='structure_id'):
         idlist = []
         rows = self.__dbApi.selectData(key=key, parameter=parameter)
@@ -357,9 +496,36 @@ class ContentDbApi(object):
         return idlist
 
     def __getCitationAuthor(self, entry_id):
+        rows = self.__dbApi.selectData(key='SELECT_PRIMARY_CITATION_AUTHOR', parameter=(entry_id))
+        return self.__getAuthorNameList(rows)
+
+    def __getCitationAuthorMap(self, entryIdList, chunkSize=500):
+        """ Get primary citation authors of all entries in entryIdList with one query per chunkSize entries,
+            returns structure_id -> (citation author list, pubmed search author list) map
+        """
+        rowMap = {}
+        if not entryIdList:
+            return rowMap
+        #
+        rows = self.__dbApi.selectBoundData(key='SELECT_PRIMARY_CITATION_AUTHOR_LIST', parameter=(entryIdList,), chunkSize=chunkSize)
+        if rows:
+            for row in rows:
+                if ('structure_id' in row) and row['structure_id']:
+                    rowMap.setdefault(row['structure_id'], []).append(row)
+                #
+            #
+        #
+        authorMap = {}
+        for entry_id, rows in rowMap.items():
+            authorMap[entry_id] = self.__getAuthorNameList(rows)
+        #
+        return authorMap
+
+    def __getAuthorNameList(self, rows):
+        """ Returns citation author list and pubmed search format author list of the citation_author rows
+        """
         list1 = []
         list2 = []
-        rows = self.__dbApi.selectData(key='SELECT_PRIMARY_CITATION_AUTHOR', parameter=(entry_id))
         if rows:
             for row in rows:
                 if 'name' not in row:
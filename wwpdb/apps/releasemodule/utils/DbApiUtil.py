@@ -28,6 +28,78 @@ import datetime
 import MySQLdb
 #
 from wwpdb.utils.wf.dbapi.DbConnection import DbConnection
+from wwpdb.apps.releasemodule.utils.DbConnectionPool import getDbConnectionPool
+
+# Expanded statements of bound parameter queries, keyed by (template, list parameter lengths)
+_statementCache = {}
+_statementCacheSize = 512
+
+
+def getBoundQueryList(sql, parameter=(), chunkSize=1000):
+    """ Expand the list parameters of a query with %s bind markers into one marker per value, e.g.
+        "structure_id in ( %s )" with (['D_1', 'D_2'],) becomes "structure_id in ( %s, %s )" with ('D_1', 'D_2').
+        The longest list parameter is split into chunks of chunkSize values, returns [(sql, parameter tuple)]
+        with one query per chunk.
+    """
+    if not isinstance(parameter, (list, tuple)):
+        parameter = (parameter,)
+    #
+    listIndex = None
+    for i, value in enumerate(parameter):
+        if isinstance(value, (list, tuple, set, frozenset)) and ((listIndex is None) or (len(value) > len(parameter[listIndex]))):
+            listIndex = i
+        #
+    #
+    parameter = [sorted(value) if isinstance(value, (set, frozenset)) else value for value in parameter]
+    chunkList = [None]
+    if (listIndex is not None) and (len(parameter[listIndex]) > chunkSize):
+        chunkList = [parameter[listIndex][i:i + chunkSize] for i in range(0, len(parameter[listIndex]), chunkSize)]
+    #
+    queryList = []
+    for chunk in chunkList:
+        chunkParameter = list(parameter)
+        if chunk is not None:
+            chunkParameter[listIndex] = chunk
+        #
+        shape = tuple([len(value) if isinstance(value, (list, tuple)) else -1 for value in chunkParameter])
+        if (sql, shape) not in _statementCache:
+            if len(_statementCache) >= _statementCacheSize:
+                _statementCache.clear()
+            #
+            pieceList = sql.split('%s')
+            if len(pieceList) != len(shape) + 1:
+                raise ValueError("query has %d bind markers for %d parameters" % (len(pieceList) - 1, len(shape)))
+            #
+            statement = pieceList[0]
+            for length, piece in zip(shape, pieceList[1:]):
+                if length < 0:
+                    statement += '%s' + piece
+                elif length == 0:
+                    # Empty list matches nothing
+                    statement += 'NULL' + piece
+                else:
+                    statement += ', '.join(['%s'] * length) + piece
+                #
+            #
+            _statementCache[(sql, shape)] = statement
+        #
+        valueList = []
+        for value in chunkParameter:
+            if isinstance(value, (list, tuple)):
+                valueList.extend(value)
+            else:
+                valueList.append(value)
+            #
+        #
+        queryList.append((_statementCache[(sql, shape)], tuple(valueList)))
+    #
+    return queryList
+
+
+def stripEmptyValue(row):
+    """ Remove items with empty values from a row
+    """
+    return dict([(key, value) for key, value in row.items() if value])
 
 
 class DbApiUtil(object):
@@ -46,6 +118,7 @@ class DbApiUtil(object):
         self.__verbose = verbose  # pylint: disable=unused-private-member
         self.__lfh = log
         self.__schemaMap = {}
+        self.__queryCache = None
         self.__dbState = 0
 
         if (self.__debug):
@@ -54,22 +127,37 @@ class DbApiUtil(object):
 
         self.__myDb = DbConnection(dbServer=self.__dbServer, dbHost=self.__dbHost, dbName=self.__dbName, dbUser=self.__dbUser,
                                    dbPw=self.__dbPw, dbPort=self.__dbPort, dbSocket=self.__dbSocket)
+        #
+        # Connections are borrowed from the process wide pool for each query
+        self.__poolKey = (self.__dbServer, self.__dbHost, self.__dbPort, self.__dbSocket, self.__dbName, self.__dbUser)
+        self.__releaseConnection(self.__getConnection())
 
-        self.__dbcon = self.__myDb.connect()
+    def __getConnection(self):
+        """
+        """
+        return getDbConnectionPool().getConnection(self.__poolKey, self.__myDb.connect)
+
+    def __releaseConnection(self, dbcon):
+        """
+        """
+        getDbConnectionPool().releaseConnection(self.__poolKey, dbcon)
+
+    def __discardConnection(self, dbcon):
+        """
+        """
+        getDbConnectionPool().discardConnection(dbcon)
 
     def __reConnect(self):
         """
         """
-        try:
-            self.__myDb.close(self.__dbcon)
-        except MySQLdb.Error:
-            self.__lfh.write("+DbApiUtil.reConnect() DB connection lost - cannot close\n")
-            self.__lfh.write("+DbApiUtil.reConnect() Re-connecting to the database ..\n")
-            self.__lfh.write("+DbApiUtil.reConnect() UTC time = %s\n" % datetime.datetime.utcnow())
+        self.__lfh.write("+DbApiUtil.reConnect() Re-connecting to the database ..\n")
+        self.__lfh.write("+DbApiUtil.reConnect() UTC time = %s\n" % datetime.datetime.utcnow())
+        # Idle connections of the pool are likely to be lost as well
+        getDbConnectionPool().clear(self.__poolKey)
 
         for i in range(1, self.__Nretry):
             try:
-                self.__dbcon = self.__myDb.connect()
+                self.__releaseConnection(self.__getConnection())
                 self.__dbState = 0
                 return True
             except MySQLdb.Error:
@@ -79,16 +167,25 @@ class DbApiUtil(object):
         #
         return False
 
-    def __runSelectSQL(self, query):
+    def __runSelectSQL(self, query, parameter=None):
         """
         """
         rows = ()
+        dbcon = None
         try:
-            self.__dbcon.commit()
-            curs = self.__dbcon.cursor(MySQLdb.cursors.DictCursor)
-            curs.execute(query)
+            dbcon = self.__getConnection()
+            dbcon.commit()
+            curs = dbcon.cursor(MySQLdb.cursors.DictCursor)
+            if parameter is None:
+                curs.execute(query)
+            else:
+                curs.execute(query, parameter)
+            #
             rows = curs.fetchall()
+            curs.close()
+            self.__releaseConnection(dbcon)
         except MySQLdb.Error as e:
+            self.__discardConnection(dbcon)
             self.__dbState = e.args[0]
             self.__lfh.write("Database error %d: %s\n" % (e.args[0], e.args[1]))
 
@@ -97,16 +194,24 @@ class DbApiUtil(object):
     def __runUpdateSQL(self, query):
         """
         """
+        dbcon = None
         try:
-            curs = self.__dbcon.cursor()
+            dbcon = self.__getConnection()
+            curs = dbcon.cursor()
             curs.execute("set autocommit=0")
             _nrows = curs.execute(query)  # noqa: F841
-            self.__dbcon.commit()
+            dbcon.commit()
             curs.execute("set autocommit=1")
             curs.close()
+            self.__releaseConnection(dbcon)
             return 'OK'
         except MySQLdb.Error as e:
-            self.__dbcon.rollback()
+            try:
+                dbcon.rollback()
+            except:  # noqa: E722 pylint: disable=bare-except
+                pass
+            #
+            self.__discardConnection(dbcon)
             self.__dbState = e.args[0]
             self.__lfh.write("Database error %d: %s\n" % (e.args[0], e.args[1]))
         #
@@ -117,11 +222,16 @@ class DbApiUtil(object):
         """
         self.__schemaMap = schemaMap
 
-    def runSelectSQL(self, sql):
-        """ method to run a query
+    def setQueryCache(self, queryCache):
+        """ Memoize selectData()/selectBoundData() results in queryCache (QueryResultCache), which is cleared by any update
+        """
+        self.__queryCache = queryCache
+
+    def runSelectSQL(self, sql, parameter=None):
+        """ method to run a query, with values bound to its %s markers if parameter is given
         """
         for retry in range(1, self.__Nretry):
-            ret = self.__runSelectSQL(sql)
+            ret = self.__runSelectSQL(sql, parameter)
             if ret is None:
                 if self.__dbState > 0:
                     time.sleep(retry * 2)
@@ -131,16 +241,7 @@ class DbApiUtil(object):
                     return None
                 #
             else:
-                for myD in ret:
-                    # We make copy of the keys to avoid "dictionary changed size during iteration"
-                    items = list(myD.keys())
-                    for item in items:
-                        if not myD[item]:
-                            del myD[item]
-                        #
-                    #
-                #
-                return ret
+                return [stripEmptyValue(myD) for myD in ret]
             #
         #
         return None
@@ -148,6 +249,9 @@ class DbApiUtil(object):
     def runUpdateSQL(self, sql):
         """ method to run a query
         """
+        if self.__queryCache is not None:
+            self.__queryCache.invalidate()
+        #
         for retry in range(1, self.__Nretry):
             ret = self.__runUpdateSQL(sql)
             if ret is None:
@@ -218,8 +322,102 @@ class DbApiUtil(object):
         if (not key) or (not self.__schemaMap) or (key not in self.__schemaMap):
             return None
         #
+        if self.__queryCache is not None:
+            rows = self.__queryCache.get(self.__dbName, key, parameter)
+            if rows is not None:
+                return rows
+            #
+        #
         sql = self.__schemaMap[key]
         if parameter:
             sql = self.__schemaMap[key] % parameter
         #
-        return self.runSelectSQL(sql)
+        rows = self.runSelectSQL(sql)
+        if self.__queryCache is not None:
+            self.__queryCache.put(self.__dbName, key, parameter, rows)
+        #
+        return rows
+
+    def selectBoundData(self, key=None, parameter=(), chunkSize=1000):
+        """ Run a query whose %s markers are bound to parameter values by the database driver. A list parameter
+            is expanded to one marker per value (e.g. "in ( %s )"), long lists are queried in chunks of chunkSize
+            values and the rows of all chunks are returned.
+        """
+        if (not key) or (not self.__schemaMap) or (key not in self.__schemaMap):
+            return None
+        #
+        if self.__queryCache is not None:
+            rows = self.__queryCache.get(self.__dbName, key, parameter)
+            if rows is not None:
+                return rows
+            #
+        #
+        rows = []
+        for sql, values in getBoundQueryList(self.__schemaMap[key], parameter, chunkSize=chunkSize):
+            ret = self.runSelectSQL(sql, values)
+            if ret is None:
+                return None
+            #
+            rows.extend(ret)
+        #
+        if self.__queryCache is not None:
+            self.__queryCache.put(self.__dbName, key, parameter, rows)
+        #
+        return rows
+
+    def iterBoundData(self, key=None, parameter=(), arraysize=1000):
+        """ Iterate over the rows of a bound parameter query with a server side cursor, for large result sets.
+            Rows are read arraysize at a time and empty values are removed as each row is returned. A database
+            error before the first row is retried after re-connecting as in runSelectSQL(), a database error
+            after rows have been returned is raised.
+        """
+        if (not key) or (not self.__schemaMap) or (key not in self.__schemaMap):
+            return
+        #
+        queryList = getBoundQueryList(self.__schemaMap[key], parameter, chunkSize=sys.maxsize)
+        sql, values = queryList[0]
+        for retry in range(1, self.__Nretry):
+            dbcon = None
+            curs = None
+            done = False
+            started = False
+            try:
+                dbcon = self.__getConnection()
+                dbcon.commit()
+                curs = dbcon.cursor(MySQLdb.cursors.SSDictCursor)
+                curs.execute(sql, values)
+                while True:
+                    rows = curs.fetchmany(arraysize)
+                    if not rows:
+                        break
+                    #
+                    for row in rows:
+                        started = True
+                        yield stripEmptyValue(row)
+                    #
+                #
+                curs.close()
+                done = True
+                self.__releaseConnection(dbcon)
+                return
+            except MySQLdb.Error as e:
+                self.__dbState = e.args[0]
+                self.__lfh.write("Database error %d: %s\n" % (e.args[0], e.args[1]))
+                if started:
+                    # The rows already returned cannot be read again
+                    raise
+                #
+            finally:
+                if not done:
+                    # Unread rows of the server side cursor are still pending on the connection
+                    self.__discardConnection(dbcon)
+                #
+            #
+            if self.__dbState <= 0:
+                return
+            #
+            time.sleep(retry * 2)
+            if not self.__reConnect():
+                return
+            #
+        #
@@ -0,0 +1,172 @@
+##
+# File:  DbConnectionPool.py
+# Date:  18-Oct-2026
+# Updates:
+##
+"""
+Process local pool of database connections shared by the DbApiUtil instances.
+
+This software was developed as part of the World Wide Protein Data Bank
+Common Deposition and Annotation System Project
+
+Copyright (c) 2026 wwPDB
+
+This software is provided under a Creative Commons Attribution 3.0 Unported
+License described at http://creativecommons.org/licenses/by/3.0/.
+
+"""
+__docformat__ = "restructuredtext en"
+__author__ = "Zukang Feng"
+__email__ = "zfeng@rcsb.rutgers.edu"
+__license__ = "Creative Commons Attribution 3.0 Unported"
+__version__ = "V0.07"
+
+import os
+import sys
+import threading
+import time
+
+
+class DbConnectionPool(object):
+    """ Keep idle connections per (server, host, port, socket, database, user) key for reuse.
+
+        A connection idle for more than checkInterval seconds is pinged before it is handed out again,
+        connections idle for more than idleTimeout seconds and those above maxIdle per key are closed.
+    """
+
+    def __init__(self, maxIdle=4, idleTimeout=600.0, checkInterval=30.0, log=sys.stderr, verbose=False):
+        self.__maxIdle = maxIdle
+        self.__idleTimeout = idleTimeout
+        self.__checkInterval = checkInterval
+        self.__lfh = log
+        self.__verbose = verbose
+        self.__lock = threading.Lock()
+        # key -> [(connection, time returned to the pool)], most recently used last
+        self.__idleMap = {}
+        self.__statistics = {'connect': 0, 'reuse': 0, 'check': 0, 'failedCheck': 0, 'evict': 0, 'discard': 0}
+
+    def getConnection(self, key, connectFunction):
+        """ Return an idle connection for key, or a new one made by connectFunction()
+        """
+        while True:
+            with self.__lock:
+                self.__evictIdle()
+                idleList = self.__idleMap.get(key)
+                if not idleList:
+                    break
+                #
+                dbcon, lastUsed = idleList.pop()
+            #
+            if time.time() - lastUsed <= self.__checkInterval:
+                self.__statistics['reuse'] += 1
+                return dbcon
+            #
+            self.__statistics['check'] += 1
+            try:
+                dbcon.ping()
+                self.__statistics['reuse'] += 1
+                return dbcon
+            except:  # noqa: E722 pylint: disable=bare-except
+                self.__statistics['failedCheck'] += 1
+                self.__close(dbcon)
+            #
+        #
+        self.__statistics['connect'] += 1
+        return connectFunction()
+
+    def releaseConnection(self, key, dbcon):
+        """ Return a healthy connection to the pool
+        """
+        if dbcon is None:
+            return
+        #
+        with self.__lock:
+            idleList = self.__idleMap.setdefault(key, [])
+            if len(idleList) < self.__maxIdle:
+                idleList.append((dbcon, time.time()))
+                return
+            #
+        #
+        self.__statistics['evict'] += 1
+        self.__close(dbcon)
+
+    def discardConnection(self, dbcon):
+        """ Close a connection that failed instead of returning it to the pool
+        """
+        if dbcon is None:
+            return
+        #
+        self.__statistics['discard'] += 1
+        self.__close(dbcon)
+
+    def clear(self, key=None):
+        """ Close the idle connections of key, or all of them
+        """
+        with self.__lock:
+            if key is None:
+                closeList = [dbcon for idleList in self.__idleMap.values() for dbcon, _lastUsed in idleList]
+                self.__idleMap = {}
+            else:
+                closeList = [dbcon for dbcon, _lastUsed in self.__idleMap.pop(key, [])]
+            #
+        #
+        for dbcon in closeList:
+            self.__close(dbcon)
+        #
+
+    def getStatistics(self):
+        statistics = dict(self.__statistics)
+        with self.__lock:
+            statistics['idle'] = sum([len(idleList) for idleList in self.__idleMap.values()])
+        #
+        return statistics
+
+    def __evictIdle(self):
+        """ Close connections idle for too long (called with the lock held)
+        """
+        now = time.time()
+        for key, idleList in self.__idleMap.items():
+            keepList = []
+            for dbcon, lastUsed in idleList:
+                if now - lastUsed > self.__idleTimeout:
+                    self.__statistics['evict'] += 1
+                    self.__close(dbcon)
+                else:
+                    keepList.append((dbcon, lastUsed))
+                #
+            #
+            self.__idleMap[key] = keepList
+        #
+
+    def __close(self, dbcon):
+        try:
+            dbcon.close()
+        except:  # noqa: E722 pylint: disable=bare-except
+            if self.__verbose:
+                self.__lfh.write("+DbConnectionPool.__close() failed to close connection\n")
+            #
+        #
+
+
+_pool = None
+_poolPid = None
+_poolLock = threading.Lock()
+# Pools inherited by a forked process. They are kept referenced and never closed, since closing (or freeing)
+# a connection sends the quit command over the socket still used by the parent process.
+_inheritedPoolList = []
+
+
+def getDbConnectionPool():
+    """ Return the pool of the current process
+    """
+    global _pool, _poolPid  # pylint: disable=global-statement
+    with _poolLock:
+        if _poolPid != os.getpid():
+            if _pool is not None:
+                _inheritedPoolList.append(_pool)
+            #
+            _pool = DbConnectionPool()
+            _poolPid = os.getpid()
+        #
+        return _pool
+    #
@@ -0,0 +1,131 @@
+##
+# File:  GzipUtil.py
+# Date:  18-Oct-2026
+# Updates:
+##
+"""
+Multithreaded block gzip compression of release files.
+
+This software was developed as part of the World Wide Protein Data Bank
+Common Deposition and Annotation System Project
+
+Copyright (c) 2026 wwPDB
+
+This software is provided under a Creative Commons Attribution 3.0 Unported
+License described at http://creativecommons.org/licenses/by/3.0/.
+
+"""
+__docformat__ = "restructuredtext en"
+__author__ = "Zukang Feng"
+__email__ = "zfeng@rcsb.rutgers.edu"
+__license__ = "Creative Commons Attribution 3.0 Unported"
+__version__ = "V0.07"
+
+import gzip
+import os
+import shutil
+import struct
+import sys
+import time
+import traceback
+import zlib
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+# Deflate window size, each block is primed with this much of the previous block
+_DICTSIZE = 32768
+
+
+def gzipFile(sourceFile, targetFile, level=9, threads=1, blockSize=1048576, log=sys.stderr, verbose=False):
+    """ Compress sourceFile to targetFile (gunzip compatible). With threads > 1 the file is cut into blockSize blocks
+        that are deflated in parallel threads (zlib releases the GIL) and joined into one gzip member, like pigz.
+        Small files, a single thread or any failure of the parallel path use gzip.open.
+    """
+    if (threads > 1) and (os.path.getsize(sourceFile) > blockSize):
+        try:
+            _parallelGzipFile(sourceFile, targetFile, level, threads, blockSize)
+            return
+        except:  # noqa: E722 pylint: disable=bare-except
+            if verbose:
+                traceback.print_exc(file=log)
+            #
+            log.write("+GzipUtil.gzipFile() parallel compression of %s failed, using gzip\n" % sourceFile)
+        #
+    #
+    with open(sourceFile, 'rb') as f_in:
+        with gzip.open(targetFile, 'wb', compresslevel=level) as f_out:
+            shutil.copyfileobj(f_in, f_out)
+        #
+    #
+
+
+def _parallelGzipFile(sourceFile, targetFile, level, threads, blockSize):
+    crc = 0
+    size = 0
+    with open(sourceFile, 'rb') as f_in:
+        with open(targetFile, 'wb') as f_out:
+            f_out.write(_getHeader(targetFile, level))
+            with ThreadPoolExecutor(max_workers=threads) as executor:
+                # Blocks being compressed, at most two per thread are read ahead
+                pendingQueue = deque()
+                previous = b''
+                block = f_in.read(blockSize)
+                while block:
+                    nextBlock = f_in.read(blockSize)
+                    pendingQueue.append(executor.submit(_deflateBlock, block, previous[-_DICTSIZE:], level, not nextBlock))
+                    crc = zlib.crc32(block, crc)
+                    size += len(block)
+                    previous = block
+                    block = nextBlock
+                    while len(pendingQueue) >= threads * 2:
+                        f_out.write(pendingQueue.popleft().result())
+                    #
+                #
+                while pendingQueue:
+                    f_out.write(pendingQueue.popleft().result())
+                #
+            #
+            f_out.write(struct.pack('<II', crc & 0xffffffff, size & 0xffffffff))
+        #
+    #
+
+
+def _deflateBlock(block, zdict, level, lastFlag):
+    """ Raw deflate of one block. Other blocks end with a sync flush on a byte boundary, so the
+        blocks join into one deflate stream, primed with the end of the previous block
+    """
+    if zdict:
+        compressor = zlib.compressobj(level, zlib.DEFLATED, -zlib.MAX_WBITS, zlib.DEF_MEM_LEVEL, zlib.Z_DEFAULT_STRATEGY, zdict)
+    else:
+        compressor = zlib.compressobj(level, zlib.DEFLATED, -zlib.MAX_WBITS)
+    #
+    data = compressor.compress(block)
+    if lastFlag:
+        return data + compressor.flush(zlib.Z_FINISH)
+    #
+    return data + compressor.flush(zlib.Z_SYNC_FLUSH)
+
+
+def _getHeader(targetFile, level):
+    """ gzip member header with the original file name, as written by gzip.open
+    """
+    fname = os.path.basename(targetFile)
+    if fname.endswith('.gz'):
+        fname = fname[:-3]
+    #
+    try:
+        fname = fname.encode('latin-1')
+    except UnicodeEncodeError:
+        fname = b''
+    #
+    xfl = b'\000'
+    if level == 9:
+        xfl = b'\002'
+    elif level == 1:
+        xfl = b'\004'
+    #
+    header = b'\037\213\010' + (b'\010' if fname else b'\000') + struct.pack('<I', int(time.time()) & 0xffffffff) + xfl + b'\377'
+    if fname:
+        header += fname + b'\000'
+    #
+    return header
@@ -108,6 +108,9 @@ class ModuleBaseClass(object):
         pickleFile = self._getEntryPickleFileName(entryId)
         self._dumpPickle(pickleFile, pickleData)
 
+    def _getReleaseTimingPickleFileName(self):
+        return os.path.join(self.__getIndexPath(), 'release_timing.pickle')
+
     def _getLocalEntryPickleFileName(self, entryId):
         return os.path.join(self._sessionPath, entryId.lower() + '.pickle')
 
@@ -20,32 +20,116 @@ __author__ = "Ezra Peisach"
 __email__ = "peisach@rcsb.rutgers.edu"
 __license__ = "Apache 2.0"
 
-from multiprocessing import Value
+from multiprocessing import Array
 import time
 import logging
 
 logger = logging.getLogger()
 
+# Layout of the shared state array
+_TAT = 0          # theoretical arrival time of the next request at the current rate
+_RATE = 1         # current (adaptive) rate
+_STREAK = 2       # successful requests since the last throttled one
+_COUNT = 3        # number of reserved requests
+_FIRST = 4        # time slot of the first request
+_LAST = 5         # time slot of the last request
+_WAITTOTAL = 6    # sum of the waiting times
+_WAITMAX = 7      # longest waiting time
+_THROTTLED = 8    # number of throttled (HTTP 429) responses reported
+_SIZE = 9
+
 
 class MultiProcLimit(object):
     """A class that will ensure that we limit requests made to service are less than rate/second.
-    This is done by ensuring that each request is > 1/rate seconds from previous."""
 
-    def __init__(self, rate):
-        self.__rate = rate
-        self.__delay = (1.0 / rate) + 0.0001
-        self.__last = Value('d', 0.0)
-        logger.debug("Instantiated with rate %r delay %r ", self.__rate,
-                     self.__delay)
+    This is a token bucket (GCRA) shared by processes, threads and asyncio tasks: a request
+    may fire 1/rate seconds after the previous one, or earlier if up to 'burst' tokens
+    have been saved up. The time slot is reserved under the shared lock and the caller
+    waits outside of it, so that workers wait for their own slot concurrently.
+
+    throttled() slows the rate down (and pauses all callers for Retry-After seconds) when
+    the service reports that the rate limit was exceeded, succeeded() brings it back up.
+    """
+
+    def __init__(self, rate, burst=1, adaptive=True, minRate=None):
+        self.__rate = float(rate)
+        self.__burst = max(1, int(burst))
+        self.__adaptive = adaptive
+        if minRate is None:
+            minRate = self.__rate / 8.0
+        self.__minRate = min(float(minRate), self.__rate)
+        self.__margin = 0.0001
+        self.__state = Array('d', _SIZE)
+        self.__state[_RATE] = self.__rate
+        logger.debug("Instantiated with rate %r burst %r", self.__rate, self.__burst)
+
+    def reserve(self):
+        """Reserve the next time slot, returns the number of seconds to wait before firing.
+
+        asyncio callers use 'await asyncio.sleep(mpl.reserve())'."""
+        with self.__state.get_lock():
+            current = time.time()
+            interval = (1.0 / self.__state[_RATE]) + self.__margin
+            slot = max(current, self.__state[_TAT] - (self.__burst - 1) * interval)
+            self.__state[_TAT] = max(self.__state[_TAT], slot) + interval
+            #
+            wait = slot - current
+            if self.__state[_COUNT] == 0:
+                self.__state[_FIRST] = slot
+            self.__state[_COUNT] += 1
+            self.__state[_LAST] = max(self.__state[_LAST], slot)
+            self.__state[_WAITTOTAL] += wait
+            if wait > self.__state[_WAITMAX]:
+                self.__state[_WAITMAX] = wait
+        return wait
 
     def waitnext(self):
         """Waits for the next time to fire"""
+        wait = self.reserve()
+        if wait > 0:
+            # logger.debug("About to sleep %s", wait)
+            time.sleep(wait)
 
-        # Acquire lock on value - will block other processes
-        with self.__last.get_lock():
+    def throttled(self, retryAfter=None):
+        """Service rejected a request for exceeding the rate limit: no request fires for the
+        next retryAfter seconds (or one interval) and the rate is halved if adaptive."""
+        with self.__state.get_lock():
             current = time.time()
-            wait = self.__last.value + self.__delay - current
-            if wait > 0:
-                # logger.debug("About to sleep %s", wait)
-                time.sleep(wait)
-            self.__last.value = time.time()
+            if self.__adaptive:
+                self.__state[_RATE] = max(self.__minRate, self.__state[_RATE] * 0.5)
+            if not retryAfter or retryAfter < 0:
+                retryAfter = 1.0 / self.__state[_RATE]
+            self.__state[_TAT] = max(self.__state[_TAT], current + retryAfter)
+            self.__state[_STREAK] = 0
+            self.__state[_THROTTLED] += 1
+            rate = self.__state[_RATE]
+        logger.info("Rate limit exceeded, pause %.2f seconds, rate %.2f/s", retryAfter, rate)
+
+    def succeeded(self):
+        """Service accepted a request: once a second worth of requests has succeeded at the
+        reduced rate, step the rate back up towards the configured one."""
+        if not self.__adaptive:
+            return
+        with self.__state.get_lock():
+            self.__state[_STREAK] += 1
+            if (self.__state[_RATE] < self.__rate) and (self.__state[_STREAK] >= self.__state[_RATE]):
+                self.__state[_RATE] = min(self.__rate, self.__state[_RATE] + self.__minRate)
+                self.__state[_STREAK] = 0
+
+    def getRate(self):
+        return self.__state[_RATE]
+
+    def getStatistics(self):
+        """Returns achieved request rate, waiting time and throttling counts"""
+        with self.__state.get_lock():
+            state = self.__state[:]
+        count = int(state[_COUNT])
+        achievedRate = 0.0
+        if (count > 1) and (state[_LAST] > state[_FIRST]):
+            achievedRate = (count - 1) / (state[_LAST] - state[_FIRST])
+        waitAverage = 0.0
+        if count > 0:
+            waitAverage = state[_WAITTOTAL] / count
+        return {'rate': self.__rate, 'currentRate': state[_RATE], 'request': count, 'achievedRate': achievedRate,
+                'waitTotal': state[_WAITTOTAL], 'waitAverage': waitAverage, 'waitMax': state[_WAITMAX],
+                'throttled': int(state[_THROTTLED])}
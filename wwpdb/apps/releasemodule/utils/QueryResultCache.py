@@ -0,0 +1,101 @@
+##
+# File:  QueryResultCache.py
+# Date:  18-Oct-2026
+# Updates:
+##
+"""
+Size bounded cache of query results, scoped to one web request or batch job.
+
+This software was developed as part of the World Wide Protein Data Bank
+Common Deposition and Annotation System Project
+
+Copyright (c) 2026 wwPDB
+
+This software is provided under a Creative Commons Attribution 3.0 Unported
+License described at http://creativecommons.org/licenses/by/3.0/.
+
+"""
+__docformat__ = "restructuredtext en"
+__author__ = "Zukang Feng"
+__email__ = "zfeng@rcsb.rutgers.edu"
+__license__ = "Creative Commons Attribution 3.0 Unported"
+__version__ = "V0.07"
+
+import sys
+import threading
+from collections import OrderedDict
+
+
+class QueryResultCache(object):
+    """ Least recently used map of (database, schema key, parameter) -> result rows.
+
+        A cache object lives as long as the request or job that created it, so results are never shared
+        across requests. Rows are copied on the way in and out since callers update the returned rows.
+    """
+
+    def __init__(self, maxSize=1024, log=sys.stderr, verbose=False):
+        self.__maxSize = maxSize
+        self.__lfh = log
+        self.__verbose = verbose
+        self.__lock = threading.Lock()
+        self.__resultMap = OrderedDict()
+        self.__statistics = {'hit': 0, 'miss': 0, 'evict': 0, 'invalidate': 0}
+
+    def get(self, dbName, key, parameter):
+        """ Returns a copy of the cached rows, or None
+        """
+        cacheKey = (dbName, key, self.__getHashableValue(parameter))
+        with self.__lock:
+            if cacheKey not in self.__resultMap:
+                self.__statistics['miss'] += 1
+                return None
+            #
+            rows = self.__resultMap.pop(cacheKey)
+            self.__resultMap[cacheKey] = rows
+            self.__statistics['hit'] += 1
+        #
+        return [dict(row) for row in rows]
+
+    def put(self, dbName, key, parameter, rows):
+        """ Cache a copy of the rows, failed queries (None) are not cached
+        """
+        if rows is None:
+            return
+        #
+        cacheKey = (dbName, key, self.__getHashableValue(parameter))
+        with self.__lock:
+            self.__resultMap.pop(cacheKey, None)
+            self.__resultMap[cacheKey] = [dict(row) for row in rows]
+            while len(self.__resultMap) > self.__maxSize:
+                self.__resultMap.popitem(last=False)
+                self.__statistics['evict'] += 1
+            #
+        #
+
+    def invalidate(self):
+        """ Drop all cached results, called after the database has been updated
+        """
+        with self.__lock:
+            if self.__resultMap:
+                self.__statistics['invalidate'] += 1
+                if self.__verbose:
+                    self.__lfh.write("+QueryResultCache.invalidate() drop %d cached results\n" % len(self.__resultMap))
+                #
+            #
+            self.__resultMap = OrderedDict()
+        #
+
+    def getStatistics(self):
+        with self.__lock:
+            statistics = dict(self.__statistics)
+            statistics['size'] = len(self.__resultMap)
+        #
+        return statistics
+
+    def __getHashableValue(self, value):
+        if isinstance(value, (set, frozenset)):
+            return tuple(sorted(value))
+        elif isinstance(value, (list, tuple)):
+            return tuple([self.__getHashableValue(v) for v in value])
+        #
+        return value
@@ -0,0 +1,143 @@
+##
+# File:  ReleaseProgressStore.py
+# Date:  18-Oct-2026
+# Updates:
+##
+"""
+Per entry progress events of a background release/pull off job, kept in the session directory.
+
+This software was developed as part of the World Wide Protein Data Bank
+Common Deposition and Annotation System Project
+
+Copyright (c) 2026 wwPDB
+
+This software is provided under a Creative Commons Attribution 3.0 Unported
+License described at http://creativecommons.org/licenses/by/3.0/.
+
+"""
+__docformat__ = "restructuredtext en"
+__author__ = "Zukang Feng"
+__email__ = "zfeng@rcsb.rutgers.edu"
+__license__ = "Creative Commons Attribution 3.0 Unported"
+__version__ = "V0.07"
+
+import json
+import os
+import sys
+import time
+
+QUEUED = "queued"
+RUNNING = "running"
+STEP = "step"
+DONE = "done"
+BLOCKED = "blocked"
+FAILED = "failed"
+
+
+class ReleaseProgressStore(object):
+    """ Events are appended as one JSON line each to release_progress_<jobId>.log, so the worker processes of the job
+        can all write to it and a poll request reads only what was added since its last offset. The final result of
+        the job goes to release_result_<jobId>.json once the job has finished.
+    """
+
+    def __init__(self, sessionPath, jobId, log=sys.stderr, verbose=False):
+        self.__eventFile = os.path.join(sessionPath, "release_progress_" + jobId + ".log")
+        self.__resultFile = os.path.join(sessionPath, "release_result_" + jobId + ".json")
+        self.__lfh = log
+        self.__verbose = verbose
+
+    def exists(self):
+        return os.access(self.__eventFile, os.F_OK)
+
+    def addEntries(self, entryIdList):
+        """ Queue all entries of the job
+        """
+        self.__write([self.__getEvent(entryId, QUEUED) for entryId in entryIdList])
+
+    def addEvent(self, entryId, status, step="", message="", data=None):
+        """ Add status (running/step/done/blocked/failed) of entryId, data is the entry's form data for done/blocked entries
+        """
+        self.__write([self.__getEvent(entryId, status, step=step, message=message, data=data)])
+
+    def getEvents(self, offset=0):
+        """ Return (events added after byte offset, new offset), a line still being written is left for the next call
+        """
+        if not self.exists():
+            return [], offset
+        #
+        eventList = []
+        with open(self.__eventFile, "rb") as ifh:
+            ifh.seek(offset)
+            data = ifh.read()
+        #
+        end = data.rfind(b"\n") + 1
+        for line in data[:end].decode("utf-8").split("\n"):
+            if not line:
+                continue
+            #
+            try:
+                eventList.append(json.loads(line))
+            except ValueError:
+                if self.__verbose:
+                    self.__lfh.write("+ReleaseProgressStore.getEvents() skip broken line %r\n" % line)
+                #
+            #
+        #
+        return eventList, offset + end
+
+    def getEntryStatusMap(self):
+        """ Return {entryId: last event} of all entries
+        """
+        statusMap = {}
+        for event in self.getEvents()[0]:
+            if event["entry"]:
+                statusMap[event["entry"]] = event
+            #
+        #
+        return statusMap
+
+    def setResult(self, returnContent="", errorContent=""):
+        """ Save the final content of the job, written to a temporary file first so readers never see a partial result
+        """
+        tmpFile = self.__resultFile + ".%d.tmp" % os.getpid()
+        with open(tmpFile, "w") as ofh:
+            json.dump({"time": time.time(), "return": returnContent, "error": errorContent}, ofh)
+        #
+        os.rename(tmpFile, self.__resultFile)
+
+    def getResult(self):
+        """ Return {'time', 'return', 'error'} of a finished job, or None
+        """
+        if not os.access(self.__resultFile, os.F_OK):
+            return None
+        #
+        with open(self.__resultFile, "r") as ifh:
+            return json.load(ifh)
+        #
+
+    def __getEvent(self, entryId, status, step="", message="", data=None):
+        event = {"time": round(time.time(), 3), "entry": entryId, "status": status}
+        if step:
+            event["step"] = step
+        #
+        if message:
+            event["message"] = message
+        #
+        if data:
+            event["data"] = data
+        #
+        return event
+
+    def __write(self, eventList):
+        """ One append per call keeps the lines of concurrent writers apart
+        """
+        if not eventList:
+            return
+        #
+        text = "".join([json.dumps(event, sort_keys=True) + "\n" for event in eventList])
+        fd = os.open(self.__eventFile, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o664)
+        try:
+            os.write(fd, text.encode("utf-8"))
+        finally:
+            os.close(fd)
+        #
@@ -0,0 +1,361 @@
+##
+# File:  ReleaseScheduler.py
+# Date:  18-Oct-2026
+# Updates:
+##
+"""
+Cost ordered, dynamically dispatched scheduling of the entries of a release/pull off batch.
+
+This software was developed as part of the World Wide Protein Data Bank
+Common Deposition and Annotation System Project
+
+Copyright (c) 2026 wwPDB
+
+This software is provided under a Creative Commons Attribution 3.0 Unported
+License described at http://creativecommons.org/licenses/by/3.0/.
+
+"""
+__docformat__ = "restructuredtext en"
+__author__ = "Zukang Feng"
+__email__ = "zfeng@rcsb.rutgers.edu"
+__license__ = "Creative Commons Attribution 3.0 Unported"
+__version__ = "V0.07"
+
+try:
+    import cPickle as pickle
+except ImportError:
+    import pickle as pickle
+#
+import multiprocessing
+import os
+import re
+import sys
+import time
+import traceback
+
+try:
+    import queue
+except ImportError:
+    import Queue as queue
+#
+
+_versionPattern = re.compile(r"\.V(\d+)$")
+
+
+def getArchiveFileSizeInfo(path, entryId):
+    """ Return (total size, EM map size) in bytes of the latest version of each of the entry's archive files,
+        with one directory listing
+    """
+    latestMap = {}
+    try:
+        for filename in os.listdir(path):
+            if not filename.startswith(entryId + "_"):
+                continue
+            #
+            match = _versionPattern.search(filename)
+            if not match:
+                continue
+            #
+            baseName = filename[:match.start()]
+            version = int(match.group(1))
+            if (baseName in latestMap) and (latestMap[baseName][0] > version):
+                continue
+            #
+            latestMap[baseName] = (version, os.path.getsize(os.path.join(path, filename)))
+        #
+    except OSError:
+        pass
+    #
+    totalSize = 0
+    emSize = 0
+    for baseName, (_version, size) in latestMap.items():
+        totalSize += size
+        if baseName.find("_em-") != -1:
+            emSize += size
+        #
+    #
+    return totalSize, emSize
+
+
+def getWorkerCount(entryCount, useComputeCluster=False, cpuCount=None):
+    """ Return the number of local worker processes: half of the CPUs, or one per entry with USE_COMPUTE_CLUSTER,
+        never more than the CPUs of the node
+    """
+    if cpuCount is None:
+        cpuCount = multiprocessing.cpu_count()
+    #
+    if useComputeCluster:
+        numProc = entryCount
+    else:
+        numProc = int(cpuCount / 2)
+    #
+    return max(1, min(numProc, cpuCount))
+
+
+class ReleaseScheduler(object):
+    """ Entries are ordered by estimated cost (archive file size, EM maps, big entries and the time they took in
+        previous runs) and handed out one work unit at a time from a shared queue, so an idle worker always
+        takes the most expensive remaining unit. Expensive or I/O heavy entries are units of their own, cheap
+        entries are packed into small units that are run together (one ReleaseUpdate call per unit).
+
+        numProc worker processes run at the same time (CPU budget), of which at most ioBudget work on I/O
+        heavy units (EM maps, big entries, large archive files).
+    """
+
+    BASE_SECONDS = 60.0
+    SECONDS_PER_MB = 0.2
+    HEAVY_MB = 1024.0
+    MAX_HISTORY = 5000
+
+    def __init__(self, numProc=1, ioBudget=1, historyFile=None, log=sys.stderr, verbose=False):
+        self.__numProc = max(1, int(numProc))
+        self.__ioBudget = max(1, int(ioBudget))
+        self.__historyFile = historyFile
+        self.__lfh = log
+        self.__verbose = verbose
+        self.__historyMap = self.__loadHistory()
+        self.__secondsPerMb = self.__getSecondsPerMb()
+        self.__entryList = []
+        self.__timingList = []
+
+    def addEntry(self, entryData, totalSize=0, emSize=0):
+        """ Add entryData (with 'entry' id) whose archive files take totalSize bytes, emSize bytes of them EM maps
+        """
+        entryId = entryData["entry"]
+        history = self.__historyMap.get(entryId, {})
+        bigEntry = ("big_entry" in entryData and entryData["big_entry"]) or history.get("big_entry", False)
+        sizeMb = totalSize / 1048576.0
+        if history.get("seconds"):
+            cost = history["seconds"]
+        else:
+            cost = self.BASE_SECONDS + sizeMb * self.__secondsPerMb
+            if bigEntry:
+                cost *= 2.0
+            #
+        #
+        ioHeavy = bool(bigEntry or (emSize > 0) or (sizeMb >= self.HEAVY_MB))
+        self.__entryList.append({"data": entryData, "cost": cost, "size": totalSize, "io_heavy": ioHeavy, "big_entry": bool(bigEntry)})
+
+    def getWorkUnitList(self):
+        """ Return [(io heavy flag, estimated cost, [entryData, ...])] in the order they are handed out
+        """
+        entryList = sorted(self.__entryList, key=lambda entry: entry["cost"], reverse=True)
+        heavyList = [entry for entry in entryList if entry["io_heavy"]]
+        lightList = [entry for entry in entryList if not entry["io_heavy"]]
+        #
+        # A few units per worker keeps the tail short, larger units share more work in one ReleaseUpdate call.
+        # A unit takes cheap entries until its cost reaches the target.
+        targetCost = sum([entry["cost"] for entry in lightList]) / (self.__numProc * 3.0)
+        unitList = [(True, entry["cost"], [entry]) for entry in heavyList]
+        lightUnitList = []
+        for entry in lightList:
+            if entry["cost"] >= targetCost:
+                lightUnitList.append([entry["cost"], [entry]])
+                continue
+            #
+            if lightUnitList and (lightUnitList[-1][0] < targetCost):
+                lightUnitList[-1][0] += entry["cost"]
+                lightUnitList[-1][1].append(entry)
+            else:
+                lightUnitList.append([entry["cost"], [entry]])
+            #
+        #
+        unitList.extend([(False, cost, unitEntryList) for cost, unitEntryList in lightUnitList])
+        return [(ioHeavy, cost, [entry["data"] for entry in unitEntryList]) for ioHeavy, cost, unitEntryList in unitList]
+
+    def run(self, workerFunction):
+        """ Run workerFunction(dataList, procName) on all work units, save the timings to the history file and
+            return the per entry timing list
+        """
+        unitList = self.getWorkUnitList()
+        if not unitList:
+            return []
+        #
+        heavyList = [unit for unit in unitList if unit[0]]
+        lightList = [unit for unit in unitList if not unit[0]]
+        numProc = min(self.__numProc, len(unitList))
+        heavyIndex = multiprocessing.Value("i", 0)
+        lightIndex = multiprocessing.Value("i", 0)
+        ioSemaphore = multiprocessing.BoundedSemaphore(self.__ioBudget)
+        resultQueue = multiprocessing.Queue()
+        #
+        startTime = time.time()
+        processList = []
+        for i in range(numProc):
+            procName = "worker_%d" % (i + 1)
+            process = multiprocessing.Process(target=self.__runWorker, args=(workerFunction, procName, heavyList, lightList, heavyIndex,
+                                                                             lightIndex, ioSemaphore, resultQueue))
+            process.start()
+            processList.append(process)
+        #
+        resultList = []
+        finished = 0
+        while finished < numProc:
+            try:
+                result = resultQueue.get(timeout=5)
+            except queue.Empty:
+                if not [process for process in processList if process.is_alive()]:
+                    break
+                #
+                continue
+            #
+            if result is None:
+                finished += 1
+            else:
+                resultList.append(result)
+            #
+        #
+        for process in processList:
+            process.join()
+        #
+        self.__timingList = self.__getTimingList(resultList, startTime)
+        self.__saveHistory()
+        self.__reportTiming()
+        return self.__timingList
+
+    def getTimingList(self):
+        return self.__timingList
+
+    def __runWorker(self, workerFunction, procName, heavyList, lightList, heavyIndex, lightIndex, ioSemaphore, resultQueue):
+        """ Take the next unit until both lists are used up. A heavy unit is preferred while an I/O slot is free,
+            otherwise the worker keeps going with light units and only waits for a slot when none are left.
+        """
+        try:
+            while True:
+                unit = None
+                ioSlot = False
+                if ioSemaphore.acquire(False):
+                    unit = self.__getNextUnit(heavyList, heavyIndex)
+                    ioSlot = unit is not None
+                    if not ioSlot:
+                        ioSemaphore.release()
+                    #
+                #
+                if unit is None:
+                    unit = self.__getNextUnit(lightList, lightIndex)
+                #
+                if (unit is None) and (heavyIndex.value < len(heavyList)):
+                    ioSemaphore.acquire()
+                    unit = self.__getNextUnit(heavyList, heavyIndex)
+                    ioSlot = unit is not None
+                    if not ioSlot:
+                        ioSemaphore.release()
+                    #
+                #
+                if unit is None:
+                    break
+                #
+                startTime = time.time()
+                ok = True
+                try:
+                    workerFunction(unit[2], procName)
+                except:  # noqa: E722 pylint: disable=bare-except
+                    ok = False
+                    traceback.print_exc(file=self.__lfh)
+                finally:
+                    if ioSlot:
+                        ioSemaphore.release()
+                    #
+                #
+                resultQueue.put((procName, [entryData["entry"] for entryData in unit[2]], startTime, time.time(), ok))
+            #
+        finally:
+            resultQueue.put(None)
+        #
+
+    def __getNextUnit(self, unitList, index):
+        with index.get_lock():
+            if index.value >= len(unitList):
+                return None
+            #
+            unit = unitList[index.value]
+            index.value += 1
+        #
+        return unit
+
+    def __getTimingList(self, resultList, batchStartTime):
+        """ The time of a unit of several entries is shared out by their estimated cost
+        """
+        entryMap = dict([(entry["data"]["entry"], entry) for entry in self.__entryList])
+        timingList = []
+        for procName, entryIdList, startTime, endTime, ok in resultList:
+            totalCost = sum([entryMap[entryId]["cost"] for entryId in entryIdList])
+            for entryId in entryIdList:
+                entry = entryMap[entryId]
+                share = entry["cost"] / totalCost if totalCost > 0 else 1.0 / len(entryIdList)
+                timingList.append({"entry": entryId, "worker": procName, "start": startTime - batchStartTime, "seconds": (endTime - startTime) * share,
+                                   "estimated": entry["cost"], "unit_size": len(entryIdList), "ok": ok})
+            #
+        #
+        return sorted(timingList, key=lambda timing: timing["start"])
+
+    def __reportTiming(self):
+        if not self.__timingList:
+            return
+        #
+        for timing in self.__timingList:
+            self.__lfh.write("+ReleaseScheduler.run() %s %s start %.1f s took %.1f s (estimated %.1f s, %d entries in unit)%s\n"
+                             % (timing["entry"], timing["worker"], timing["start"], timing["seconds"], timing["estimated"], timing["unit_size"],
+                                "" if timing["ok"] else " failed"))
+        #
+
+    def __getSecondsPerMb(self):
+        """ Learn the release time per MB of archive files from the previous runs
+        """
+        seconds = 0.0
+        sizeMb = 0.0
+        for history in self.__historyMap.values():
+            if history.get("size") and history.get("seconds"):
+                seconds += max(0.0, history["seconds"] - self.BASE_SECONDS)
+                sizeMb += history["size"] / 1048576.0
+            #
+        #
+        if sizeMb < 1.0:
+            return self.SECONDS_PER_MB
+        #
+        return seconds / sizeMb
+
+    def __loadHistory(self):
+        if (not self.__historyFile) or (not os.access(self.__historyFile, os.F_OK)):
+            return {}
+        #
+        try:
+            fb = open(self.__historyFile, "rb")
+            historyMap = pickle.load(fb)
+            fb.close()
+            return historyMap
+        except:  # noqa: E722 pylint: disable=bare-except
+            if self.__verbose:
+                self.__lfh.write("+ReleaseScheduler.__loadHistory() failed to read %s\n" % self.__historyFile)
+            #
+        #
+        return {}
+
+    def __saveHistory(self):
+        if not self.__historyFile:
+            return
+        #
+        entryMap = dict([(entry["data"]["entry"], entry) for entry in self.__entryList])
+        # Re-read to keep the timings saved by other batches in the meantime
+        historyMap = self.__loadHistory()
+        for timing in self.__timingList:
+            if (not timing["ok"]) or (timing["unit_size"] > 1 and timing["entry"] in historyMap):
+                continue
+            #
+            entry = entryMap[timing["entry"]]
+            historyMap[timing["entry"]] = {"seconds": timing["seconds"], "size": entry["size"], "big_entry": entry["big_entry"], "time": time.time()}
+        #
+        if len(historyMap) > self.MAX_HISTORY:
+            historyMap = dict(sorted(historyMap.items(), key=lambda item: item[1]["time"])[-self.MAX_HISTORY:])
+        #
+        try:
+            tmpFile = self.__historyFile + ".%d.tmp" % os.getpid()
+            fb = open(tmpFile, "wb")
+            pickle.dump(historyMap, fb)
+            fb.close()
+            os.rename(tmpFile, self.__historyFile)
+        except:  # noqa: E722 pylint: disable=bare-except
+            if self.__verbose:
+                self.__lfh.write("+ReleaseScheduler.__saveHistory() failed to write %s\n" % self.__historyFile)
+            #
+        #
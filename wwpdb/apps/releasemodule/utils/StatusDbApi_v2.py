@@ -47,8 +47,8 @@ class StatusDbApi(object):
     #
     """
     """
-    def __init__(self, siteId=None, verbose=False, log=sys.stderr):
-        """
+    def __init__(self, siteId=None, verbose=False, log=sys.stderr, queryCache=None):
+        """ query results are memoized in queryCache (QueryResultCache) if given
         """
         self.__lfh = log
         self.__verbose = verbose
@@ -65,6 +65,7 @@ class StatusDbApi(object):
         self.__dbApi = DbApiUtil(dbServer=self.__dbServer, dbHost=self.__dbHost, dbName=self.__dbName, dbUser=self.__dbUser, dbPw=self.__dbPw,
                                  dbSocket=self.__dbSocket, dbPort=self.__dbPort, verbose=self.__verbose, log=self.__lfh)
         self.__dbApi.setSchemaMap(self.__schemaMap)
+        self.__dbApi.setQueryCache(queryCache)
 
     def runUpdate(self, table=None, where=None, data=None):
         return self.__dbApi.runUpdate(table=table, where=where, data=data)
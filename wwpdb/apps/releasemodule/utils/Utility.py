@@ -177,6 +177,26 @@ def getFileName(path, root, ext):
     return root + '_1.' + ext
 
 
+def getArchiveMapFileSet(archiveTopPath, entryIdList):
+    """ Return the set of primary map file names without version (e.g. D_1000000001_em-volume_P1.map) found in the archive
+        directories of entryIdList under archiveTopPath, each entry directory is listed once
+    """
+    mapFileSet = set()
+    for entryId in entryIdList:
+        try:
+            for filename in os.listdir(os.path.join(archiveTopPath, entryId)):
+                if filename.startswith(entryId + '_em-volume_P1.map.V'):
+                    mapFileSet.add(filename[:filename.rfind('.V')])
+                    break
+                #
+            #
+        except OSError:
+            pass
+        #
+    #
+    return mapFileSet
+
+
 def RunScript(path, script, log):
     """Run script command
     """
@@ -33,6 +33,7 @@ import traceback
 
 from wwpdb.utils.config.ConfigInfo import ConfigInfo
 from wwpdb.utils.config.ConfigInfoApp import ConfigInfoAppCommon
+from wwpdb.utils.detach.DetachUtils import DetachUtils
 from wwpdb.utils.session.WebRequest import InputRequest, ResponseContent
 from wwpdb.apps.releasemodule.citation.ReadCitationFinderResult_v2 import ReadCitationFinderResult
 from wwpdb.apps.releasemodule.depict.DepictAnnotatorHistory import DepictAnnotatorHistory
@@ -47,6 +48,8 @@ from wwpdb.apps.releasemodule.update.EntryFormParser_v2 import EntryFormParser
 from wwpdb.apps.releasemodule.update.MultiUpdateProcess import MultiUpdateProcess
 from wwpdb.apps.releasemodule.update.UpdateFormParser import UpdateFormParser
 from wwpdb.apps.releasemodule.utils.CombineDbApi import CombineDbApi
+import wwpdb.apps.releasemodule.utils.ReleaseProgressStore as ProgressStatus
+from wwpdb.apps.releasemodule.utils.ReleaseProgressStore import ReleaseProgressStore
 from wwpdb.apps.releasemodule.utils.Utility import FindFiles, FindLogFiles
 from wwpdb.io.locator.PathInfo import PathInfo
 #
@@ -185,6 +188,7 @@ class ReleaseWebAppWorker(object):
                            # '/service/release/check_marked_pubmed_id': '_MarkedPubmedIDPage',
                            '/service/release/check_marked_pubmed_id': '_DisPlayMarkedPubmedIDOp',
                            '/service/release/update': '_UpdateOp',
+                           '/service/release/update_status': '_UpdateStatusOp',
                            '/service/release/citation_request': '_CitationRequestOp',
                            '/service/release/entry_request': '_EntryRequestOp',
                            '/service/release/marked_pubmed_request': '_MarkedPubmedRequestOp',
@@ -580,6 +584,14 @@ class ReleaseWebAppWorker(object):
             return rC
         #
         updOp = MultiUpdateProcess(reqObj=self.__reqObj, updateList=frmParser.getUpdateList(), verbose=self.__verbose, log=self.__lfh)
+        if str(self.__reqObj.getValue('background')) == 'yes':
+            # Results are polled with _UpdateStatusOp using the returned semaphore
+            dU = DetachUtils(reqObj=self.__reqObj, verbose=self.__verbose, log=self.__lfh)
+            dU.set(workerObj=updOp, workerMethod='runBackground')
+            dU.runDetach()
+            rC.setStatus(statusMsg='running', semaphore=str(self.__reqObj.getValue('semaphore')))
+            return rC
+        #
         updOp.run()
         errContent = updOp.getErrorContent()
         rtnContent = updOp.getReturnContent()
@@ -590,6 +602,59 @@ class ReleaseWebAppWorker(object):
         #
         return rC
 
+    def _UpdateStatusOp(self):
+        """ Return the progress events of a background update job added after 'offset', with the result text of
+            the entries finished since then and the whole result once the job has finished
+        """
+        if (self.__verbose):
+            self.__lfh.write("+ReleaseWebAppWorker._UpdateStatusOp() Starting now\n")
+        #
+        self.__getSession()
+        #
+        self.__reqObj.setReturnFormat(return_format="json")
+        rC = ResponseContent(reqObj=self.__reqObj, verbose=self.__verbose, log=self.__lfh)
+        #
+        semaphore = str(self.__reqObj.getValue('semaphore'))
+        if (not semaphore) or (os.path.basename(semaphore) != semaphore):
+            rC.setError(errMsg='Unknown update job ' + semaphore)
+            return rC
+        #
+        progressStore = ReleaseProgressStore(self.__sessionPath, semaphore, log=self.__lfh, verbose=self.__verbose)
+        offset = 0
+        try:
+            offset = int(str(self.__reqObj.getValue('offset')))
+        except ValueError:
+            pass
+        #
+        # The result is written after the last event, reading it first never misses the final events
+        result = progressStore.getResult()
+        eventList, offset = progressStore.getEvents(offset)
+        updOp = MultiUpdateProcess(reqObj=self.__reqObj, updateList=[], verbose=self.__verbose, log=self.__lfh)
+        entryContentList = []
+        for event in eventList:
+            if (event['status'] in (ProgressStatus.DONE, ProgressStatus.BLOCKED)) and ('data' in event):
+                entryContent, _entrySysError = updOp.getEntryReturnContent(event['data']['entry_data'], task=event['data']['task'])
+                entryContentList.append({'entry': event['entry'], 'status': event['status'], 'content': entryContent})
+            elif event['status'] == ProgressStatus.FAILED:
+                entryContentList.append({'entry': event['entry'], 'status': event['status'],
+                                         'content': '\n\nEntry ' + event['entry'] + ': <span style="color:red">FAILED</span>\n\n'
+                                         + event.get('message', '')})
+            #
+            event.pop('data', None)
+        #
+        rC.set('offset', offset)
+        rC.set('events', eventList)
+        rC.set('entries', entryContentList)
+        if result is None:
+            rC.setStatus(statusMsg='running', semaphore=semaphore)
+        elif result['error']:
+            rC.setError(errMsg=result['error'], semaphore=semaphore)
+        else:
+            rC.setStatus(statusMsg='completed', semaphore=semaphore)
+            rC.setText(text=result['return'])
+        #
+        return rC
+
     def _CitationRequestOp(self):
         """ Launch request operation
         """
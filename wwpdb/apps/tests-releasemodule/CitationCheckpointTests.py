@@ -0,0 +1,69 @@
+##
+# File: CitationCheckpointTests.py
+# Date:  18-Oct-2026
+#
+# Updates:
+##
+"""Test cases for citation finder checkpoint"""
+
+__docformat__ = "restructuredtext en"
+__author__ = "Zukang Feng"
+__email__ = "zfeng@rcsb.rutgers.edu"
+__license__ = "Creative Commons Attribution 3.0 Unported"
+__version__ = "V0.01"
+
+import os
+import unittest
+import sys
+
+if __package__ is None or __package__ == "":
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from commonsetup import HERE, TESTOUTPUT  # noqa:  F401 pylint: disable=import-error,unused-import
+    from fakeeutils import EFETCHFILE  # pylint: disable=import-error
+else:
+    from .commonsetup import HERE, TESTOUTPUT  # noqa: F401 pylint: disable=relative-beyond-top-level
+    from .fakeeutils import EFETCHFILE  # pylint: disable=relative-beyond-top-level
+
+from wwpdb.apps.releasemodule.citation.CitationCheckpoint import CitationCheckpoint
+from wwpdb.apps.releasemodule.citation.FetchResultParser import FetchResultParser
+
+
+class CitationCheckpointTests(unittest.TestCase):
+    def setUp(self):
+        self.__dbPath = os.path.join(TESTOUTPUT, "citation_finder_checkpoint_test.sqlite")
+        if os.access(self.__dbPath, os.F_OK):
+            os.remove(self.__dbPath)
+        self.__infoList = FetchResultParser(xmlfile=EFETCHFILE).getPubmedInfoList()
+
+    def testResume(self):
+        """Test saved stages and results are read back on resume only"""
+        candidateList = [{"structure_id": "D_1000000001", "c_title": "Title", "pubmed_author": ["Peisach+E[au]"]}]
+        checkpoint = CitationCheckpoint(self.__dbPath)
+        self.assertFalse(checkpoint.isStageDone("candidate"))
+        checkpoint.setStageDone("candidate", (2, candidateList))
+        checkpoint.putSearchResultList([{"term": "Peisach+E[au]", "id": ["30357411", "28190782"], "searched": True},
+                                        {"term": "Nobody+X[au]", "id": [], "searched": True},
+                                        {"term": "Failed+X[au]", "id": [], "searched": False}])
+        checkpoint.putArticleList(self.__infoList[:2])
+        checkpoint.close()
+        #
+        checkpoint = CitationCheckpoint(self.__dbPath, resume=True)
+        self.assertTrue(checkpoint.isStageDone("candidate"))
+        self.assertEqual(checkpoint.getStageData("candidate"), (2, candidateList))
+        self.assertEqual(checkpoint.getSearchResultMap(), {"Peisach+E[au]": ["30357411", "28190782"], "Nobody+X[au]": []})
+        idList = [info["pdbx_database_id_PubMed"] for info in self.__infoList]
+        infoMap = checkpoint.lookupArticles(idList)
+        self.assertEqual(sorted(infoMap.keys()), sorted(idList[:2]))
+        self.assertEqual(infoMap[idList[0]], self.__infoList[0])
+        self.assertEqual(checkpoint.getStatistics(), {"search": 2, "article": 2, "stage": ["candidate"]})
+        checkpoint.close()
+        #
+        checkpoint = CitationCheckpoint(self.__dbPath)
+        self.assertFalse(checkpoint.isStageDone("candidate"))
+        self.assertEqual(checkpoint.getSearchResultMap(), {})
+        self.assertIsNone(checkpoint.getStageData("candidate"))
+        checkpoint.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,114 @@
+##
+# File: CitationFinderCacheTests.py
+# Date:  18-Oct-2026
+#
+# Updates:
+##
+"""Test cases for the pubmed cache shared between citation finder runs"""
+
+__docformat__ = "restructuredtext en"
+__author__ = "Zukang Feng"
+__email__ = "zfeng@rcsb.rutgers.edu"
+__license__ = "Creative Commons Attribution 3.0 Unported"
+__version__ = "V0.01"
+
+import os
+import shutil
+import sqlite3
+import unittest
+import sys
+
+try:
+    from unittest.mock import patch
+except ImportError:
+    from mock import patch
+
+if __package__ is None or __package__ == "":
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from commonsetup import HERE, TESTOUTPUT  # noqa:  F401 pylint: disable=import-error,unused-import
+else:
+    from .commonsetup import HERE, TESTOUTPUT  # noqa: F401 pylint: disable=relative-beyond-top-level
+
+from wwpdb.apps.releasemodule.citation.CitationFinder import CitationFinder
+from wwpdb.apps.releasemodule.citation.PubmedCache import DAY
+
+_TERMMAP = {"Peisach+E[au]": ["30357411", "28190782"], "Feng+Z[au]": ["29174494"], "10.1002/pro.3530[aid]": ["30357411"]}
+_CANDIDATELIST = [{"structure_id": "D_1000000001", "c_title": "Title", "pubmed_author": ["Peisach+E[au]", "Feng+Z[au]"],
+                   "pdbx_database_id_DOI": "10.1002/pro.3530"}]
+
+
+class _FakeSearchMP(object):
+    """ Records the search calls of the citation finder
+    """
+    callList = []
+
+    def __init__(self, termList=None, mindateMap=None, **_kwargs):
+        self.__termList = termList
+        _FakeSearchMP.callList.append((sorted(termList), dict(mindateMap or {})))
+
+    def run(self, year=2):  # pylint: disable=unused-argument
+        pass
+
+    def getSearchedTermList(self):
+        return list(self.__termList)
+
+    def getTermMap(self):
+        return dict([(term, _TERMMAP[term]) for term in self.__termList if _TERMMAP.get(term)])
+
+
+class CitationFinderCacheTests(unittest.TestCase):
+    def setUp(self):
+        self.__sessionPath = os.path.join(TESTOUTPUT, "citation-cache-session")
+        self.__finderPath = os.path.join(TESTOUTPUT, "citation-cache-finder")
+        for path in (self.__sessionPath, self.__finderPath):
+            if os.path.exists(path):
+                shutil.rmtree(path)
+            os.makedirs(path)
+        self.__output = os.path.join(self.__finderPath, "citation_finder_WWPDB_DEPLOY.db")
+        _FakeSearchMP.callList = []
+
+    def tearDown(self):
+        shutil.rmtree(self.__sessionPath, ignore_errors=True)
+        shutil.rmtree(self.__finderPath)
+
+    def __search(self):
+        """ Run the search stage of a citation finder run, then remove its session path as the weekly job does
+        """
+        if not os.path.exists(self.__sessionPath):
+            os.makedirs(self.__sessionPath)
+        with patch("wwpdb.apps.releasemodule.citation.CitationFinder.ContentDbApi") as contentDbApi, \
+                patch("wwpdb.apps.releasemodule.citation.CitationFinder.SearchMP", _FakeSearchMP), \
+                open(os.devnull, "w") as lfh:
+            contentDbApi.return_value.getPubmedSearchList.return_value = [dict(cdt) for cdt in _CANDIDATELIST]
+            finder = CitationFinder(siteId="WWPDB_DEPLOY", path=self.__sessionPath, output=self.__output, log=lfh)
+            finder._getcandidateList()  # pylint: disable=protected-access
+            finder._getTermList()  # pylint: disable=protected-access
+            finder._runNCBIPubmedSearch()  # pylint: disable=protected-access
+            finder._closeCache()  # pylint: disable=protected-access
+            finder._closeCheckpoint()  # pylint: disable=protected-access
+        shutil.rmtree(self.__sessionPath)
+
+    def testCacheSurvivesCleanUp(self):
+        """Test the cache outlives the session path and a week old author term result is only searched incrementally"""
+        self.__search()
+        self.assertEqual(_FakeSearchMP.callList, [(sorted(_TERMMAP.keys()), {})])
+        self.assertTrue(os.access(os.path.join(self.__finderPath, "citation_finder_WWPDB_DEPLOY_pubmed_cache.sqlite"), os.F_OK))
+        # Second run hits the cache and does not search at all
+        self.__search()
+        self.assertEqual(len(_FakeSearchMP.callList), 1)
+        #
+        # The next weekly run
+        conn = sqlite3.connect(os.path.join(self.__finderPath, "citation_finder_WWPDB_DEPLOY_pubmed_cache.sqlite"))
+        conn.execute("UPDATE search_result SET search_time = search_time - ?, full_search_time = full_search_time - ?", (7 * DAY, 7 * DAY))
+        conn.commit()
+        conn.close()
+        self.__search()
+        self.assertEqual(len(_FakeSearchMP.callList), 2)
+        termList, mindateMap = _FakeSearchMP.callList[1]
+        # The DOI search is repeated in full, the author terms only since their last search
+        self.assertEqual(termList, sorted(_TERMMAP.keys()))
+        self.assertEqual(sorted(mindateMap.keys()), ["Feng+Z[au]", "Peisach+E[au]"])
+
+
+if __name__ == '__main__':
+    unittest.main()
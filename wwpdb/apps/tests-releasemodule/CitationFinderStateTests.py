@@ -0,0 +1,68 @@
+##
+# File: CitationFinderStateTests.py
+# Date:  18-Oct-2026
+#
+# Updates:
+##
+"""Test cases for incremental citation finder state"""
+
+__docformat__ = "restructuredtext en"
+__author__ = "Zukang Feng"
+__email__ = "zfeng@rcsb.rutgers.edu"
+__license__ = "Creative Commons Attribution 3.0 Unported"
+__version__ = "V0.01"
+
+import os
+import time
+import unittest
+import sys
+
+if __package__ is None or __package__ == "":
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from commonsetup import HERE, TESTOUTPUT  # noqa:  F401 pylint: disable=import-error,unused-import
+else:
+    from .commonsetup import HERE, TESTOUTPUT  # noqa: F401 pylint: disable=relative-beyond-top-level
+
+from wwpdb.apps.releasemodule.citation.CitationFinderState import CitationFinderState, DAY
+
+
+class CitationFinderStateTests(unittest.TestCase):
+    def setUp(self):
+        self.__filePath = os.path.join(TESTOUTPUT, "citation_finder_test_state.pickle")
+        if os.access(self.__filePath, os.F_OK):
+            os.remove(self.__filePath)
+        self.__candidateList = [{"structure_id": "D_1000000001", "pubmed_author": ["Peisach+E[au]", "Feng+Z[au]"],
+                                 "pdbx_database_id_DOI": "10.1002/pro.3530"},
+                                {"structure_id": "D_1000000002", "pubmed_author": ["Young+JY[au]"]}]
+        self.__termMap = {"Peisach+E[au]": ["30357411"], "Feng+Z[au]": ["29174494"], "Young+JY[au]": [],
+                          "10.1002/pro.3530[aid]": ["30357411"]}
+
+    def testIncremental(self):
+        """Test unchanged author terms are searched since the last run and the others over the full window"""
+        searchTime = time.time() - 3 * DAY
+        state = CitationFinderState(self.__filePath, log=sys.stderr)
+        self.assertFalse(state.load(2))
+        self.assertEqual(state.getRefreshMap(self.__candidateList, sorted(self.__termMap.keys())), {})
+        state.save(2, searchTime, self.__candidateList, self.__termMap, set())
+        #
+        candidateList = [dict(self.__candidateList[0]), {"structure_id": "D_1000000002", "pubmed_author": ["Young+JY[au]", "Berman+HM[au]"]},
+                         {"structure_id": "D_1000000003", "pubmed_author": ["Feng+Z[au]", "Westbrook+J[au]"]}]
+        termList = sorted(self.__termMap.keys()) + ["Berman+HM[au]", "Westbrook+J[au]"]
+        state = CitationFinderState(self.__filePath, log=sys.stderr)
+        self.assertTrue(state.load(2))
+        refreshMap = state.getRefreshMap(candidateList, termList)
+        mindate = time.strftime("%Y/%m/%d", time.localtime(searchTime - DAY))
+        # Feng+Z[au] belongs to the new entry D_1000000003, Young+JY[au] to the changed entry D_1000000002
+        self.assertEqual(refreshMap, {"Peisach+E[au]": (["30357411"], mindate)})
+        self.assertEqual(state.getStatistics(), {"entry": 3, "new": 1, "changed": 1, "full": 5, "incremental": 1})
+        #
+        state.save(2, time.time(), candidateList, {"Peisach+E[au]": ["31234567", "30357411"]}, set(["Peisach+E[au]"]))
+        state = CitationFinderState(self.__filePath, maxAge=2 * DAY, log=sys.stderr)
+        self.assertTrue(state.load(2))
+        # The last full search of the incrementally searched term is too old
+        self.assertEqual(state.getRefreshMap(candidateList, ["Peisach+E[au]"]), {})
+        self.assertFalse(state.load(3))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -20,11 +20,16 @@ from unittest.mock import patch
 if __package__ is None or __package__ == "":
     sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
     from commonsetup import HERE, TESTOUTPUT  # noqa:  F401 pylint: disable=import-error,unused-import
+    from fakeeutils import FakeEUtilsServer  # pylint: disable=import-error
 else:
     from .commonsetup import HERE, TESTOUTPUT  # noqa: F401 pylint: disable=relative-beyond-top-level
+    from .fakeeutils import FakeEUtilsServer  # pylint: disable=relative-beyond-top-level
 
+from wwpdb.apps.releasemodule.citation.EUtilsClient import EUtilsClient
 from wwpdb.apps.releasemodule.citation.SearchMP import SearchMP
+from wwpdb.apps.releasemodule.citation.SearchUtil import SearchUtil
 from wwpdb.apps.releasemodule.citation.FetchMP import FetchMP
+from wwpdb.apps.releasemodule.citation.FetchUtil import FetchUtil
 
 
 def RunReplace(path, script, log):
@@ -71,6 +76,28 @@ class CitationTests(unittest.TestCase):
         pubmedInfo = pFetch.getPubmedInfoMap()
         self.assertNotEqual(pubmedInfo, {}, "Failed to fetch info from NCBI")
 
+    def testInProcessClient(self):
+        """Test search and fetch against local fake E-utilities server"""
+        server = FakeEUtilsServer(termMap={'Peisach+E[au]': ['30357411', '28190782']}).start()
+        client = EUtilsClient(baseUrl=server.url, backoff=0.0, log=None)
+        try:
+            search = SearchUtil(path=TESTOUTPUT, term='Peisach+E[au]', siteId=self.__siteId, client=client)
+            search.doSearch()
+            self.assertEqual(search.getPubmedIdList(), ['30357411', '28190782'])
+            fetch = FetchUtil(path=TESTOUTPUT, idList=search.getPubmedIdList(), siteId=self.__siteId, client=client)
+            fetch.doFetch()
+            self.assertEqual(sorted(fetch.getPubmedInfoMap().keys()), ['28190782', '30357411'])
+            self.assertEqual(client.getStatistics()['connection'], 1)
+            #
+            idList = ['30357411', '29174494', '28190782', '31234567', '32000001', '99999999']
+            fetch = FetchUtil(path=TESTOUTPUT, idList=idList, siteId=self.__siteId, client=client)
+            fetch.doHistoryFetch(pageSize=2)
+            self.assertEqual(sorted(fetch.getPubmedInfoMap().keys()), sorted(idList[:-1]))
+            self.assertEqual([req[1] for req in server.requestList[-4:]], ['epost.fcgi', 'efetch.fcgi', 'efetch.fcgi', 'efetch.fcgi'])
+        finally:
+            client.close()
+            server.stop()
+
 
 if __name__ == '__main__':
     unittest.main()
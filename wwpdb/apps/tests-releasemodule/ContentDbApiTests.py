@@ -0,0 +1,142 @@
+##
+# File: ContentDbApiTests.py
+# Date:  18-Oct-2026
+#
+# Updates:
+##
+"""Test cases for content database API queries"""
+
+__docformat__ = "restructuredtext en"
+__author__ = "Zukang Feng"
+__email__ = "zfeng@rcsb.rutgers.edu"
+__license__ = "Creative Commons Attribution 3.0 Unported"
+__version__ = "V0.01"
+
+import os
+import unittest
+import sys
+
+if __package__ is None or __package__ == "":
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from commonsetup import HERE, TESTOUTPUT  # noqa:  F401 pylint: disable=import-error,unused-import
+    from fakedb import FakeDbApiUtil, getDbApi  # pylint: disable=import-error
+else:
+    from .commonsetup import HERE, TESTOUTPUT  # noqa: F401 pylint: disable=relative-beyond-top-level
+    from .fakedb import FakeDbApiUtil, getDbApi  # pylint: disable=relative-beyond-top-level
+
+from wwpdb.apps.releasemodule.utils.CombineDbApi import CombineDbApi
+from wwpdb.apps.releasemodule.utils.ContentDbApi import ContentDbApi
+
+
+class ContentDbApiTests(unittest.TestCase):
+    def setUp(self):
+        authorList = [("D_1000000001", "primary", "Peisach, E.", 1), ("D_1000000001", "primary", "Feng, Z.", 2),
+                      ("D_1000000001", "1", "Berman, H.M.", 1), ("D_1000000002", "primary", "Young, J.Y.", 2),
+                      ("D_1000000002", "primary", "Smith Jr, J.-P.", 1), ("D_1000000002", "primary", "van der Berg, A B", 3),
+                      ("D_1000000002", "primary", "Consortium", 4), ("D_1000000003", "primary", "Westbrook, J.", 1),
+                      ("D_1000000005", "primary", "Burley, S.K.", 1)]
+        searchList = [{"structure_id": "D_1000000001", "pdb_id": "1ABC"}, {"structure_id": "D_1000000002", "pdb_id": "2ABC"},
+                      {"structure_id": "D_1000000003"}, {"structure_id": "D_1000000004", "pdb_id": "4ABC"},
+                      {"structure_id": "D_1000000005"}]
+        revisionList = [("D_1000000001", 1, "2025-01-08"), ("D_1000000001", 3, "2026-03-04"), ("D_1000000001", 2, "2025-06-11"),
+                        ("D_1000000002", 1, "2026-02-25"), ("D_1000000005", 1, "2026-01-07")]
+        entryInfoList = [{"structure_id": "D_1000000001", "pdb_id": "1ABC", "date_of_RCSB_release": "2025-01-08"},
+                         {"structure_id": "D_1000000002", "pdb_id": "2ABC"},
+                         {"structure_id": "D_1000000003", "pdb_id": "3ABC", "date_of_RCSB_release": "2025-05-14"},
+                         {"structure_id": "D_1000000004"}, {"structure_id": "D_1000000005", "pdb_id": "5ABC"}]
+        citationList = [{"structure_id": "D_1000000001", "jrnl_serial_no": 1, "title": "Primary title", "publication": "To be published",
+                         "volume_no": None, "year": None, "first_page": None, "last_page": None, "pdbx_database_id_PubMed": None,
+                         "pdbx_database_id_DOI": "10.1002/pro.3530"},
+                        {"structure_id": "D_1000000001", "jrnl_serial_no": 2, "title": "Other title", "publication": "Proteins"},
+                        {"structure_id": "D_1000000002", "jrnl_serial_no": 1, "title": "Second title", "publication": "Protein Sci",
+                         "volume_no": "28", "first_page": "1", "pdbx_database_id_PubMed": "30357411"},
+                        {"structure_id": "D_1000000003", "jrnl_serial_no": 1, "title": "Third title", "year": "2026"},
+                        {"structure_id": "D_1000000004", "jrnl_serial_no": 1, "title": ""}]
+        emInfoList = [{"structure_id": "D_1000000004", "date_of_EM_release": "2025-07-02 00:00:00", "last_EM_release_date": "2026-01-14 00:00:00"}]
+        self.__fakeDb = FakeDbApiUtil(tableMap={"citation_author": [{"structure_id": sid, "citation_id": cid, "name": name, "ordinal": ordinal}
+                                                                    for sid, cid, name, ordinal in authorList],
+                                                "pdbx_audit_revision_history": [{"structure_id": sid, "ordinal": ordinal, "revision_date": date}
+                                                                                for sid, ordinal, date in revisionList],
+                                                "citation": citationList},
+                                      cannedMap={"SELECT_PUBMED_SEARCH_LIST": searchList,
+                                                 "SELECT_ALL_EM_ONLY_ENTRY_BY_STATUS": [{"structure_id": "D_1000000003"}],
+                                                 "SELECT_ENTRY_INFO": entryInfoList, "SELECT_EM_INFO": emInfoList})
+        self.__api = getDbApi(ContentDbApi, self.__fakeDb)
+
+    def testPubmedSearchList(self):
+        """Test primary citation authors of all candidates are read with one query"""
+        rows = self.__api.getPubmedSearchList(year=2)
+        self.assertEqual(len(self.__fakeDb.queryList), 3)
+        self.assertEqual([row["structure_id"] for row in rows], ["D_1000000001", "D_1000000002", "D_1000000004", "D_1000000005"])
+        for row in rows:
+            list1, list2 = self.__api._ContentDbApi__getCitationAuthor(row["structure_id"])  # pylint: disable=protected-access,no-member
+            if list1:
+                self.assertEqual(row["citation_author"], list1)
+                self.assertEqual(row["pubmed_author"], list2)
+            else:
+                self.assertNotIn("citation_author", row)
+                self.assertNotIn("pubmed_author", row)
+        self.assertEqual(rows[1]["citation_author"], ["J.-P.Smith Jr", "J.Y.Young", "A B.van der Berg"])
+        self.assertEqual(rows[1]["pubmed_author"], ["Smith+JP[au]", "Young+JY[au]", "van+der+Berg+AB[au]"])
+        #
+        entryIdList = ["D_1000000001", "D_1000000002", "D_1000000003", "D_1000000005"]
+        self.assertEqual(self.__api._ContentDbApi__getCitationAuthorMap(entryIdList, chunkSize=3),  # pylint: disable=protected-access,no-member
+                         self.__api._ContentDbApi__getCitationAuthorMap(entryIdList))  # pylint: disable=protected-access,no-member
+
+    def testEntryInfo(self):
+        """Test last release dates are read with one grouped query and match the single entry lookup"""
+        rows = self.__api.getEntryInfo("D_1000000001', 'D_1000000002', 'D_1000000003', 'D_1000000004', 'D_1000000005")
+        self.assertEqual(len(self.__fakeDb.queryList), 3)
+        self.assertEqual([(row["structure_id"], row.get("release_dates"), row.get("last_release_date")) for row in rows],
+                         [("D_1000000001", "2025-01-08 / 2026-03-04", "2026-03-04"), ("D_1000000002", "n.a. / 2026-02-25", "2026-02-25"),
+                          ("D_1000000003", "2025-05-14 / n.a.", None), ("D_1000000004", "2025-07-02 / 2026-01-14", "2026-01-14"),
+                          ("D_1000000005", "n.a. / 2026-01-07", "2026-01-07")])
+        #
+        entryIdList = ["D_1000000001", "D_1000000002", "D_1000000003", "D_1000000005"]
+        releaseDateMap = self.__api.getLastReleaseDateMap(entryIdList)
+        self.assertEqual(releaseDateMap, dict([(entryId, self.__api.getLastReleaseDate(entryId)) for entryId in entryIdList
+                                               if self.__api.getLastReleaseDate(entryId)]))
+
+    def testEntryCitationInfoMap(self):
+        """Test primary citations and authors of all entries are read with two queries and match the single entry lookup"""
+        entryIdList = ["D_1000000001", "D_1000000002", "D_1000000003", "D_1000000004", "D_1000000005"]
+        expectedMap = {}
+        for entryId in entryIdList:
+            cInfo = self.__api.getPrimaryCitation(entryId)
+            if not cInfo:
+                continue
+            authorList = self.__api.getPrimaryCitationAuthorList(entryId)
+            if authorList:
+                cInfo["author"] = ", ".join(authorList)
+            expectedMap[entryId] = cInfo
+        self.assertEqual(sorted(expectedMap.keys()), ["D_1000000001", "D_1000000002", "D_1000000003"])
+        #
+        del self.__fakeDb.queryList[:]
+        combineDb = CombineDbApi(siteId="WWPDB_DEPLOY_TEST")
+        combineDb._CombineDbApi__ContentDB = self.__api  # pylint: disable=protected-access,attribute-defined-outside-init
+        self.assertEqual(combineDb.getEntryCitationInfoMap(entryIdList), expectedMap)
+        self.assertEqual(len(self.__fakeDb.queryList), 2)
+
+    def testNotReleasedAssoicatedEmdIdMap(self):
+        """Test associated EMDB IDs of all entries are read with four queries and match the single entry lookup"""
+        database2List = [("D_1000000001", "EMD-1001"), ("D_1000000002", "EMD-1002"), ("D_1000000003", "EMD-1003"),
+                         ("D_1000000011", "EMD-1001"), ("D_1000000012", "EMD-1002"), ("D_1000000013", "EMD-1003")]
+        relatedList = [("D_1000000001", "EMD-1001"), ("D_1000000001", "EMD-1004"), ("D_1000000004", "EMD-1005")]
+        emAdminList = [("D_1000000011", "REL"), ("D_1000000012", "HPUB"), ("D_1000000013", "REL"), ("D_1000000013", "OBS")]
+        fakeDb = FakeDbApiUtil(tableMap={"database_2": [{"Structure_ID": sid, "database_code": code, "database_id": "EMDB"} for sid, code in database2List],
+                                         "pdbx_database_related": [{"Structure_ID": sid, "db_id": code, "db_name": "EMDB",
+                                                                    "content_type": "associated EM volume"} for sid, code in relatedList],
+                                         "em_admin": [{"structure_id": sid, "current_status": status, "map_release_date": None, "last_update": None,
+                                                       "title": None, "author_list": None} for sid, status in emAdminList]})
+        api = getDbApi(ContentDbApi, fakeDb)
+        entryIdList = ["D_1000000001", "D_1000000002", "D_1000000003", "D_1000000004", "D_1000000005"]
+        emdIdListMap = api.getNotReleasedAssoicatedEmdIdMap(entryIdList)
+        self.assertEqual(len(fakeDb.queryList), 4)
+        self.assertEqual(emdIdListMap, {"D_1000000001": ["EMD-1004"], "D_1000000002": ["EMD-1002"], "D_1000000003": ["EMD-1003"],
+                                        "D_1000000004": ["EMD-1005"]})
+        for entryId in entryIdList:
+            self.assertEqual(emdIdListMap.get(entryId, []), api.getNotReleasedAssoicatedEmdId(entryId))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,238 @@
+##
+# File: DbConnectionPoolTests.py
+# Date:  18-Oct-2026
+#
+# Updates:
+##
+"""Test cases for database connection pool"""
+
+__docformat__ = "restructuredtext en"
+__author__ = "Zukang Feng"
+__email__ = "zfeng@rcsb.rutgers.edu"
+__license__ = "Creative Commons Attribution 3.0 Unported"
+__version__ = "V0.01"
+
+import os
+import unittest
+import sys
+
+try:
+    from unittest.mock import patch
+except ImportError:
+    from mock import patch
+
+if __package__ is None or __package__ == "":
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from commonsetup import HERE, TESTOUTPUT  # noqa:  F401 pylint: disable=import-error,unused-import
+else:
+    from .commonsetup import HERE, TESTOUTPUT  # noqa: F401 pylint: disable=relative-beyond-top-level
+
+import wwpdb.apps.releasemodule.utils.DbApiUtil as DbApiUtilModule
+import wwpdb.apps.releasemodule.utils.DbConnectionPool as DbConnectionPoolModule
+from wwpdb.apps.releasemodule.utils.DbApiUtil import DbApiUtil, getBoundQueryList
+from wwpdb.apps.releasemodule.utils.DbConnectionPool import DbConnectionPool, getDbConnectionPool
+from wwpdb.apps.releasemodule.utils.QueryResultCache import QueryResultCache
+
+
+class FakeCursor(object):
+    def __init__(self, dbcon):
+        self.__dbcon = dbcon
+        self.__rowList = []
+
+    def execute(self, query, parameter=None):
+        self.__dbcon.queryList.append(query if parameter is None else (query, parameter))
+        self.__rowList = [{"structure_id": "D_100000000%d" % i, "pdb_id": ""} for i in range(1, self.__dbcon.rowCount + 1)]
+        return 1
+
+    def fetchall(self):
+        rowList, self.__rowList = self.__rowList, []
+        return rowList
+
+    def fetchmany(self, size):
+        if (self.__dbcon.failAt is not None) and (self.__dbcon.rowCount - len(self.__rowList) >= self.__dbcon.failAt):
+            raise DbApiUtilModule.MySQLdb.Error(2013, "Lost connection to MySQL server during query")
+        rowList, self.__rowList = self.__rowList[:size], self.__rowList[size:]
+        return rowList
+
+    def close(self):
+        pass
+
+
+class FakeConnection(object):
+    def __init__(self, alive=True):
+        self.alive = alive
+        self.closed = False
+        self.queryList = []
+        self.rowCount = 1
+        # Number of rows read before the connection is lost, None for never
+        self.failAt = None
+
+    def ping(self):
+        if not self.alive:
+            raise IOError("connection lost")
+
+    def cursor(self, *args):  # pylint: disable=unused-argument
+        return FakeCursor(self)
+
+    def commit(self):
+        pass
+
+    def rollback(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+
+class FakeDbConnection(object):
+    connectionList = []
+
+    def __init__(self, **kwargs):
+        pass
+
+    def connect(self):
+        dbcon = FakeConnection()
+        FakeDbConnection.connectionList.append(dbcon)
+        return dbcon
+
+
+class DbConnectionPoolTests(unittest.TestCase):
+    def testReuse(self):
+        """Test idle connections are reused per key, checked after a while and evicted"""
+        pool = DbConnectionPool(maxIdle=1, checkInterval=0.0)
+        dbcon1 = pool.getConnection("a", FakeConnection)
+        dbcon2 = pool.getConnection("a", FakeConnection)
+        self.assertIsNot(dbcon1, dbcon2)
+        pool.releaseConnection("a", dbcon1)
+        pool.releaseConnection("a", dbcon2)
+        # Only maxIdle connections are kept
+        self.assertTrue(dbcon2.closed)
+        self.assertIs(pool.getConnection("a", FakeConnection), dbcon1)
+        self.assertIsNot(pool.getConnection("b", FakeConnection), dbcon1)
+        # A connection that fails the health check is replaced
+        pool.releaseConnection("a", dbcon1)
+        dbcon1.alive = False
+        dbcon3 = pool.getConnection("a", FakeConnection)
+        self.assertIsNot(dbcon3, dbcon1)
+        self.assertTrue(dbcon1.closed)
+        #
+        pool = DbConnectionPool(idleTimeout=-1.0)
+        pool.releaseConnection("a", dbcon3)
+        self.assertIsNot(pool.getConnection("a", FakeConnection), dbcon3)
+        self.assertTrue(dbcon3.closed)
+        self.assertEqual(pool.getStatistics()["evict"], 1)
+
+    def testFork(self):
+        """Test a forked process gets its own pool and leaves the inherited connections alone"""
+        pool = getDbConnectionPool()
+        dbcon = FakeConnection()
+        pool.releaseConnection("a", dbcon)
+        self.assertIs(getDbConnectionPool(), pool)
+        with patch.object(DbConnectionPoolModule.os, "getpid", lambda: -1):
+            childPool = getDbConnectionPool()
+            self.assertIsNot(childPool, pool)
+            self.assertIsNot(childPool.getConnection("a", FakeConnection), dbcon)
+        self.assertFalse(dbcon.closed)
+        pool.clear()
+
+    def testDbApiUtil(self):
+        """Test DbApiUtil instances share pooled connections"""
+        FakeDbConnection.connectionList = []
+        getDbConnectionPool().clear()
+        with patch.object(DbApiUtilModule, "DbConnection", FakeDbConnection):
+            dbApi1 = DbApiUtil(dbServer="mysql", dbHost="localhost", dbName="da_internal", dbUser="user", dbPort=3306)
+            dbApi2 = DbApiUtil(dbServer="mysql", dbHost="localhost", dbName="da_internal", dbUser="user", dbPort=3306)
+            self.assertEqual(dbApi1.runSelectSQL("select 1"), [{"structure_id": "D_1000000001"}])
+            self.assertEqual(dbApi2.runUpdateSQL("update rcsb_status set pdb_id = '1ABC'"), "OK")
+            dbApi3 = DbApiUtil(dbServer="mysql", dbHost="localhost", dbName="status", dbUser="user", dbPort=3306)
+            dbApi3.runSelectSQL("select 2")
+        self.assertEqual(len(FakeDbConnection.connectionList), 2)
+        self.assertEqual(FakeDbConnection.connectionList[0].queryList,
+                         ["select 1", "set autocommit=0", "update rcsb_status set pdb_id = '1ABC'", "set autocommit=1"])
+        getDbConnectionPool().clear()
+
+    def testQueryCache(self):
+        """Test cached results are dropped by any update through the same object"""
+        getDbConnectionPool().clear()
+        with patch.object(DbApiUtilModule, "DbConnection", FakeDbConnection):
+            dbApi = DbApiUtil(dbServer="mysql", dbHost="localhost", dbName="da_internal", dbUser="user", dbPort=3306)
+            queryCache = QueryResultCache()
+            dbApi.setSchemaMap({"SELECT_STATUS": "select structure_id, pdb_id from rcsb_status where structure_id = '%s'"})
+            dbApi.setQueryCache(queryCache)
+            dbApi.selectData(key="SELECT_STATUS", parameter=("D_1000000001"))
+            dbApi.selectData(key="SELECT_STATUS", parameter=("D_1000000001"))
+            dbApi.runUpdateSQL("update rcsb_status set pdb_id = '1ABC'")
+            self.assertEqual(dbApi.selectData(key="SELECT_STATUS", parameter=("D_1000000001")), [{"structure_id": "D_1000000001"}])
+            self.assertEqual(queryCache.getStatistics(), {"hit": 1, "miss": 2, "evict": 0, "invalidate": 1, "size": 1})
+        getDbConnectionPool().clear()
+
+    def testBoundQuery(self):
+        """Test list parameters are expanded to one bind marker per value and split into chunks"""
+        sql = "select structure_id from citation where structure_id in ( %s ) and jrnl_serial_no = %s"
+        self.assertEqual(getBoundQueryList(sql, (["D_1", "D_2", "D_3"], 1)),
+                         [("select structure_id from citation where structure_id in ( %s, %s, %s ) and jrnl_serial_no = %s",
+                           ("D_1", "D_2", "D_3", 1))])
+        self.assertEqual(getBoundQueryList(sql, (set(["D_3", "D_1", "D_2"]), 1), chunkSize=2),
+                         [("select structure_id from citation where structure_id in ( %s, %s ) and jrnl_serial_no = %s", ("D_1", "D_2", 1)),
+                          ("select structure_id from citation where structure_id in ( %s ) and jrnl_serial_no = %s", ("D_3", 1))])
+        self.assertEqual(getBoundQueryList(sql, ([], 1)),
+                         [("select structure_id from citation where structure_id in ( NULL ) and jrnl_serial_no = %s", (1,))])
+        self.assertEqual(getBoundQueryList("select 1 from rcsb_status where pdb_id = %s", "1ABC"),
+                         [("select 1 from rcsb_status where pdb_id = %s", ("1ABC",))])
+        self.assertRaises(ValueError, getBoundQueryList, sql, (["D_1"],))
+
+    def testIterBoundData(self):
+        """Test bound queries are run in chunks and streamed rows are read in batches"""
+        FakeDbConnection.connectionList = []
+        getDbConnectionPool().clear()
+        with patch.object(DbApiUtilModule, "DbConnection", FakeDbConnection):
+            dbApi = DbApiUtil(dbServer="mysql", dbHost="localhost", dbName="da_internal", dbUser="user", dbPort=3306)
+            dbApi.setSchemaMap({"SELECT_STATUS": "select structure_id, pdb_id from rcsb_status where structure_id in ( %s )",
+                                "SELECT_ALL_STATUS": "select structure_id, pdb_id from rcsb_status where status_code = %s"})
+            dbcon = FakeDbConnection.connectionList[0]
+            self.assertEqual(dbApi.selectBoundData(key="SELECT_STATUS", parameter=(["D_1", "D_2", "D_3"],), chunkSize=2),
+                             [{"structure_id": "D_1000000001"}, {"structure_id": "D_1000000001"}])
+            self.assertEqual(dbcon.queryList[-2:],
+                             [("select structure_id, pdb_id from rcsb_status where structure_id in ( %s, %s )", ("D_1", "D_2")),
+                              ("select structure_id, pdb_id from rcsb_status where structure_id in ( %s )", ("D_3",))])
+            dbcon.rowCount = 5
+            self.assertEqual([row["structure_id"] for row in dbApi.iterBoundData(key="SELECT_ALL_STATUS", parameter=("REL",), arraysize=2)],
+                             ["D_100000000%d" % i for i in range(1, 6)])
+            self.assertEqual(getDbConnectionPool().getConnection(dbApi._DbApiUtil__poolKey, None), dbcon)  # pylint: disable=protected-access,no-member
+            getDbConnectionPool().releaseConnection(dbApi._DbApiUtil__poolKey, dbcon)  # pylint: disable=protected-access,no-member
+            # A connection with unread rows of an abandoned iteration is not reused
+            rowIter = dbApi.iterBoundData(key="SELECT_ALL_STATUS", parameter=("REL",), arraysize=2)
+            next(rowIter)
+            rowIter.close()
+            self.assertTrue(dbcon.closed)
+        getDbConnectionPool().clear()
+
+    def testIterBoundDataError(self):
+        """Test a lost connection is re-connected before the first row and raised after rows have been returned"""
+        FakeDbConnection.connectionList = []
+        getDbConnectionPool().clear()
+        with patch.object(DbApiUtilModule, "DbConnection", FakeDbConnection), patch.object(DbApiUtilModule.time, "sleep"), \
+                open(os.devnull, "w") as lfh:
+            dbApi = DbApiUtil(dbServer="mysql", dbHost="localhost", dbName="da_internal", dbUser="user", dbPort=3306, log=lfh)
+            dbApi.setSchemaMap({"SELECT_ALL_STATUS": "select structure_id, pdb_id from rcsb_status where status_code = %s"})
+            dbcon = FakeDbConnection.connectionList[0]
+            dbcon.failAt = 0
+            self.assertEqual(list(dbApi.iterBoundData(key="SELECT_ALL_STATUS", parameter=("REL",))), [{"structure_id": "D_1000000001"}])
+            self.assertTrue(dbcon.closed)
+            self.assertEqual(len(FakeDbConnection.connectionList), 2)
+            #
+            dbcon = FakeDbConnection.connectionList[1]
+            dbcon.rowCount = 5
+            dbcon.failAt = 2
+            rowList = []
+            with self.assertRaises(DbApiUtilModule.MySQLdb.Error):
+                for row in dbApi.iterBoundData(key="SELECT_ALL_STATUS", parameter=("REL",), arraysize=2):
+                    rowList.append(row["structure_id"])
+            self.assertEqual(rowList, ["D_1000000001", "D_1000000002"])
+            self.assertTrue(dbcon.closed)
+            self.assertEqual(len(FakeDbConnection.connectionList), 2)
+        getDbConnectionPool().clear()
+
+
+if __name__ == '__main__':
+    unittest.main()
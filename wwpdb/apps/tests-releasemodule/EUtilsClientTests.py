@@ -0,0 +1,105 @@
+##
+# File: EUtilsClientTests.py
+# Date:  18-Oct-2026
+#
+# Updates:
+##
+"""Test cases for in-process NCBI E-utilities client"""
+
+__docformat__ = "restructuredtext en"
+__author__ = "Zukang Feng"
+__email__ = "zfeng@rcsb.rutgers.edu"
+__license__ = "Creative Commons Attribution 3.0 Unported"
+__version__ = "V0.01"
+
+import os
+import unittest
+import sys
+
+if __package__ is None or __package__ == "":
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from commonsetup import HERE, TESTOUTPUT  # noqa:  F401 pylint: disable=import-error,unused-import
+    from fakeeutils import FakeEUtilsServer, EFETCHFILE  # pylint: disable=import-error
+else:
+    from .commonsetup import HERE, TESTOUTPUT  # noqa: F401 pylint: disable=relative-beyond-top-level
+    from .fakeeutils import FakeEUtilsServer, EFETCHFILE  # pylint: disable=relative-beyond-top-level
+
+from wwpdb.apps.releasemodule.citation.EUtilsClient import EUtilsClient
+from wwpdb.apps.releasemodule.citation.FetchResultParser import FetchResultParser
+from wwpdb.apps.releasemodule.citation.SearchResultParser import SearchResultParser
+from wwpdb.apps.releasemodule.utils.MultiProcLimit import MultiProcLimit
+
+
+class EUtilsClientTests(unittest.TestCase):
+    def setUp(self):
+        self.__termMap = {'Peisach+E[au]': ['30357411', '28190782'], '10.1002/pro.3530[aid]': ['30357411']}
+        self.__server = FakeEUtilsServer(termMap=self.__termMap).start()
+        self.__client = EUtilsClient(baseUrl=self.__server.url, backoff=0.0, log=None)
+
+    def tearDown(self):
+        self.__client.close()
+        self.__server.stop()
+
+    def testSearch(self):
+        """Test esearch response is parsed from memory"""
+        data = self.__client.esearch('Peisach+E[au]', reldate=730, retmax=10000)
+        self.assertEqual(SearchResultParser(xmldata=data).getIdList(), ['30357411', '28190782'])
+        data = self.__client.esearch('10.1002/pro.3530[aid]')
+        self.assertEqual(SearchResultParser(xmldata=data).getIdList(), ['30357411'])
+        _method, utility, params = self.__server.requestList[0]
+        self.assertEqual(utility, 'esearch.fcgi')
+        self.assertEqual(params['reldate'], '730')
+
+    def testFetch(self):
+        """Test efetch result from memory matches the file based parser"""
+        idList = ['30357411', '29174494', '28190782', '31234567', '32000001']
+        expected = FetchResultParser(xmlfile=EFETCHFILE).getPubmedInfoList()
+        data = self.__client.efetch(idList)
+        self.assertEqual(FetchResultParser(xmldata=data).getPubmedInfoList(), expected)
+        data = self.__client.efetch(idList, post=True)
+        self.assertEqual(FetchResultParser(xmldata=data).getPubmedInfoList(), expected)
+        self.assertEqual(self.__server.requestList[-1][0], 'POST')
+
+    def testHistoryFetch(self):
+        """Test epost and paged efetch from history server"""
+        idList = ['30357411', '29174494', '28190782', '31234567', '32000001']
+        webEnv, queryKey = self.__client.epost(idList)
+        self.assertTrue(webEnv)
+        self.assertEqual(queryKey, '1')
+        infoList = []
+        for retstart in range(0, len(idList), 2):
+            data = self.__client.efetchHistory(webEnv, queryKey, retstart=retstart, retmax=2)
+            infoList.extend(FetchResultParser(xmldata=data).getPubmedInfoList())
+        self.assertEqual(infoList, FetchResultParser(xmlfile=EFETCHFILE).getPubmedInfoList())
+        self.assertEqual([req[1] for req in self.__server.requestList], ['epost.fcgi', 'efetch.fcgi', 'efetch.fcgi', 'efetch.fcgi'])
+
+    def testKeepAlive(self):
+        """Test connection is reused across requests"""
+        for _i in range(5):
+            self.assertIsNotNone(self.__client.esearch('Peisach+E[au]'))
+        self.assertEqual(self.__client.getStatistics()['connection'], 1)
+        self.assertEqual(len(self.__server.connectionSet), 1)
+
+    def testRetry(self):
+        """Test rate limited requests are retried and exhausted retries return None"""
+        self.__server.failCount = 2
+        self.assertIsNotNone(self.__client.esearch('Peisach+E[au]'))
+        self.assertEqual(self.__client.getStatistics()['retry'], 2)
+        self.__server.failCount = 100
+        self.assertIsNone(self.__client.esearch('Peisach+E[au]'))
+        self.assertEqual(self.__client.getStatistics()['failure'], 1)
+
+    def testRateLimiter(self):
+        """Test every attempt goes through the limiter and rate limit errors slow it down"""
+        mpl = MultiProcLimit(20, minRate=5)
+        self.__server.failCount = 2
+        self.assertIsNotNone(self.__client.esearch('Peisach+E[au]', limiter=mpl))
+        self.assertEqual(self.__client.getStatistics()['throttled'], 2)
+        statistics = mpl.getStatistics()
+        self.assertEqual(statistics['request'], 3)
+        self.assertEqual(statistics['throttled'], 2)
+        self.assertEqual(mpl.getRate(), 5)
+
+
+if __name__ == '__main__':
+    unittest.main()
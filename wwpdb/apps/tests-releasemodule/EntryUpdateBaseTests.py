@@ -0,0 +1,69 @@
+##
+# File: EntryUpdateBaseTests.py
+# Date:  18-Oct-2026
+#
+# Updates:
+##
+"""Test cases for running the release steps of an entry"""
+
+__docformat__ = "restructuredtext en"
+__author__ = "Zukang Feng"
+__email__ = "zfeng@rcsb.rutgers.edu"
+__license__ = "Creative Commons Attribution 3.0 Unported"
+__version__ = "V0.01"
+
+import os
+import threading
+import unittest
+import sys
+
+if __package__ is None or __package__ == "":
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from commonsetup import HERE, TESTOUTPUT  # noqa:  F401 pylint: disable=import-error,unused-import
+else:
+    from .commonsetup import HERE, TESTOUTPUT  # noqa: F401 pylint: disable=relative-beyond-top-level
+
+from wwpdb.apps.releasemodule.update.EntryUpdateBase import EntryUpdateBase
+from wwpdb.apps.releasemodule.update.ReleaseStepGraph import ReleaseStepGraph
+
+
+class EntryUpdateBaseTests(unittest.TestCase):
+    def setUp(self):
+        # Only the bookkeeping used by _runStepGraph(), the constructor needs a full site setup
+        self.__entryUpdate = EntryUpdateBase.__new__(EntryUpdateBase)
+        self.__entryUpdate._actionList = []  # pylint: disable=protected-access
+        self.__entryUpdate._EntryUpdateBase__stepRecord = threading.local()  # pylint: disable=protected-access
+
+    def __getStep(self, name, error=False):
+        def step():
+            self.__entryUpdate._insertAction("start " + name)  # pylint: disable=protected-access
+            if error:
+                raise IOError("step %s failed" % name)
+            self.__entryUpdate._insertAction("end " + name)  # pylint: disable=protected-access
+        return step
+
+    def __getActionList(self):
+        return [actionDict["action"] for actionDict in self.__entryUpdate._actionList]  # pylint: disable=protected-access
+
+    def __run(self, maxWorkers, errorStep=None):
+        stepGraph = ReleaseStepGraph(maxWorkers=maxWorkers)
+        stepGraph.addStep("cif", self.__getStep("cif"))
+        stepGraph.addStep("xml", self.__getStep("xml", error=(errorStep == "xml")), dependList=["cif"])
+        stepGraph.addStep("misc", self.__getStep("misc"), dependList=["xml"])
+        self.__entryUpdate._runStepGraph(stepGraph)  # pylint: disable=protected-access
+
+    def testRun(self):
+        """Test the recorded actions are applied in step order"""
+        self.__run(2)
+        self.assertEqual(self.__getActionList(), ["start cif", "end cif", "start xml", "end xml", "start misc", "end misc"])
+
+    def testError(self):
+        """Test the actions of the steps finished before a failed step are applied and the failure is raised again"""
+        for maxWorkers in (1, 2):
+            self.__entryUpdate._actionList = []  # pylint: disable=protected-access
+            self.assertRaises(IOError, self.__run, maxWorkers, errorStep="xml")
+            self.assertEqual(self.__getActionList(), ["start cif", "end cif"])
+
+
+if __name__ == '__main__':
+    unittest.main()
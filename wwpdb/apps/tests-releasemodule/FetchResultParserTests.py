@@ -0,0 +1,107 @@
+##
+# File: FetchResultParserTests.py
+# Date:  18-Oct-2026
+#
+# Updates:
+##
+"""Regression test cases for streaming Pubmed efetch result parser"""
+
+__docformat__ = "restructuredtext en"
+__author__ = "Zukang Feng"
+__email__ = "zfeng@rcsb.rutgers.edu"
+__license__ = "Creative Commons Attribution 3.0 Unported"
+__version__ = "V0.01"
+
+import json
+import os
+import unicodedata
+import unittest
+import sys
+import xml.etree.ElementTree as ET
+
+if __package__ is None or __package__ == "":
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from commonsetup import HERE, TESTOUTPUT  # noqa:  F401 pylint: disable=import-error,unused-import
+else:
+    from .commonsetup import HERE, TESTOUTPUT  # noqa: F401 pylint: disable=relative-beyond-top-level
+
+from wwpdb.apps.releasemodule.citation.FetchResultParser import FetchResultParser, UniCodeHandler
+
+DATADIR = os.path.join(os.path.abspath(os.path.dirname(__file__)), "data")
+
+
+def referenceProcess(handler, input_data, angstromFlag):
+    """Character by character implementation UniCodeHandler.process() used to have, kept for comparison"""
+    if not input_data:
+        return input_data
+    mappingList = [handler._UniCodeHandler__unicodeMapping]  # pylint: disable=protected-access
+    if angstromFlag:
+        mappingList.append(handler._UniCodeHandler__unicodeAngstromMapping)  # pylint: disable=protected-access
+    else:
+        mappingList.append(handler._UniCodeHandler__unicodeLetterAMapping)  # pylint: disable=protected-access
+    data = input_data
+    for mapping in mappingList:
+        out = ""
+        for c in data:
+            out += mapping.get(c, c)
+        data = out
+    data = unicodedata.normalize("NFKD", data).encode("ascii", "xmlcharrefreplace").decode("ascii")
+    data = data.replace("  ", " ").replace(" .", ".").strip()
+    for word in handler._UniCodeHandler__greekLetter:  # pylint: disable=protected-access
+        data = data.replace("- " + word, "-" + word)
+        data = data.replace(word + " -", word + "-")
+    return data
+
+
+class FetchResultParserTests(unittest.TestCase):
+    def setUp(self):
+        with open(os.path.join(DATADIR, "pubmed_efetch_expected.json")) as fin:
+            self.__expectedMap = json.load(fin)
+
+    def testRegressionCorpus(self):
+        """Test parsed dictionaries match the recorded output for file and in-memory input"""
+        for fileName, expected in self.__expectedMap.items():
+            xmlfile = os.path.join(DATADIR, fileName)
+            self.assertEqual(FetchResultParser(xmlfile=xmlfile).getPubmedInfoList(), expected, fileName)
+            with open(xmlfile, "rb") as fin:
+                data = fin.read()
+            self.assertEqual(FetchResultParser(xmldata=data).getPubmedInfoList(), expected, fileName)
+            self.assertEqual(FetchResultParser(xmldata=data.decode("utf-8")).getPubmedInfoList(), expected, fileName)
+
+    def testStream(self):
+        """Test generator returns the same dictionaries one article at a time"""
+        xmlfile = os.path.join(DATADIR, "pubmed_efetch_edge.xml")
+        parser = FetchResultParser(xmlfile=xmlfile, stream=True)
+        self.assertEqual(parser.getPubmedInfoList(), [])
+        self.assertEqual(list(parser.iterPubmedInfo()), self.__expectedMap["pubmed_efetch_edge.xml"])
+
+    def testTruncated(self):
+        """Test truncated response returns empty list while the generator raises after complete articles"""
+        with open(os.path.join(DATADIR, "pubmed_efetch.xml"), "rb") as fin:
+            data = fin.read()
+        data = data[:data.rfind(b"</PubmedArticle>") - 10]
+        self.assertEqual(FetchResultParser(xmldata=data).getPubmedInfoList(), [])
+        infoList = []
+        with self.assertRaises(Exception):
+            for info in FetchResultParser(xmldata=data, stream=True).iterPubmedInfo():
+                infoList.append(info)
+        self.assertTrue(infoList)
+
+    def testUniCodeHandler(self):
+        """Test table driven normalization against the reference implementation on efetch text"""
+        textList = []
+        for fileName in sorted(self.__expectedMap.keys()):
+            for elem in ET.parse(os.path.join(DATADIR, fileName)).iter():
+                textList.extend([text for text in (elem.text, elem.tail) if text and text.strip()])
+        textList.extend(["\u00C5ngstr\u00F6m resolution of \u03B1 - helix", "Na(+) - beta -  sheet  .", "\u212B cryo - EM  map", ""])
+        handler = UniCodeHandler()
+        for text in textList:
+            for flag in (True, False):
+                self.assertEqual(handler.process(text, flag), referenceProcess(handler, text, flag), text)
+        self.assertEqual(handler.process("Na(+) - beta -  sheet  .", False), "Na(+) -beta- sheet.")
+        self.assertEqual(handler.process("\u212B cryo - EM  map", True), "angstrom cryo - EM map")
+        self.assertEqual(handler.process("\u212B cryo - EM  map", False), "A cryo - EM map")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,80 @@
+##
+# File: GzipUtilTests.py
+# Date:  18-Oct-2026
+#
+# Updates:
+##
+"""Test cases for multithreaded block gzip compression"""
+
+__docformat__ = "restructuredtext en"
+__author__ = "Zukang Feng"
+__email__ = "zfeng@rcsb.rutgers.edu"
+__license__ = "Creative Commons Attribution 3.0 Unported"
+__version__ = "V0.01"
+
+import gzip
+import os
+import random
+import shutil
+import unittest
+import sys
+
+try:
+    from unittest.mock import patch
+except ImportError:
+    from mock import patch
+
+if __package__ is None or __package__ == "":
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from commonsetup import HERE, TESTOUTPUT  # noqa:  F401 pylint: disable=import-error,unused-import
+else:
+    from .commonsetup import HERE, TESTOUTPUT  # noqa: F401 pylint: disable=relative-beyond-top-level
+
+import wwpdb.apps.releasemodule.utils.GzipUtil as GzipUtilModule
+from wwpdb.apps.releasemodule.utils.GzipUtil import gzipFile
+
+
+class GzipUtilTests(unittest.TestCase):
+    def setUp(self):
+        self.__path = os.path.join(TESTOUTPUT, "gzip-util")
+        if os.path.exists(self.__path):
+            shutil.rmtree(self.__path)
+        os.makedirs(self.__path)
+        rand = random.Random(1)
+        self.__data = b"".join([b"ATOM %6d  CA  ALA A %4d    %8.3f%8.3f%8.3f\n" % (i, i % 1000, rand.random(), rand.random(), rand.random())
+                                for i in range(20000)])
+        self.__sourceFile = os.path.join(self.__path, "1abc.cif")
+        with open(self.__sourceFile, "wb") as ofh:
+            ofh.write(self.__data)
+
+    def tearDown(self):
+        shutil.rmtree(self.__path)
+
+    def __read(self, fileName):
+        with gzip.open(fileName, "rb") as ifh:
+            return ifh.read()
+
+    def testParallel(self):
+        """Test blocks compressed in parallel give one standard gzip member with the original file name"""
+        targetFile = os.path.join(self.__path, "1abc.cif.gz")
+        gzipFile(self.__sourceFile, targetFile, level=6, threads=3, blockSize=65536)
+        self.assertEqual(self.__read(targetFile), self.__data)
+        with open(targetFile, "rb") as ifh:
+            self.assertEqual(ifh.read(19)[10:], b"1abc.cif\000")
+        #
+        serialFile = os.path.join(self.__path, "serial.cif.gz")
+        gzipFile(self.__sourceFile, serialFile, level=6, threads=1)
+        self.assertEqual(self.__read(serialFile), self.__data)
+        self.assertLess(os.path.getsize(targetFile), os.path.getsize(serialFile) * 1.02)
+
+    def testFallback(self):
+        """Test a failure of the parallel path falls back to the gzip module"""
+        targetFile = os.path.join(self.__path, "1abc.cif.gz")
+        with open(os.devnull, "w") as lfh:
+            with patch.object(GzipUtilModule, "_deflateBlock", side_effect=MemoryError):
+                gzipFile(self.__sourceFile, targetFile, threads=2, blockSize=65536, log=lfh)
+        self.assertEqual(self.__read(targetFile), self.__data)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,98 @@
+##
+# File: MatchUtilTests.py
+# Date:  18-Oct-2026
+#
+# Updates:
+##
+"""Test cases for citation title matching"""
+
+__docformat__ = "restructuredtext en"
+__author__ = "Zukang Feng"
+__email__ = "zfeng@rcsb.rutgers.edu"
+__license__ = "Creative Commons Attribution 3.0 Unported"
+__version__ = "V0.01"
+
+import os
+import random
+import unittest
+import sys
+
+if __package__ is None or __package__ == "":
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from commonsetup import HERE, TESTOUTPUT  # noqa:  F401 pylint: disable=import-error,unused-import
+    from fakeeutils import EFETCHFILE  # pylint: disable=import-error
+else:
+    from .commonsetup import HERE, TESTOUTPUT  # noqa: F401 pylint: disable=relative-beyond-top-level
+    from .fakeeutils import EFETCHFILE  # pylint: disable=relative-beyond-top-level
+
+from wwpdb.apps.releasemodule.citation.FetchResultParser import FetchResultParser
+from wwpdb.apps.releasemodule.citation.MatchMP import MatchMP
+from wwpdb.apps.releasemodule.citation.MatchUtil import MatchUtil
+from wwpdb.apps.releasemodule.citation.StringUtil import calStringSimilarity
+
+WORDS = ["structure", "crystal", "of", "the", "protein", "complex", "binding", "domain", "cryo-EM", "mechanism",
+         "human", "receptor", "inhibitor", "kinase", "bacterial", "enzyme", "reveals", "insights", "into", "and"]
+WORDS += ["".join([random.Random(i).choice("abcdefghijklmnopqrstuvwxyz") for _j in range(4 + i % 9)]) for i in range(300)]
+
+
+class MatchUtilTests(unittest.TestCase):
+    def setUp(self):
+        rand = random.Random(1307)
+        titleList = [info["title"] for info in FetchResultParser(xmlfile=EFETCHFILE).getPubmedInfoList() if "title" in info]
+        for _i in range(40):
+            titleList.append(" ".join([rand.choice(WORDS) for _j in range(rand.randint(4, 14))]))
+        #
+        self.__pubmedInfo = {}
+        for i in range(600):
+            title = rand.choice(titleList)
+            words = title.split(" ")
+            for _j in range(rand.randint(0, len(words))):
+                words[rand.randrange(len(words))] = rand.choice(WORDS)
+            self.__pubmedInfo[str(1000000 + i)] = {"title": " ".join(words)}
+        self.__pubmedInfo["2000000"] = {"title": ""}
+        #
+        idList = sorted(self.__pubmedInfo.keys())
+        self.__termMap = {}
+        for i in range(30):
+            self.__termMap["Author%d+A[au]" % i] = rand.sample(idList, 150)
+        #
+        self.__entryList = []
+        for i in range(120):
+            self.__entryList.append({"structure_id": "D_%010d" % i, "rcsb_annotator": "AN", "c_title": rand.choice(titleList),
+                                     "pubmed_author": rand.sample(sorted(self.__termMap.keys()), 3) + ["Unknown+U[au]"]})
+        # group deposition
+        for i in range(120, 160):
+            entry = dict(self.__entryList[0])
+            entry["structure_id"] = "D_%010d" % i
+            self.__entryList.append(entry)
+
+    def __getMatchMap(self):
+        matchMap = {}
+        for entry in self.__entryList:
+            mUtil = MatchUtil(entry=entry, termMap=self.__termMap, pubmedInfo=self.__pubmedInfo)
+            mUtil.run()
+            mlist = mUtil.getMatchList()
+            if mlist:
+                matchMap[entry["structure_id"]] = mlist
+        return matchMap
+
+    def testMatchList(self):
+        """Test the batch scorer with cutoff gives the match lists of the pairwise similarity"""
+        matchMap = self.__getMatchMap()
+        self.assertTrue(matchMap)
+        for entry in self.__entryList:
+            idSet = set()
+            for term in entry["pubmed_author"]:
+                idSet.update(self.__termMap.get(term, []))
+            expected = sorted([p_id for p_id in idSet if calStringSimilarity(entry["c_title"], self.__pubmedInfo[p_id]["title"]) >= 0.5])
+            self.assertEqual(sorted([p_id for p_id, _sim in matchMap.get(entry["structure_id"], [])]), expected)
+
+    def testMatchMP(self):
+        """Test multiprocess matching with group depositions matched once"""
+        mp = MatchMP(entryList=self.__entryList, termMap=self.__termMap, pubmedInfo=self.__pubmedInfo)
+        mp.run()
+        self.assertEqual(mp.getMatchResultMap(), self.__getMatchMap())
+
+
+if __name__ == '__main__':
+    unittest.main()
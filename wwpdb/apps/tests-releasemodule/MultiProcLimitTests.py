@@ -4,8 +4,10 @@
 """Tests for `testdevel` package."""
 
 
+import asyncio
 import unittest
 import logging
+import threading
 import time
 
 from rcsb.utils.multiproc.MultiProcUtil import MultiProcUtil
@@ -64,6 +66,81 @@ class TestMultiProcLimit(unittest.TestCase):
         self.assertTrue(ok)
         end = time.time()
         self.assertGreater(end - start, exptime, 'Test ran in %s which is too fast' % (end - start))
+        # Workers wait for their slot concurrently and the rate is met steadily
+        statistics = mpl.getStatistics()
+        self.assertEqual(statistics['request'], len(dataList))
+        self.assertLess(statistics['achievedRate'], rateLimit)
+        self.assertGreater(statistics['achievedRate'], rateLimit * 0.95)
+
+    def test_001_threads_burst(self):
+        """Test saved up tokens let a burst through, then the rate applies"""
+        rateLimit = 20
+        burst = 5
+        mpl = MultiProcLimit(rateLimit, burst=burst)
+        time.sleep(0.3)
+        fireList = []
+        lock = threading.Lock()
+
+        def worker():
+            for _i in range(3):
+                mpl.waitnext()
+                with lock:
+                    fireList.append(time.time())
+
+        start = time.time()
+        threads = [threading.Thread(target=worker) for _i in range(5)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        fireList.sort()
+        self.assertEqual(len(fireList), 15)
+        # 15 requests: burst goes out at once, the other 10 are paced
+        self.assertLess(fireList[burst - 1] - start, 0.1)
+        self.assertGreater(fireList[-1] - start, (15 - burst) / rateLimit)
+        self.assertLess(fireList[-1] - start, (15 - burst) / rateLimit + 0.3)
+
+    def test_002_asyncio(self):
+        """Test the limiter paces asyncio tasks through reserve()"""
+        rateLimit = 20
+        mpl = MultiProcLimit(rateLimit)
+
+        async def task():
+            await asyncio.sleep(mpl.reserve())
+            return time.time()
+
+        async def runAll():
+            return await asyncio.gather(*[task() for _i in range(11)])
+
+        loop = asyncio.new_event_loop()
+        try:
+            start = time.time()
+            fireList = sorted(loop.run_until_complete(runAll()))
+        finally:
+            loop.close()
+        self.assertGreater(fireList[-1] - start, 10.0 / rateLimit)
+        self.assertGreater(mpl.getStatistics()['waitMax'], 0.45)
+
+    def test_003_adaptive(self):
+        """Test throttling pauses all callers and halves the rate, successes bring it back"""
+        rateLimit = 10
+        mpl = MultiProcLimit(rateLimit, minRate=2)
+        mpl.waitnext()
+        mpl.throttled(retryAfter=0.5)
+        self.assertEqual(mpl.getRate(), 5)
+        self.assertGreater(mpl.reserve(), 0.45)
+        mpl.throttled()
+        mpl.throttled()
+        self.assertEqual(mpl.getRate(), 2)
+        self.assertEqual(mpl.getStatistics()['throttled'], 3)
+        for _i in range(20):
+            mpl.succeeded()
+        self.assertEqual(mpl.getRate(), rateLimit)
+        # Not adaptive: only the pause applies
+        mpl = MultiProcLimit(rateLimit, adaptive=False)
+        mpl.throttled(retryAfter=0.2)
+        self.assertEqual(mpl.getRate(), rateLimit)
+        self.assertGreater(mpl.reserve(), 0.15)
 
 
 if __name__ == '__main__':
@@ -0,0 +1,125 @@
+##
+# File: PubmedCacheTests.py
+# Date:  18-Oct-2026
+#
+# Updates:
+##
+"""Test cases for persistent pubmed search/fetch cache"""
+
+__docformat__ = "restructuredtext en"
+__author__ = "Zukang Feng"
+__email__ = "zfeng@rcsb.rutgers.edu"
+__license__ = "Creative Commons Attribution 3.0 Unported"
+__version__ = "V0.01"
+
+import os
+import unittest
+import sys
+
+if __package__ is None or __package__ == "":
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from commonsetup import HERE, TESTOUTPUT  # noqa:  F401 pylint: disable=import-error,unused-import
+    from fakeeutils import FakeEUtilsServer, EFETCHFILE  # pylint: disable=import-error
+else:
+    from .commonsetup import HERE, TESTOUTPUT  # noqa: F401 pylint: disable=relative-beyond-top-level
+    from .fakeeutils import FakeEUtilsServer, EFETCHFILE  # pylint: disable=relative-beyond-top-level
+
+from wwpdb.apps.releasemodule.citation.EUtilsClient import EUtilsClient
+from wwpdb.apps.releasemodule.citation.FetchResultParser import FetchResultParser
+from wwpdb.apps.releasemodule.citation.PubmedCache import PubmedCache
+from wwpdb.apps.releasemodule.citation.SearchResultParser import SearchResultParser
+from wwpdb.apps.releasemodule.citation.SearchUtil import SearchUtil
+
+
+class PubmedCacheTests(unittest.TestCase):
+    def setUp(self):
+        self.__dbPath = os.path.join(TESTOUTPUT, "pubmed_cache_test.sqlite")
+        if os.access(self.__dbPath, os.F_OK):
+            os.remove(self.__dbPath)
+        self.__infoMap = {}
+        for info in FetchResultParser(xmlfile=EFETCHFILE).getPubmedInfoList():
+            self.__infoMap[info["pdbx_database_id_PubMed"]] = info
+        # ahead of print record
+        self.__infoMap["33000001"] = {"pdbx_database_id_PubMed": "33000001", "title": "In press", "year": "2026"}
+
+    def testSearch(self):
+        """Test search results are returned until their TTL expires"""
+        cache = PubmedCache(self.__dbPath)
+        termMap = {"Peisach+E[au]": ["30357411", "28190782"], "Nobody+X[au]": [], "10.1002/pro.3530[aid]": ["30357411"]}
+        cache.putSearch(termMap, 730)
+        cache.close()
+        #
+        cache = PubmedCache(self.__dbPath)
+        cachedMap, refreshMap = cache.lookupSearch(list(termMap.keys()) + ["Doudna+JA[au]"], 730)
+        self.assertEqual(cachedMap, termMap)
+        self.assertEqual(refreshMap, {})
+        # Different window is a different key, DOI searches have no window
+        cachedMap, _refreshMap = cache.lookupSearch(list(termMap.keys()), 365)
+        self.assertEqual(cachedMap, {"10.1002/pro.3530[aid]": ["30357411"]})
+        self.assertEqual(cache.getStatistics()["author"], {"hit": 2, "stale": 0, "miss": 3})
+        self.assertEqual(cache.getStatistics()["doi"], {"hit": 2, "stale": 0, "miss": 0})
+        cache.close()
+        #
+        cache = PubmedCache(self.__dbPath, ttlMap={"author": -1.0, "doi": -1.0})
+        cachedMap, refreshMap = cache.lookupSearch(list(termMap.keys()), 730)
+        self.assertEqual(cachedMap, {})
+        self.assertEqual(refreshMap, {})
+        cachedMap, refreshMap = cache.lookupSearch(list(termMap.keys()), 730, refresh=True)
+        self.assertEqual(sorted(refreshMap.keys()), ["Nobody+X[au]", "Peisach+E[au]"])
+        self.assertEqual(refreshMap["Peisach+E[au]"][0], ["30357411", "28190782"])
+        self.assertRegex(refreshMap["Peisach+E[au]"][1], r"^\d{4}/\d{2}/\d{2}$")
+        self.assertEqual(cache.getStatistics()["author"]["stale"], 4)
+        cache.close()
+        # Incremental results expire for refresh once the last full search is too old
+        cache = PubmedCache(self.__dbPath, ttlMap={"author": -1.0, "refresh": -1.0})
+        cache.putSearch({"Peisach+E[au]": ["31234567", "30357411", "28190782"]}, 730, incremental=True)
+        _cachedMap, refreshMap = cache.lookupSearch(["Peisach+E[au]"], 730, refresh=True)
+        self.assertEqual(refreshMap, {})
+        cache.close()
+
+    def testArticle(self):
+        """Test article records and in-press TTL"""
+        cache = PubmedCache(self.__dbPath)
+        cache.putArticles(self.__infoMap)
+        idList = sorted(self.__infoMap.keys()) + ["99999999"]
+        self.assertEqual(cache.lookupArticles(idList), self.__infoMap)
+        self.assertEqual(cache.getStatistics()["article"], {"hit": len(self.__infoMap), "stale": 0, "miss": 1})
+        cache.close()
+        #
+        cache = PubmedCache(self.__dbPath, ttlMap={"inpress": -1.0})
+        infoMap = cache.lookupArticles(idList)
+        for pmid, info in self.__infoMap.items():
+            if ("journal_volume" in info) and ("page_first" in info):
+                self.assertEqual(infoMap[pmid], info)
+            else:
+                self.assertNotIn(pmid, infoMap)
+        self.assertLess(len(infoMap), len(self.__infoMap))
+        cache.close()
+
+    def testIncrementalSearch(self):
+        """Test incremental search request and complete empty result"""
+        server = FakeEUtilsServer(termMap={"Peisach+E[au]": ["31234567"]}).start()
+        client = EUtilsClient(baseUrl=server.url, backoff=0.0, log=None)
+        try:
+            search = SearchUtil(path=TESTOUTPUT, term="Peisach+E[au]", client=client)
+            search.doSearch(year=2, mindate="2026/10/01")
+            self.assertEqual(search.getPubmedIdList(), ["31234567"])
+            self.assertTrue(search.isSearched())
+            _method, _utility, params = server.requestList[-1]
+            self.assertEqual(params["datetype"], "edat")
+            self.assertEqual(params["mindate"], "2026/10/01")
+            self.assertIn("maxdate", params)
+            self.assertNotIn("reldate", params)
+            #
+            search = SearchUtil(path=TESTOUTPUT, term="Nobody+X[au]", client=client)
+            search.doSearch()
+            self.assertEqual(search.getPubmedIdList(), [])
+            self.assertTrue(search.isSearched())
+        finally:
+            client.close()
+            server.stop()
+        self.assertFalse(SearchResultParser(xmldata=b"<eSearchResult><ERROR>Invalid</ERROR></eSearchResult>").isValid())
+
+
+if __name__ == '__main__':
+    unittest.main()
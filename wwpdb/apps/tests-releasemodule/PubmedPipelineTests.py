@@ -0,0 +1,162 @@
+##
+# File: PubmedPipelineTests.py
+# Date:  18-Oct-2026
+#
+# Updates:
+##
+"""Test cases for asyncio pubmed search and fetch pipeline"""
+
+__docformat__ = "restructuredtext en"
+__author__ = "Zukang Feng"
+__email__ = "zfeng@rcsb.rutgers.edu"
+__license__ = "Creative Commons Attribution 3.0 Unported"
+__version__ = "V0.01"
+
+import os
+import re
+import time
+import unittest
+import sys
+
+try:
+    from unittest.mock import patch
+except ImportError:
+    from mock import patch
+
+if __package__ is None or __package__ == "":
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from commonsetup import HERE, TESTOUTPUT  # noqa:  F401 pylint: disable=import-error,unused-import
+    from fakeeutils import FakeEUtilsServer, EFETCHFILE  # pylint: disable=import-error
+else:
+    from .commonsetup import HERE, TESTOUTPUT  # noqa: F401 pylint: disable=relative-beyond-top-level
+    from .fakeeutils import FakeEUtilsServer, EFETCHFILE  # pylint: disable=relative-beyond-top-level
+
+from wwpdb.apps.releasemodule.citation.EUtilsClient import EUtilsClient
+from wwpdb.apps.releasemodule.citation.FetchResultParser import FetchResultParser
+from wwpdb.apps.releasemodule.citation.PubmedPipeline import PubmedPipeline
+
+
+class PubmedPipelineTests(unittest.TestCase):
+    def setUp(self):
+        self.__termMap = {"Peisach+E[au]": ["30357411", "28190782"], "Feng+Z[au]": ["29174494"], "Young+JY[au]": ["31234567", "30357411"],
+                          "Berman+HM[au]": ["32000001"], "10.1002/pro.3530[aid]": ["30357411"], "Nobody+X[au]": []}
+        self.__server = FakeEUtilsServer(termMap=self.__termMap).start()
+        self.__client = EUtilsClient(baseUrl=self.__server.url, backoff=0.0, log=None)
+        self.__infoMap = {}
+        for info in FetchResultParser(xmlfile=EFETCHFILE).getPubmedInfoList():
+            self.__infoMap[info["pdbx_database_id_PubMed"]] = info
+
+    def tearDown(self):
+        self.__client.close()
+        self.__server.stop()
+
+    def testPipeline(self):
+        """Test all terms are searched and each found record is fetched once"""
+        pipeline = PubmedPipeline(path=TESTOUTPUT, termList=sorted(self.__termMap.keys()), rate=20, concurrency=3, batchSize=2,
+                                  client=self.__client, log=sys.stderr)
+        pipeline.run()
+        expected = dict([(term, idList) for term, idList in self.__termMap.items() if idList])
+        self.assertEqual(pipeline.getTermMap(), expected)
+        self.assertEqual(sorted(pipeline.getSearchedTermList()), sorted(self.__termMap.keys()))
+        self.assertEqual(pipeline.getPubmedInfoMap(), self.__infoMap)
+        fetchedList = []
+        for _method, utility, params in self.__server.requestList:
+            if utility == "efetch.fcgi":
+                fetchedList.extend(params["id"].split(","))
+        self.assertEqual(sorted(fetchedList), sorted(self.__infoMap.keys()))
+        # Fetches start before the search stage is over
+        utilityList = [req[1] for req in self.__server.requestList]
+        self.assertLess(utilityList.index("efetch.fcgi"), len(utilityList) - 1 - utilityList[::-1].index("esearch.fcgi"))
+        #
+        statistics = pipeline.getStatistics()
+        self.assertEqual(statistics["search"]["item"], len(self.__termMap))
+        self.assertEqual(statistics["fetch"]["item"], len(self.__infoMap))
+        self.assertEqual(statistics["fetch"]["request"], 3)
+        self.assertLessEqual(pipeline.getRateStatistics()["achievedRate"], 20)
+
+    def testSeedAndLookup(self):
+        """Test seed IDs are fetched and records returned by the lookup are not fetched again"""
+        termList = ["Peisach+E[au]"]
+        cachedMap = {"30357411": self.__infoMap["30357411"]}
+
+        def lookup(idList):
+            return dict([(pid, cachedMap[pid]) for pid in idList if pid in cachedMap])
+
+        pipeline = PubmedPipeline(path=TESTOUTPUT, termList=termList, seedIdList=["32000001", "30357411"], articleLookup=lookup,
+                                  rate=20, client=self.__client, log=sys.stderr)
+        pipeline.run()
+        self.assertEqual(sorted(pipeline.getPubmedInfoMap().keys()), ["28190782", "30357411", "32000001"])
+        self.assertEqual(sorted(pipeline.getPubmedInfoMap(fetchedOnly=True).keys()), ["28190782", "32000001"])
+
+    def testMatchStage(self):
+        """Test entries are passed to matching once all their terms and records are resolved"""
+        entryTermMap = {1: ["Peisach+E[au]", "10.1002/pro.3530[aid]"], 2: ["Feng+Z[au]", "Young+JY[au]"], 3: ["Nobody+X[au]"],
+                        4: ["Berman+HM[au]", "Peisach+E[au]"], 5: []}
+        # Berman+HM[au] is known from an earlier search, Young+JY[au] is searched incrementally
+        knownTermMap = {"Berman+HM[au]": ["32000001"], "Young+JY[au]": ["28190782"]}
+        termList = [term for term in self.__termMap if term != "Berman+HM[au]"]
+        chunkList = []
+
+        def match(index, keyList, termMap, pubmedInfo):
+            for key in keyList:
+                for term in entryTermMap[key]:
+                    for pid in termMap.get(term, []):
+                        self.assertIn(pid, pubmedInfo)
+            chunkList.append((index, sorted(keyList), termMap))
+            return index
+
+        pipeline = PubmedPipeline(path=TESTOUTPUT, termList=termList, mindateMap={"Young+JY[au]": "2026/10/01"}, knownTermMap=knownTermMap,
+                                  entryTermMap=entryTermMap, matchFunction=match, matchBatchSize=2, rate=20, concurrency=3, batchSize=2,
+                                  client=self.__client, log=sys.stderr)
+        pipeline.run()
+        self.assertEqual(sorted([key for _index, keyList, _termMap in chunkList for key in keyList]), [1, 2, 3, 4, 5])
+        self.assertEqual(pipeline.getMatchResultList(), list(range(len(chunkList))))
+        termMap = {}
+        for _index, _keyList, chunkTermMap in chunkList:
+            termMap.update(chunkTermMap)
+        self.assertEqual(termMap["Young+JY[au]"], ["31234567", "30357411", "28190782"])
+        self.assertEqual(termMap["Berman+HM[au]"], ["32000001"])
+        self.assertNotIn("Nobody+X[au]", termMap)
+        self.assertEqual(pipeline.getStatistics()["match"]["item"], len(entryTermMap))
+
+    def testScriptFallback(self):
+        """Test concurrent curl script fallbacks after client failures keep the results of each term and batch apart"""
+        path = os.path.join(TESTOUTPUT, "pipeline-fallback")
+        if not os.path.exists(path):
+            os.makedirs(path)
+
+        def runScript(scriptPath, script, _logfile):
+            # Answer the curl command of the script from the fake server, slowly enough for the other threads to run
+            with open(os.path.join(scriptPath, script)) as ifh:
+                query, xmlfile = re.search(r'curl -g "([^"]*)" > (\S+)', ifh.read()).groups()
+            time.sleep(0.05)
+            params = dict([item.split("=", 1) for item in query.split("?", 1)[1].split("&") if "=" in item])
+            if "esearch.fcgi" in query:
+                data = self.__server.esearch(params)
+            else:
+                data = self.__server.articleSet(params["id"].split(","))
+            with open(os.path.join(scriptPath, xmlfile), "wb") as ofh:
+                ofh.write(data)
+
+        with patch("wwpdb.apps.releasemodule.citation.SearchUtil.RunScript", runScript), \
+                patch("wwpdb.apps.releasemodule.citation.FetchUtil.RunScript", runScript):
+            pipeline = PubmedPipeline(path=path, termList=sorted(self.__termMap.keys()), rate=100, concurrency=4, batchSize=1,
+                                      client=_FailingClient(), log=sys.stderr)
+            pipeline.run()
+        expected = dict([(term, idList) for term, idList in self.__termMap.items() if idList])
+        self.assertEqual(pipeline.getTermMap(), expected)
+        self.assertEqual(pipeline.getPubmedInfoMap(), self.__infoMap)
+
+
+class _FailingClient(object):
+    """ E-utilities client whose requests all fail
+    """
+    def esearch(self, *_args, **_kwargs):
+        return None
+
+    def efetch(self, *_args, **_kwargs):
+        return None
+
+
+if __name__ == '__main__':
+    unittest.main()
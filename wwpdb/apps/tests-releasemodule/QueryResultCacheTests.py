@@ -0,0 +1,74 @@
+##
+# File: QueryResultCacheTests.py
+# Date:  18-Oct-2026
+#
+# Updates:
+##
+"""Test cases for request scoped query result cache"""
+
+__docformat__ = "restructuredtext en"
+__author__ = "Zukang Feng"
+__email__ = "zfeng@rcsb.rutgers.edu"
+__license__ = "Creative Commons Attribution 3.0 Unported"
+__version__ = "V0.01"
+
+import os
+import unittest
+import sys
+
+if __package__ is None or __package__ == "":
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from commonsetup import HERE, TESTOUTPUT  # noqa:  F401 pylint: disable=import-error,unused-import
+    from fakedb import FakeDbApiUtil, getDbApi  # pylint: disable=import-error
+else:
+    from .commonsetup import HERE, TESTOUTPUT  # noqa: F401 pylint: disable=relative-beyond-top-level
+    from .fakedb import FakeDbApiUtil, getDbApi  # pylint: disable=relative-beyond-top-level
+
+from wwpdb.apps.releasemodule.utils.ContentDbApi import ContentDbApi
+from wwpdb.apps.releasemodule.utils.QueryResultCache import QueryResultCache
+
+
+class QueryResultCacheTests(unittest.TestCase):
+    def testCache(self):
+        """Test least recently used eviction, copies of cached rows and invalidation"""
+        cache = QueryResultCache(maxSize=2)
+        self.assertIsNone(cache.get("da_internal", "SELECT_EM_INFO", "D_1"))
+        cache.put("da_internal", "SELECT_EM_INFO", "D_1", [{"structure_id": "D_1"}])
+        cache.put("da_internal", "SELECT_ENTRY_INFO", (["D_1", "D_2"],), [])
+        cache.put("status", "GET_ALL_ANNO_INITIALS", (), None)
+        rows = cache.get("da_internal", "SELECT_EM_INFO", "D_1")
+        rows[0]["status_code_em"] = "REL"
+        self.assertEqual(cache.get("da_internal", "SELECT_EM_INFO", "D_1"), [{"structure_id": "D_1"}])
+        self.assertEqual(cache.get("da_internal", "SELECT_ENTRY_INFO", [["D_1", "D_2"]]), [])
+        self.assertIsNone(cache.get("status", "GET_ALL_ANNO_INITIALS", ()))
+        # SELECT_EM_INFO is now the least recently used result
+        cache.put("status", "GET_DA_GROUP_ID", ("ANN", "RCSB"), [{"da_group_id": 1}])
+        self.assertIsNone(cache.get("da_internal", "SELECT_EM_INFO", "D_1"))
+        self.assertEqual(cache.getStatistics(), {"hit": 3, "miss": 3, "evict": 1, "invalidate": 0, "size": 2})
+        cache.invalidate()
+        self.assertIsNone(cache.get("status", "GET_DA_GROUP_ID", ("ANN", "RCSB")))
+        self.assertEqual(cache.getStatistics()["invalidate"], 1)
+
+    def testContentDbApi(self):
+        """Test repeated lookups through one API object are read once and updates drop cached results"""
+        citationList = [{"structure_id": "D_1000000001", "jrnl_serial_no": 1, "title": "Primary title", "publication": "To be published",
+                         "volume_no": None, "year": None, "first_page": None, "last_page": None, "pdbx_database_id_PubMed": None,
+                         "pdbx_database_id_DOI": None}]
+        revisionList = [{"structure_id": "D_1000000001", "ordinal": 1, "revision_date": "2026-03-04"}]
+        fakeDb = FakeDbApiUtil(tableMap={"citation": citationList, "pdbx_audit_revision_history": revisionList},
+                               cannedMap={"SELECT_ENTRY_INFO": [{"structure_id": "D_1000000001", "pdb_id": "1ABC"}],
+                                          "SELECT_EM_INFO": [{"structure_id": "D_1000000001", "status_code_em": "HPUB"}]})
+        api = getDbApi(ContentDbApi, fakeDb, queryCache=QueryResultCache())
+        entryInfo = api.getEntryInfo("D_1000000001")
+        self.assertEqual(api.getEMInfo("D_1000000001"), [{"structure_id": "D_1000000001", "status_code_em": "HPUB"}])
+        self.assertEqual(api.getEntryInfo("D_1000000001"), entryInfo)
+        self.assertEqual(api.getPrimaryCitation("D_1000000001")["title"], "Primary title")
+        self.assertEqual(api.getPrimaryCitationMap(["D_1000000001"])["D_1000000001"]["title"], "Primary title")
+        self.assertEqual(api.getPrimaryCitationMap(["D_1000000001"])["D_1000000001"]["title"], "Primary title")
+        self.assertEqual(len(fakeDb.queryList), 5)
+        fakeDb.runUpdateSQL("update citation set title = 'New title' where structure_id = 'D_1000000001'")
+        self.assertEqual(api.getPrimaryCitation("D_1000000001")["title"], "New title")
+
+
+if __name__ == '__main__':
+    unittest.main()
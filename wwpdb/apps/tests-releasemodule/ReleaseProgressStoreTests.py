@@ -0,0 +1,82 @@
+##
+# File: ReleaseProgressStoreTests.py
+# Date:  18-Oct-2026
+#
+# Updates:
+##
+"""Test cases for the background release job progress store"""
+
+__docformat__ = "restructuredtext en"
+__author__ = "Zukang Feng"
+__email__ = "zfeng@rcsb.rutgers.edu"
+__license__ = "Creative Commons Attribution 3.0 Unported"
+__version__ = "V0.01"
+
+import multiprocessing
+import os
+import shutil
+import unittest
+import sys
+
+if __package__ is None or __package__ == "":
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from commonsetup import HERE, TESTOUTPUT  # noqa:  F401 pylint: disable=import-error,unused-import
+else:
+    from .commonsetup import HERE, TESTOUTPUT  # noqa: F401 pylint: disable=relative-beyond-top-level
+
+import wwpdb.apps.releasemodule.utils.ReleaseProgressStore as ProgressStatus
+from wwpdb.apps.releasemodule.utils.ReleaseProgressStore import ReleaseProgressStore
+
+
+def _addEvents(sessionPath, worker):
+    store = ReleaseProgressStore(sessionPath, "TMP_1")
+    for i in range(50):
+        store.addEvent("D_%d_%d" % (worker, i), ProgressStatus.DONE, data={"task": "release", "entry_data": {"entry": "D_%d_%d" % (worker, i)}})
+
+
+class ReleaseProgressStoreTests(unittest.TestCase):
+    def setUp(self):
+        self.__sessionPath = os.path.join(TESTOUTPUT, "release-progress")
+        if os.path.exists(self.__sessionPath):
+            shutil.rmtree(self.__sessionPath)
+        os.makedirs(self.__sessionPath)
+
+    def tearDown(self):
+        shutil.rmtree(self.__sessionPath)
+
+    def testIncrementalEvents(self):
+        """Test a poll only returns the events added since its offset and a partly written line is left for later"""
+        store = ReleaseProgressStore(self.__sessionPath, "TMP_1")
+        self.assertFalse(store.exists())
+        self.assertEqual(store.getEvents(), ([], 0))
+        store.addEntries(["D_1", "D_2"])
+        eventList, offset = store.getEvents()
+        self.assertEqual([(event["entry"], event["status"]) for event in eventList], [("D_1", "queued"), ("D_2", "queued")])
+        #
+        store.addEvent("D_1", ProgressStatus.STEP, step="content update")
+        with open(os.path.join(self.__sessionPath, "release_progress_TMP_1.log"), "a") as ofh:
+            ofh.write('{"entry": "D_2", "sta')
+        eventList, offset = store.getEvents(offset)
+        self.assertEqual([(event["entry"], event["status"], event["step"]) for event in eventList], [("D_1", "step", "content update")])
+        self.assertEqual(store.getEvents(offset), ([], offset))
+        self.assertEqual(store.getEntryStatusMap()["D_1"]["status"], "step")
+        #
+        self.assertIsNone(store.getResult())
+        store.setResult(returnContent="Task: release")
+        self.assertEqual((store.getResult()["return"], store.getResult()["error"]), ("Task: release", ""))
+        self.assertIsNone(ReleaseProgressStore(self.__sessionPath, "TMP_2").getResult())
+
+    def testConcurrentWriters(self):
+        """Test events of several processes do not get mixed up"""
+        processList = [multiprocessing.Process(target=_addEvents, args=(self.__sessionPath, worker)) for worker in range(4)]
+        for process in processList:
+            process.start()
+        for process in processList:
+            process.join()
+        statusMap = ReleaseProgressStore(self.__sessionPath, "TMP_1").getEntryStatusMap()
+        self.assertEqual(len(statusMap), 200)
+        self.assertEqual(statusMap["D_3_49"]["data"]["entry_data"], {"entry": "D_3_49"})
+
+
+if __name__ == '__main__':
+    unittest.main()
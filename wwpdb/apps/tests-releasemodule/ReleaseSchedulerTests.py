@@ -0,0 +1,111 @@
+##
+# File: ReleaseSchedulerTests.py
+# Date:  18-Oct-2026
+#
+# Updates:
+##
+"""Test cases for the cost ordered release scheduler"""
+
+__docformat__ = "restructuredtext en"
+__author__ = "Zukang Feng"
+__email__ = "zfeng@rcsb.rutgers.edu"
+__license__ = "Creative Commons Attribution 3.0 Unported"
+__version__ = "V0.01"
+
+import os
+import shutil
+import unittest
+import sys
+
+if __package__ is None or __package__ == "":
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from commonsetup import HERE, TESTOUTPUT  # noqa:  F401 pylint: disable=import-error,unused-import
+else:
+    from .commonsetup import HERE, TESTOUTPUT  # noqa: F401 pylint: disable=relative-beyond-top-level
+
+from wwpdb.apps.releasemodule.utils.ReleaseScheduler import ReleaseScheduler, getArchiveFileSizeInfo, getWorkerCount
+
+
+class ReleaseSchedulerTests(unittest.TestCase):
+    def setUp(self):
+        self.__path = os.path.join(TESTOUTPUT, "release-scheduler")
+        if os.path.exists(self.__path):
+            shutil.rmtree(self.__path)
+        os.makedirs(self.__path)
+        self.__historyFile = os.path.join(self.__path, "release_timing.pickle")
+
+    def tearDown(self):
+        shutil.rmtree(self.__path)
+
+    def __writeFile(self, fileName, size):
+        with open(os.path.join(self.__path, fileName), "wb") as ofh:
+            ofh.write(b"x" * size)
+
+    def testArchiveFileSize(self):
+        """Test only the latest version of each archive file is counted"""
+        self.__writeFile("D_1000000001_model_P1.cif.V1", 100)
+        self.__writeFile("D_1000000001_model_P1.cif.V12", 300)
+        self.__writeFile("D_1000000001_model_P1.cif.V2", 200)
+        self.__writeFile("D_1000000001_em-volume_P1.map.V1", 1000)
+        self.__writeFile("D_1000000001_model_P1.cif", 5000)
+        self.__writeFile("D_1000000002_model_P1.cif.V1", 7000)
+        self.assertEqual(getArchiveFileSizeInfo(self.__path, "D_1000000001"), (1300, 1000))
+        self.assertEqual(getArchiveFileSizeInfo(os.path.join(self.__path, "missing"), "D_1000000001"), (0, 0))
+
+    def testWorkUnitList(self):
+        """Test heavy entries come first as units of their own and cheap entries are packed together"""
+        scheduler = ReleaseScheduler(numProc=2)
+        scheduler.addEntry({"entry": "D_1"}, totalSize=10 * 1048576)
+        scheduler.addEntry({"entry": "D_2"}, totalSize=2000 * 1048576, emSize=1800 * 1048576)
+        for i in range(3, 9):
+            scheduler.addEntry({"entry": "D_%d" % i})
+        scheduler.addEntry({"entry": "D_9", "big_entry": "yes"})
+        unitList = scheduler.getWorkUnitList()
+        self.assertEqual([(ioHeavy, [entryData["entry"] for entryData in dataList]) for ioHeavy, _cost, dataList in unitList],
+                         [(True, ["D_2"]), (True, ["D_9"]), (False, ["D_1", "D_3"]), (False, ["D_4", "D_5"]), (False, ["D_6", "D_7"]),
+                          (False, ["D_8"])])
+        self.assertAlmostEqual(unitList[0][1], 60.0 + 2000 * 0.2)
+
+    def testComputeCluster(self):
+        """Test USE_COMPUTE_CLUSTER does not start more workers than CPUs, so cheap entries are still packed together"""
+        self.assertEqual(getWorkerCount(500, cpuCount=16), 8)
+        self.assertEqual(getWorkerCount(500, useComputeCluster=True, cpuCount=16), 16)
+        self.assertEqual(getWorkerCount(3, useComputeCluster=True, cpuCount=16), 3)
+        self.assertEqual(getWorkerCount(0, useComputeCluster=True, cpuCount=1), 1)
+        numProc = getWorkerCount(500, useComputeCluster=True, cpuCount=16)
+        scheduler = ReleaseScheduler(numProc=numProc, ioBudget=max(1, int(numProc / 2)))
+        for i in range(500):
+            scheduler.addEntry({"entry": "D_%d" % i})
+        unitList = scheduler.getWorkUnitList()
+        self.assertLess(len(unitList), 100)
+        self.assertEqual(sum([len(dataList) for _ioHeavy, _cost, dataList in unitList]), 500)
+
+    def testRun(self):
+        """Test all units are run by the workers and the timings are used by the next run"""
+        entryList = [{"entry": "D_%d" % i} for i in range(1, 8)]
+        with open(os.devnull, "w") as lfh:
+            scheduler = ReleaseScheduler(numProc=3, ioBudget=1, historyFile=self.__historyFile, log=lfh)
+            for entryData in entryList:
+                scheduler.addEntry(entryData, emSize=1 if entryData["entry"] in ("D_1", "D_2") else 0)
+            timingList = scheduler.run(_runUnit)
+        self.assertEqual(sorted([timing["entry"] for timing in timingList]), sorted([entryData["entry"] for entryData in entryList]))
+        self.assertEqual([timing["ok"] for timing in timingList if timing["entry"] == "D_7"], [False])
+        self.assertTrue(min([timing["start"] for timing in timingList]) >= 0.0)
+        #
+        scheduler = ReleaseScheduler(numProc=3, historyFile=self.__historyFile)
+        scheduler.addEntry({"entry": "D_1"})
+        scheduler.addEntry({"entry": "D_7"})
+        # D_1 took its recorded time, the failed D_7 is estimated again
+        self.assertEqual([(cost < 1.0, dataList[0]["entry"]) for _ioHeavy, cost, dataList in scheduler.getWorkUnitList()],
+                         [(False, "D_7"), (True, "D_1")])
+
+
+def _runUnit(dataList, procName):  # pylint: disable=unused-argument
+    for entryData in dataList:
+        if entryData["entry"] == "D_7":
+            raise ValueError("failed")
+    return dataList
+
+
+if __name__ == '__main__':
+    unittest.main()
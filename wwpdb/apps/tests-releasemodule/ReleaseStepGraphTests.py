@@ -0,0 +1,84 @@
+##
+# File: ReleaseStepGraphTests.py
+# Date:  18-Oct-2026
+#
+# Updates:
+##
+"""Test cases for the release step dependency graph"""
+
+__docformat__ = "restructuredtext en"
+__author__ = "Zukang Feng"
+__email__ = "zfeng@rcsb.rutgers.edu"
+__license__ = "Creative Commons Attribution 3.0 Unported"
+__version__ = "V0.01"
+
+import os
+import threading
+import time
+import unittest
+import sys
+
+if __package__ is None or __package__ == "":
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from commonsetup import HERE, TESTOUTPUT  # noqa:  F401 pylint: disable=import-error,unused-import
+else:
+    from .commonsetup import HERE, TESTOUTPUT  # noqa: F401 pylint: disable=relative-beyond-top-level
+
+from wwpdb.apps.releasemodule.update.ReleaseStepGraph import ReleaseStepGraph
+
+
+class ReleaseStepGraphTests(unittest.TestCase):
+    def setUp(self):
+        self.__lock = threading.Lock()
+        self.__eventList = []
+        self.__running = 0
+        self.__maxRunning = 0
+
+    def __getStep(self, name, delay=0.05, error=False):
+        def step():
+            with self.__lock:
+                self.__eventList.append(("start", name))
+                self.__running += 1
+                self.__maxRunning = max(self.__maxRunning, self.__running)
+            time.sleep(delay)
+            with self.__lock:
+                self.__eventList.append(("end", name))
+                self.__running -= 1
+            if error:
+                raise IOError("step %s failed" % name)
+            return name
+        return step
+
+    def __getGraph(self, maxWorkers, errorStep=None):
+        stepGraph = ReleaseStepGraph(maxWorkers=maxWorkers)
+        stepGraph.addStep("cif", self.__getStep("cif", error=(errorStep == "cif")))
+        stepGraph.addStep("xml", self.__getStep("xml"), dependList=["cif"])
+        for name in ("misc", "pdb", "bio_cif"):
+            stepGraph.addStep(name, self.__getStep(name, error=(errorStep == name)))
+        return stepGraph
+
+    def testParallel(self):
+        """Test steps run at the same time within the worker limit and after their dependencies"""
+        stepGraph = self.__getGraph(3)
+        self.assertEqual(stepGraph.run(), dict([(name, name) for name in ("cif", "xml", "misc", "pdb", "bio_cif")]))
+        self.assertEqual(self.__maxRunning, 3)
+        self.assertLess(self.__eventList.index(("end", "cif")), self.__eventList.index(("start", "xml")))
+        self.assertEqual(stepGraph.getStepNameList(), ["cif", "xml", "misc", "pdb", "bio_cif"])
+        self.assertRaises(ValueError, stepGraph.addStep, "sf", self.__getStep("sf"), dependList=["em"])
+        self.assertRaises(ValueError, stepGraph.addStep, "cif", self.__getStep("cif"))
+
+    def testSequential(self):
+        """Test one worker runs the steps in the order they were added"""
+        self.__getGraph(1).run(runFunction=lambda function: [function()])
+        self.assertEqual([name for event, name in self.__eventList if event == "start"], ["cif", "xml", "misc", "pdb", "bio_cif"])
+        self.assertEqual(self.__maxRunning, 1)
+
+    def testError(self):
+        """Test a failed step is raised again and its dependent steps are not run"""
+        self.assertRaises(IOError, self.__getGraph(2, errorStep="cif").run)
+        self.assertNotIn(("start", "xml"), self.__eventList)
+        self.assertEqual(self.__running, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,94 @@
+##
+# File: StringUtilTests.py
+# Date:  18-Oct-2026
+#
+# Updates:
+##
+"""Test cases for title similarity calculation"""
+
+__docformat__ = "restructuredtext en"
+__author__ = "Zukang Feng"
+__email__ = "zfeng@rcsb.rutgers.edu"
+__license__ = "Creative Commons Attribution 3.0 Unported"
+__version__ = "V0.01"
+
+import os
+import random
+import unittest
+import sys
+
+if __package__ is None or __package__ == "":
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from commonsetup import HERE, TESTOUTPUT  # noqa:  F401 pylint: disable=import-error,unused-import
+    from fakeeutils import EFETCHFILE  # pylint: disable=import-error
+else:
+    from .commonsetup import HERE, TESTOUTPUT  # noqa: F401 pylint: disable=relative-beyond-top-level
+    from .fakeeutils import EFETCHFILE  # pylint: disable=relative-beyond-top-level
+
+from wwpdb.apps.releasemodule.citation.FetchResultParser import FetchResultParser
+from wwpdb.apps.releasemodule.citation.StringUtil import calLevenshteinDistance, calStringSimilarity, calStringSimilarityList
+
+
+def referenceSimilarity(first, second):
+    """Full matrix Levenshtein similarity calStringSimilarity() used to compute, kept for comparison"""
+    if not first or not second:
+        return 0.0
+    s1 = first.lower()
+    s2 = second.lower()
+    matrix = [[0] * (len(s2) + 1) for _x in range(len(s1) + 1)]
+    for i in range(len(s1) + 1):
+        matrix[i][0] = i
+    for j in range(len(s2) + 1):
+        matrix[0][j] = j
+    for i in range(1, len(s1) + 1):
+        for j in range(1, len(s2) + 1):
+            matrix[i][j] = min(matrix[i - 1][j] + 1, matrix[i][j - 1] + 1, matrix[i - 1][j - 1] + (s1[i - 1] != s2[j - 1]))
+    return 1.0 - float(matrix[len(s1)][len(s2)]) / float(max(len(s1), len(s2)))
+
+
+class StringUtilTests(unittest.TestCase):
+    def setUp(self):
+        self.__titleList = [info["title"] for info in FetchResultParser(xmlfile=EFETCHFILE).getPubmedInfoList() if "title" in info]
+        rand = random.Random(2013)
+        variantList = []
+        for title in self.__titleList:
+            for rate in (0.05, 0.2, 0.5):
+                chars = list(title)
+                for _i in range(int(len(chars) * rate)):
+                    pos = rand.randrange(len(chars))
+                    op = rand.randrange(3)
+                    if op == 0:
+                        chars[pos] = rand.choice("abcdefghijklmnopqrstuvwxyz ")
+                    elif op == 1:
+                        del chars[pos]
+                    else:
+                        chars.insert(pos, rand.choice("ABCDEFGHIJKLMNOPQRSTUVWXYZ "))
+                variantList.append("".join(chars))
+        self.__candidateList = self.__titleList + variantList + ["", "Structure", "x" * 300]
+
+    def testAccuracy(self):
+        """Test scores match the full matrix calculation to 3 decimals"""
+        for first in self.__titleList + ["", "a"]:
+            simList = calStringSimilarityList(first, self.__candidateList)
+            cutList = calStringSimilarityList(first, self.__candidateList, minSimilarity=0.5)
+            for second, sim, cut in zip(self.__candidateList, simList, cutList):
+                expected = referenceSimilarity(first, second)
+                self.assertEqual("%.3f" % calStringSimilarity(first, second), "%.3f" % expected)
+                self.assertEqual("%.3f" % sim, "%.3f" % expected)
+                if expected < 0.5:
+                    self.assertEqual(cut, 0.0)
+                    self.assertEqual(calStringSimilarity(first, second, minSimilarity=0.5), 0.0)
+                else:
+                    self.assertEqual("%.3f" % cut, "%.3f" % expected)
+
+    def testDistance(self):
+        """Test distance and early termination on known values"""
+        self.assertEqual(calLevenshteinDistance("kitten", "sitting"), 3)
+        self.assertEqual(calLevenshteinDistance("", "abc"), 3)
+        self.assertEqual(calLevenshteinDistance("flaw", "lawn"), 2)
+        self.assertEqual(calLevenshteinDistance("a" * 100, "b" * 100, maxDistance=10), 11)
+        self.assertEqual(calLevenshteinDistance("kitten", "sitting", maxDistance=3), 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,135 @@
+##
+# File: UpdateUtilTests.py
+# Date:  18-Oct-2026
+#
+# Updates:
+##
+"""Test cases for batched ReleaseUpdate runs"""
+
+__docformat__ = "restructuredtext en"
+__author__ = "Zukang Feng"
+__email__ = "zfeng@rcsb.rutgers.edu"
+__license__ = "Creative Commons Attribution 3.0 Unported"
+__version__ = "V0.01"
+
+try:
+    import cPickle as pickle
+except ImportError:
+    import pickle as pickle
+
+import os
+import shutil
+import stat
+import unittest
+import sys
+
+try:
+    from unittest.mock import MagicMock, patch
+except ImportError:
+    from mock import MagicMock, patch
+
+if __package__ is None or __package__ == "":
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from commonsetup import HERE, TESTOUTPUT, configInfo  # noqa:  F401 pylint: disable=import-error,unused-import
+else:
+    from .commonsetup import HERE, TESTOUTPUT, configInfo  # noqa: F401 pylint: disable=relative-beyond-top-level
+
+from wwpdb.apps.releasemodule.update.UpdateUtil_v2 import UpdateUtil, runBatchUpdate
+
+# Stub ReleaseUpdate: writes one update_list row per input data block, except for the entries listed in
+# skip_entries when the input holds more than one block, and no output at all if no_output exists
+_STUBRELEASEUPDATE = """#!%s
+import os
+import sys
+
+args = dict(zip(sys.argv[1::2], sys.argv[2::2]))
+with open(args["-input"]) as ifh:
+    entryList = [line.strip()[5:] for line in ifh if line.startswith("data_")]
+with open("release_update_calls.log", "a") as ofh:
+    ofh.write(" ".join(entryList) + "\\n")
+if (len(entryList) > 1) and os.access("no_output", os.F_OK):
+    sys.exit(0)
+skipList = []
+if (len(entryList) > 1) and os.access("skip_entries", os.F_OK):
+    with open("skip_entries") as ifh:
+        skipList = ifh.read().split()
+with open(args["-output"], "w") as ofh:
+    ofh.write("data_update\\nloop_\\n_update_list.entry\\n_update_list.type\\n_update_list.format\\n_update_list.file\\n")
+    for entryId in entryList:
+        if entryId not in skipList:
+            ofh.write("%%s model pdbx %%s_model_P1.cif.V2\\n" %% (entryId, entryId))
+"""
+
+
+class UpdateUtilTests(unittest.TestCase):
+    def setUp(self):
+        self.__sessionPath = os.path.join(TESTOUTPUT, "update-util")
+        if os.path.exists(self.__sessionPath):
+            shutil.rmtree(self.__sessionPath)
+        os.makedirs(self.__sessionPath)
+        self.__binPath = os.path.join(self.__sessionPath, "bin")
+        os.makedirs(self.__binPath)
+        stubFile = os.path.join(self.__binPath, "ReleaseUpdate")
+        with open(stubFile, "w") as ofh:
+            ofh.write(_STUBRELEASEUPDATE % sys.executable)
+        os.chmod(stubFile, os.stat(stubFile).st_mode | stat.S_IEXEC)
+        #
+        configInfo.setdefault("SITE_NAME", "WWPDB_DEPLOY")
+        configInfo.setdefault("SITE_ARCHIVE_STORAGE_PATH", self.__sessionPath)
+        valueMap = {"WWPDB_SITE_ID": "WWPDB_DEPLOY", "annotator": "ZF", "task": "release", "pubmed_file": ""}
+        self.__reqObj = MagicMock()
+        self.__reqObj.getValue.side_effect = lambda key: valueMap.get(key, "")
+        self.__reqObj.newSessionObj.return_value.getPath.return_value = self.__sessionPath
+        self.__reqObj.newSessionObj.return_value.getId.return_value = "update-util"
+        self.__entryIdList = ["D_1000000001", "D_1000000002", "D_1000000003"]
+
+    def tearDown(self):
+        shutil.rmtree(self.__sessionPath)
+
+    def __runBatch(self):
+        updateUtilList = []
+        with patch.object(UpdateUtil, "_bashSetting", return_value=" BINPATH=" + self.__binPath + "; export BINPATH; "):
+            for entryId in self.__entryIdList:
+                with open(os.path.join(self.__sessionPath, entryId.lower() + ".pickle"), "wb") as ofh:
+                    pickle.dump({"model": {"session_file": entryId + "_model_P1.cif"}}, ofh)
+                entryDir = {"entry": entryId, "pdb_id": "1ABC", "status_code": "REL", "input_file": entryId + "_model_P1.cif"}
+                updateUtil = UpdateUtil(reqObj=self.__reqObj, entryDir=entryDir, log=sys.stderr)
+                self.assertTrue(updateUtil.prepare([]))
+                updateUtilList.append(updateUtil)
+            runBatchUpdate(updateUtilList, "1")
+        with open(os.path.join(self.__sessionPath, "release_update_calls.log")) as ifh:
+            callList = ifh.read().split("\n")[:-1]
+        updatedMap = {}
+        for entryId in self.__entryIdList:
+            with open(os.path.join(self.__sessionPath, entryId.lower() + ".pickle"), "rb") as ifh:
+                updatedMap[entryId] = pickle.load(ifh)["model"].get("updated_archival_files")
+        return callList, updatedMap
+
+    def testBatch(self):
+        """Test one ReleaseUpdate call covers all entries and each entry reads its own rows from the shared output"""
+        callList, updatedMap = self.__runBatch()
+        self.assertEqual(callList, [" ".join(self.__entryIdList)])
+        for entryId in self.__entryIdList:
+            self.assertEqual(updatedMap[entryId], {"pdbx": entryId + "_model_P1.cif.V2"})
+
+    def testMissingEntry(self):
+        """Test an entry left out of the batch output is updated again on its own"""
+        with open(os.path.join(self.__sessionPath, "skip_entries"), "w") as ofh:
+            ofh.write("D_1000000002\n")
+        callList, updatedMap = self.__runBatch()
+        self.assertEqual(callList, [" ".join(self.__entryIdList), "D_1000000002"])
+        for entryId in self.__entryIdList:
+            self.assertEqual(updatedMap[entryId], {"pdbx": entryId + "_model_P1.cif.V2"})
+
+    def testMissingOutput(self):
+        """Test all entries are updated on their own if the batch run leaves no output file"""
+        with open(os.path.join(self.__sessionPath, "no_output"), "w") as ofh:
+            ofh.write("\n")
+        callList, updatedMap = self.__runBatch()
+        self.assertEqual(callList, [" ".join(self.__entryIdList)] + self.__entryIdList)
+        for entryId in self.__entryIdList:
+            self.assertEqual(updatedMap[entryId], {"pdbx": entryId + "_model_P1.cif.V2"})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,52 @@
+##
+# File: UtilityTests.py
+# Date:  18-Oct-2026
+#
+# Updates:
+##
+"""Test cases for the archive map file lookup"""
+
+__docformat__ = "restructuredtext en"
+__author__ = "Zukang Feng"
+__email__ = "zfeng@rcsb.rutgers.edu"
+__license__ = "Creative Commons Attribution 3.0 Unported"
+__version__ = "V0.01"
+
+import os
+import shutil
+import unittest
+import sys
+
+if __package__ is None or __package__ == "":
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from commonsetup import HERE, TESTOUTPUT  # noqa:  F401 pylint: disable=import-error,unused-import
+else:
+    from .commonsetup import HERE, TESTOUTPUT  # noqa: F401 pylint: disable=relative-beyond-top-level
+
+from wwpdb.apps.releasemodule.utils.Utility import getArchiveMapFileSet
+
+
+class UtilityTests(unittest.TestCase):
+    def setUp(self):
+        self.__archivePath = os.path.join(TESTOUTPUT, "utility-archive")
+        if os.path.exists(self.__archivePath):
+            shutil.rmtree(self.__archivePath)
+        for entryId, fileList in (("D_1000000001", ["D_1000000001_em-volume_P1.map.V1", "D_1000000001_em-volume_P1.map.V2"]),
+                                  ("D_1000000002", ["D_1000000002_model_P1.cif.V1", "D_1000000002_em-additional-volume_P1.map.V1"]),
+                                  ("D_1000000003", ["D_1000000003_em-volume_P1.map.V3"])):
+            os.makedirs(os.path.join(self.__archivePath, entryId))
+            for fileName in fileList:
+                with open(os.path.join(self.__archivePath, entryId, fileName), "w") as ofh:
+                    ofh.write("\n")
+
+    def tearDown(self):
+        shutil.rmtree(self.__archivePath)
+
+    def testArchiveMapFileSet(self):
+        """Test any version of the primary map counts and entries without a map or directory are left out"""
+        self.assertEqual(getArchiveMapFileSet(self.__archivePath, ["D_1000000001", "D_1000000002", "D_1000000003", "D_1000000004"]),
+                         set(["D_1000000001_em-volume_P1.map", "D_1000000003_em-volume_P1.map"]))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,115 @@
+"""In-memory SQLite stand-in for DbApiUtil used as a test fixture for the database APIs"""
+
+import sqlite3
+import sys
+
+try:
+    from unittest.mock import patch
+except ImportError:  # pragma: no cover
+    from mock import patch
+
+from wwpdb.apps.releasemodule.utils.DbApiUtil import getBoundQueryList
+
+FAKEDBCONFIG = {"SITE_DB_PORT_NUMBER": "3306"}
+
+
+class FakeDbApiUtil(object):
+    """Runs the schema map queries against in-memory SQLite tables and records every query made.
+
+    Queries using MySQL only syntax can be given canned results with cannedMap (schema key -> rows).
+    Like DbApiUtil.runSelectSQL, empty values are removed from the returned rows.
+    """
+
+    def __init__(self, tableMap=None, cannedMap=None):
+        self.conn = sqlite3.connect(":memory:", check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.queryList = []
+        self.__schemaMap = {}
+        self.__cannedMap = cannedMap or {}
+        self.__queryCache = None
+        for table, rowList in (tableMap or {}).items():
+            self.addTable(table, rowList)
+
+    def addTable(self, table, rowList):
+        columnList = []
+        for row in rowList:
+            for column in row:
+                if column not in columnList:
+                    columnList.append(column)
+        self.conn.execute("CREATE TABLE %s (%s)" % (table, ", ".join(columnList)))
+        self.conn.executemany("INSERT INTO %s (%s) VALUES (%s)" % (table, ", ".join(columnList), ", ".join(["?"] * len(columnList))),
+                              [[row.get(column) for column in columnList] for row in rowList])
+        self.conn.commit()
+
+    def setSchemaMap(self, schemaMap):
+        self.__schemaMap = schemaMap
+
+    def setQueryCache(self, queryCache):
+        self.__queryCache = queryCache
+
+    def runUpdateSQL(self, sql):
+        if self.__queryCache is not None:
+            self.__queryCache.invalidate()
+        self.queryList.append(sql)
+        self.conn.execute(sql)
+        self.conn.commit()
+        return "OK"
+
+    def selectData(self, key=None, parameter=()):
+        return self.__getCachedRows(key, parameter, lambda: self.__selectData(key, parameter))
+
+    def selectBoundData(self, key=None, parameter=(), chunkSize=1000):
+        return self.__getCachedRows(key, parameter, lambda: self.__selectBoundData(key, parameter, chunkSize))
+
+    def iterBoundData(self, key=None, parameter=(), arraysize=1000):  # pylint: disable=unused-argument
+        for row in self.__selectBoundData(key, parameter, sys.maxsize) or []:
+            yield row
+
+    def __getCachedRows(self, key, parameter, selectFunction):
+        if self.__queryCache is not None:
+            rows = self.__queryCache.get("fakedb", key, parameter)
+            if rows is not None:
+                return rows
+        rows = selectFunction()
+        if self.__queryCache is not None:
+            self.__queryCache.put("fakedb", key, parameter, rows)
+        return rows
+
+    def __selectData(self, key, parameter):
+        if key in self.__cannedMap:
+            self.queryList.append(key)
+            return [dict(row) for row in self.__cannedMap[key]]
+        if (not key) or (key not in self.__schemaMap):
+            return None
+        sql = self.__schemaMap[key]
+        if parameter:
+            sql = self.__schemaMap[key] % parameter
+        return self.runSelectSQL(sql)
+
+    def __selectBoundData(self, key, parameter, chunkSize):
+        if key in self.__cannedMap:
+            return self.__selectData(key, ())
+        if (not key) or (key not in self.__schemaMap):
+            return None
+        rows = []
+        for sql, values in getBoundQueryList(self.__schemaMap[key], parameter, chunkSize=chunkSize):
+            rows.extend(self.runSelectSQL(sql, values))
+        return rows
+
+    def runSelectSQL(self, sql, parameter=None):
+        self.queryList.append(sql)
+        if parameter is None:
+            cursor = self.conn.execute(sql)
+        else:
+            cursor = self.conn.execute(sql.replace("%s", "?"), parameter)
+        rows = []
+        for row in cursor.fetchall():
+            rows.append(dict([(column, row[column]) for column in row.keys() if row[column]]))
+        return rows
+
+
+def getDbApi(apiClass, fakeDb, siteId="WWPDB_DEPLOY_TEST", **kwargs):
+    """Returns apiClass instance (e.g. ContentDbApi) whose DbApiUtil connection is fakeDb"""
+    module = __import__(apiClass.__module__, fromlist=["DbApiUtil"])
+    with patch.object(module, "DbApiUtil", lambda **_dbKwargs: fakeDb), patch.object(module, "ConfigInfo", lambda siteId: FAKEDBCONFIG):
+        return apiClass(siteId=siteId, verbose=False, **kwargs)
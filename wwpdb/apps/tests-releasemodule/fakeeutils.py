@@ -0,0 +1,144 @@
+"""Local fake NCBI E-utilities server used as a test fixture for the citation finder"""
+
+import os
+import threading
+import xml.etree.ElementTree as ET
+
+try:
+    from http.server import BaseHTTPRequestHandler, HTTPServer
+    from socketserver import ThreadingMixIn
+    from urllib.parse import parse_qs, urlsplit
+except ImportError:  # pragma: no cover
+    from BaseHTTPServer import BaseHTTPRequestHandler, HTTPServer
+    from SocketServer import ThreadingMixIn
+    from urlparse import parse_qs, urlsplit
+
+HERE = os.path.abspath(os.path.dirname(__file__))
+EFETCHFILE = os.path.join(HERE, "data", "pubmed_efetch.xml")
+
+
+def loadArticleMap(xmlfile=EFETCHFILE):
+    """Returns PMID -> serialized <PubmedArticle> map from an efetch dump"""
+    articleMap = {}
+    root = ET.parse(xmlfile).getroot()
+    for article in root.findall("PubmedArticle"):
+        pmid = article.find("MedlineCitation/PMID").text
+        articleMap[pmid] = ET.tostring(article, encoding="unicode")
+    return articleMap
+
+
+class _ThreadingHTTPServer(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+    def __init__(self, serverAddress, handlerClass, fake):
+        HTTPServer.__init__(self, serverAddress, handlerClass)
+        self.fake = fake
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):  # pylint: disable=redefined-builtin
+        pass
+
+    def do_GET(self):  # noqa: N802
+        url = urlsplit(self.path)
+        self._dispatch(url.path, parse_qs(url.query))
+
+    def do_POST(self):  # noqa: N802
+        length = int(self.headers.get("Content-Length", 0))
+        body = self.rfile.read(length).decode("ascii")
+        self._dispatch(urlsplit(self.path).path, parse_qs(body))
+
+    def _dispatch(self, path, query):
+        fake = self.server.fake
+        params = {k: v[0] for k, v in query.items()}
+        with fake.lock:
+            fake.requestList.append((self.command, path.split("/")[-1], params))
+            fake.connectionSet.add(self.client_address)
+            failing = fake.failCount > 0
+            if failing:
+                fake.failCount -= 1
+        if failing:
+            self._send(429, b"API rate limit exceeded", [("Retry-After", "0")])
+            return
+        if path.endswith("esearch.fcgi"):
+            self._send(200, fake.esearch(params))
+        elif path.endswith("epost.fcgi"):
+            self._send(200, fake.epost(params))
+        elif path.endswith("efetch.fcgi"):
+            self._send(200, fake.efetch(params))
+        else:
+            self._send(404, b"not found")
+
+    def _send(self, status, data, headers=None):
+        self.send_response(status)
+        self.send_header("Content-Type", "text/xml")
+        self.send_header("Content-Length", str(len(data)))
+        for key, value in headers or []:
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+
+class FakeEUtilsServer(object):
+    """Threaded HTTP server answering esearch/efetch requests from canned data.
+
+    termMap maps pubmed search terms (with '+' as word separator) to PMID lists,
+    articles are served from the efetch dump in the test data directory.
+    """
+
+    def __init__(self, termMap=None, articleMap=None, failCount=0):
+        self.termMap = termMap or {}
+        self.articleMap = articleMap if articleMap is not None else loadArticleMap()
+        self.failCount = failCount
+        self.requestList = []
+        self.connectionSet = set()
+        self.historyMap = {}
+        self.lock = threading.Lock()
+        self.__server = None
+        self.__thread = None
+
+    @property
+    def url(self):
+        return "http://127.0.0.1:%d/entrez/eutils/" % self.__server.server_address[1]
+
+    def start(self):
+        self.__server = _ThreadingHTTPServer(("127.0.0.1", 0), _Handler, self)
+        self.__thread = threading.Thread(target=self.__server.serve_forever)
+        self.__thread.daemon = True
+        self.__thread.start()
+        return self
+
+    def stop(self):
+        self.__server.shutdown()
+        self.__server.server_close()
+        self.__thread.join()
+
+    def esearch(self, params):
+        idList = self.termMap.get(params.get("term", "").replace(" ", "+"), [])
+        out = "<?xml version=\"1.0\" ?>\n<eSearchResult><Count>%d</Count><RetMax>%d</RetMax><RetStart>0</RetStart><IdList>" % (len(idList), len(idList))
+        out += "".join(["<Id>%s</Id>" % pid for pid in idList])
+        out += "</IdList></eSearchResult>\n"
+        return out.encode("utf-8")
+
+    def epost(self, params):
+        with self.lock:
+            webEnv = "MCID_FAKE_%d" % (len(self.historyMap) + 1)
+            self.historyMap[webEnv] = [pid for pid in params.get("id", "").split(",") if pid]
+        return ("<?xml version=\"1.0\" ?>\n<ePostResult><QueryKey>1</QueryKey><WebEnv>%s</WebEnv></ePostResult>\n" % webEnv).encode("utf-8")
+
+    def efetch(self, params):
+        if "WebEnv" in params:
+            idList = self.historyMap.get(params["WebEnv"], [])
+            retstart = int(params.get("retstart", 0))
+            idList = idList[retstart:retstart + int(params.get("retmax", 20))]
+        else:
+            idList = [pid for pid in params.get("id", "").split(",") if pid]
+        return self.articleSet(idList)
+
+    def articleSet(self, idList):
+        out = "<?xml version=\"1.0\" ?>\n<PubmedArticleSet>\n"
+        out += "\n".join([self.articleMap[pid] for pid in idList if pid in self.articleMap])
+        out += "\n</PubmedArticleSet>\n"
+        return out.encode("utf-8")